@@ -0,0 +1,220 @@
+"""
+Benchmark suite for the CPM engine and graph algorithms.
+Runs every registered engine over generated DAG families (core/synthetic.py),
+records wall time and peak memory, and compares against a stored baseline.
+No database needed.
+
+Run from Backend/ directory:
+    python bench_cpm.py                                   # 1k..1M, print results
+    python bench_cpm.py --sizes 1000,10000 --save-baseline benchmarks/baseline.json
+    python bench_cpm.py --sizes 1000,10000 --baseline benchmarks/baseline.json
+Exits with status 1 when any case is slower (or larger) than the baseline
+beyond --threshold.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from cpm import calculate_cpm
+from core.components import calculate_cpm_by_component
+from core.synthetic import SHAPES, generate_project, as_cpm_input
+from core.validation import detect_cycle, _dfs_has_path
+
+
+class BenchGraph:
+    """One generated project in the shapes the engines consume"""
+
+    def __init__(self, shape: str, size: int, density: float, seed: int, mixed: float = 0.0):
+        project = generate_project(size, shape=shape, density=density, mixed=mixed, seed=seed)
+        self.shape = shape
+        self.size = size
+        self.tasks, self.dependencies = as_cpm_input(project)
+        self.edges = len(self.dependencies)
+
+        # depends_on → [tasks], as used by core/validation.py
+        self.forward: Dict[str, List[str]] = {}
+        for d in self.dependencies:
+            self.forward.setdefault(d["depends_on_task_id"], []).append(d["task_id"])
+        self.edge_rows = [(d["depends_on_task_id"], d["task_id"]) for d in self.dependencies]
+
+
+class _RowsSession:
+    """Just enough of a Session for detect_cycle to read edge rows without a database"""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, stmt):
+        return self
+
+    def fetchall(self):
+        return self._rows
+
+
+def _detect_cycle(g: BenchGraph):
+    # Worst case: the new edge is legal, so the whole reachable set is searched
+    with contextlib.redirect_stdout(io.StringIO()):
+        return detect_cycle(_RowsSession(g.edge_rows), "0", "missing")
+
+
+# Engines under test. Register new implementations here to benchmark them
+# against the same graph families and baseline.
+ENGINES: Dict[str, Callable[[BenchGraph], object]] = {
+    "calculate_cpm": lambda g: calculate_cpm(g.tasks, g.dependencies),
+    "cpm_by_component": lambda g: calculate_cpm_by_component(g.tasks, g.dependencies),
+    "detect_cycle": _detect_cycle,
+    "dfs_has_path": lambda g: _dfs_has_path(g.forward, "0", "missing"),
+}
+
+
+def _time_once(fn, g) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    fn(g)
+    return time.perf_counter() - start
+
+
+def _peak_memory(fn, g) -> float:
+    """Peak Python heap in MB during one run (tracemalloc; separate from timing runs)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(g)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(engines: List[str], shapes: List[str], sizes: List[int],
+                   density: float, repeat: int, seed: int, measure_memory: bool,
+                   mixed: float = 0.0) -> List[Dict]:
+    results = []
+    for size in sizes:
+        for shape in shapes:
+            g = BenchGraph(shape, size, density, seed, mixed)
+            for name in engines:
+                fn = ENGINES[name]
+                wall = min(_time_once(fn, g) for _ in range(repeat))
+                peak = _peak_memory(fn, g) if measure_memory else None
+                result = {
+                    "engine": name,
+                    "shape": shape,
+                    "size": size,
+                    "edges": g.edges,
+                    "wall_s": round(wall, 6),
+                    "peak_mb": round(peak, 3) if peak is not None else None,
+                }
+                results.append(result)
+                peak_text = f"{peak:9.1f} MB" if peak is not None else ""
+                print(f"   {name:16s} {shape:8s} {size:>8d} tasks {g.edges:>8d} edges "
+                      f"{wall * 1000:10.1f} ms {peak_text}")
+            del g
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float, min_delta_s: float) -> List[str]:
+    """
+    Regressions against a baseline file.
+    A case regresses when it is more than `threshold` (fraction) slower, or
+    uses that much more peak memory, and the time difference exceeds
+    min_delta_s (tiny cases are too noisy to judge).
+    """
+    base = {(r["engine"], r["shape"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        b = base.get((r["engine"], r["shape"], r["size"]))
+        if b is None:
+            continue
+        if r["wall_s"] > b["wall_s"] * (1 + threshold) and r["wall_s"] - b["wall_s"] > min_delta_s:
+            regressions.append(
+                f"{r['engine']} {r['shape']} {r['size']}: {b['wall_s'] * 1000:.1f} ms → "
+                f"{r['wall_s'] * 1000:.1f} ms (+{(r['wall_s'] / b['wall_s'] - 1) * 100:.0f}%)"
+            )
+        if r.get("peak_mb") and b.get("peak_mb") and r["peak_mb"] > b["peak_mb"] * (1 + threshold) \
+                and r["peak_mb"] - b["peak_mb"] > 1:
+            regressions.append(
+                f"{r['engine']} {r['shape']} {r['size']}: peak {b['peak_mb']:.1f} MB → {r['peak_mb']:.1f} MB"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma-separated engines to run")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma-separated DAG shapes")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma-separated task counts")
+    parser.add_argument("--density", type=float, default=2.0, help="average predecessors per task")
+    parser.add_argument("--mixed", type=float, default=0.0,
+                        help="share of dependencies with SS/FF/SF types and lags")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per case (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON and fail on regressions")
+    parser.add_argument("--save-baseline", help="write results JSON as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown fraction (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    engines = args.engines.split(",")
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engines {unknown}; available: {list(ENGINES)}")
+
+    print(f"\n{'='*70}")
+    print(f"⏱️  CPM BENCHMARKS ({platform.python_implementation()} {platform.python_version()})")
+    print(f"{'='*70}")
+    results = run_benchmarks(
+        engines,
+        args.shapes.split(","),
+        [int(s) for s in args.sizes.split(",")],
+        args.density,
+        args.repeat,
+        args.seed,
+        not args.no_memory,
+        args.mixed,
+    )
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "density": args.density,
+            "mixed": args.mixed,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
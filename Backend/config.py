@@ -4,6 +4,7 @@ Loads environment variables
 """
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load . env file
@@ -17,5 +18,45 @@ API_PORT = int(os.getenv("API_PORT", 8000))
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
+# CPM result cache shared by all uvicorn workers on a host
+# "shared" = memory-mapped store under CPM_CACHE_DIR, "local" = per process, "none" = disabled
+CPM_CACHE_BACKEND = os.getenv("CPM_CACHE_BACKEND", "shared")
+CPM_CACHE_DIR = os.getenv(
+    "CPM_CACHE_DIR",
+    os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "pm-cpm-cache"),
+)
+# Postgres LISTEN/NOTIFY channel used to invalidate caches on other workers/hosts
+CPM_NOTIFY_CHANNEL = os.getenv("CPM_NOTIFY_CHANNEL", "cpm_invalidate")
+
+# Worker processes for background CPM jobs on large graphs (0 = run in a thread instead)
+CPM_POOL_WORKERS = int(os.getenv("CPM_POOL_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+# Tasks' worth of per-component CPM results kept in memory per process
+CPM_COMPONENT_CACHE_TASKS = int(os.getenv("CPM_COMPONENT_CACHE_TASKS", 2000000))
+# Seconds a finished CPM job (and its result) stays retrievable
+CPM_JOB_TTL = int(os.getenv("CPM_JOB_TTL", 3600))
+
+# Opt-in request profiling
+# Requests are profiled when sampled, or when they send "X-Profile: 1" and the header is enabled
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_HEADER_ENABLED = os.getenv(
+    "PROFILE_HEADER_ENABLED", "true" if ENVIRONMENT == "development" else "false"
+).lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "pm-profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 200))
+# Log SQL statements slower than this many milliseconds (0 disables)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+
+# Schedule import (POST /api/import): uploads are spooled here while parsed,
+# capped at IMPORT_MAX_BYTES, and inserted IMPORT_CHUNK_ROWS rows at a time
+IMPORT_DIR = os.getenv("IMPORT_DIR", os.path.join(tempfile.gettempdir(), "pm-imports"))
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", 200 * 1024 * 1024))
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", 5000))
+
+# Optional streaming replica for read-only endpoints (see database.get_read_db).
+# After a write, a client's reads stay on the primary until the replica has
+# replayed it, checked for REPLICA_READ_YOUR_WRITES_SECONDS
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL") or None
+REPLICA_READ_YOUR_WRITES_SECONDS = int(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", 60))
+
 if not all([DATABASE_URL]):
-    raise RuntimeError("Missing required environment variables")
\ No newline at end of file
+    raise RuntimeError("Missing required environment variables")
@@ -0,0 +1,214 @@
+"""
+Schedule baselines
+A baseline freezes the CPM output of one moment: per task its duration
+and ES/EF/LS/LF. Snapshots are columnar. Task ids are sorted 16-byte UUIDs,
+stored once per distinct task set and shared by every baseline over the
+same tasks. The values are int32 columns, stored relative to ES and
+byte-shuffled before zlib, so the mostly-zero high bytes compress to
+almost nothing. Because both sides are sorted by id, a diff is one merge
+pass.
+"""
+
+import hashlib
+import heapq
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+SNAPSHOT_FORMAT = 1
+
+# Stored column order; EF/LS/LF are kept as offsets from ES
+COLUMNS = ("duration", "ES", "EF", "LS", "LF")
+
+
+class Snapshot:
+    """Task ids (sorted UUID bytes) and one int column per name in COLUMNS"""
+
+    def __init__(self, ids: List[bytes], columns: Dict[str, array]):
+        self.ids = ids
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def project_end(self) -> int:
+        return max(self.columns["EF"], default=0)
+
+    @property
+    def critical(self) -> int:
+        es, ls = self.columns["ES"], self.columns["LS"]
+        return sum(1 for i in range(len(self.ids)) if es[i] == ls[i])
+
+
+def build_snapshot(result: Dict, durations: Dict[str, int]) -> Snapshot:
+    """Snapshot of a CPM result, limited to the tasks in durations"""
+    ES = result["ES"]
+    # Canonical UUID strings (lowercase hex, fixed dashes) sort like their bytes
+    order = sorted(tid for tid in durations if tid in ES)
+    columns = {"duration": array("i", [durations[tid] for tid in order])}
+    for name in COLUMNS[1:]:
+        values = result[name]
+        columns[name] = array("i", [values[tid] for tid in order])
+    return Snapshot([bytes.fromhex(tid.replace("-", "")) for tid in order], columns)
+
+
+# ==================== ENCODING ====================
+
+def _shuffle(data: bytes, width: int) -> bytes:
+    # All first bytes, then all second bytes, ...: columns of small ints
+    # turn into long zero runs
+    return b"".join(data[i::width] for i in range(width))
+
+
+def _unshuffle(data: bytes, width: int) -> bytes:
+    n = len(data) // width
+    out = bytearray(len(data))
+    for i in range(width):
+        out[i::width] = data[i * n:(i + 1) * n]
+    return bytes(out)
+
+
+def encode_ids(snapshot: Snapshot) -> Tuple[bytes, bytes]:
+    """(digest, packed ids); baselines over the same tasks share the row"""
+    packed = b"".join(snapshot.ids)
+    return hashlib.sha256(packed).digest(), packed
+
+
+def encode_columns(snapshot: Snapshot) -> bytes:
+    es = snapshot.columns["ES"]
+    parts = []
+    for name in COLUMNS:
+        values = snapshot.columns[name]
+        if name in ("EF", "LS", "LF"):
+            values = array("i", (v - e for v, e in zip(values, es)))
+        parts.append(values.tobytes())
+    body = _shuffle(b"".join(parts), 4)
+    return bytes([SNAPSHOT_FORMAT]) + zlib.compress(body, 9)
+
+
+def decode_snapshot(packed_ids: bytes, data: bytes) -> Snapshot:
+    if data[0] != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unknown baseline format {data[0]}")
+    n = len(packed_ids) // 16
+    body = _unshuffle(zlib.decompress(data[1:]), 4)
+    columns = {}
+    for i, name in enumerate(COLUMNS):
+        values = array("i")
+        values.frombytes(body[i * 4 * n:(i + 1) * 4 * n])
+        columns[name] = values
+    es = columns["ES"]
+    for name in ("EF", "LS", "LF"):
+        columns[name] = array("i", (v + e for v, e in zip(columns[name], es)))
+    return Snapshot([packed_ids[i:i + 16] for i in range(0, 16 * n, 16)], columns)
+
+
+# ==================== DIFF ====================
+
+def diff_snapshots(old: Snapshot, new: Snapshot, limit: int = 100) -> Dict:
+    """
+    Variance between two snapshots, aligned by task id in one merge pass.
+
+    Returns:
+    {
+        "tasks": {"common": int, "added": int, "removed": int},
+        "project_end": {"old": int, "new": int, "slip": int},
+        "slipped": int,     # tasks finishing later
+        "improved": int,    # tasks finishing earlier
+        "slips": [{"id", "start_slip", "finish_slip", "duration_change",
+                   "slack_change", "was_critical", "is_critical"}],  # worst first
+        "critical_path": {"added": [id], "removed": [id],
+                          "added_count": int, "removed_count": int}
+    }
+    Slips are in days; lists are capped at limit.
+    """
+    a, b = old.columns, new.columns
+    na, nb = len(old), len(new)
+    i = j = common = slipped = improved = 0
+    rows = []
+    crit_added: List[bytes] = []
+    crit_removed: List[bytes] = []
+    crit_added_count = crit_removed_count = 0
+
+    while i < na or j < nb:
+        ka = old.ids[i] if i < na else None
+        kb = new.ids[j] if j < nb else None
+        if kb is None or (ka is not None and ka < kb):
+            if a["ES"][i] == a["LS"][i]:
+                crit_removed_count += 1
+                if len(crit_removed) < limit:
+                    crit_removed.append(ka)
+            i += 1
+            continue
+        if ka is None or kb < ka:
+            if b["ES"][j] == b["LS"][j]:
+                crit_added_count += 1
+                if len(crit_added) < limit:
+                    crit_added.append(kb)
+            j += 1
+            continue
+
+        common += 1
+        finish_slip = b["EF"][j] - a["EF"][i]
+        was = a["ES"][i] == a["LS"][i]
+        now = b["ES"][j] == b["LS"][j]
+        if finish_slip > 0:
+            slipped += 1
+        elif finish_slip < 0:
+            improved += 1
+        if was != now:
+            if now:
+                crit_added_count += 1
+                if len(crit_added) < limit:
+                    crit_added.append(kb)
+            else:
+                crit_removed_count += 1
+                if len(crit_removed) < limit:
+                    crit_removed.append(kb)
+        if finish_slip or b["ES"][j] != a["ES"][i] or b["duration"][j] != a["duration"][i] or was != now:
+            rows.append((finish_slip, i, j))
+        i += 1
+        j += 1
+
+    slips = []
+    for finish_slip, i, j in heapq.nlargest(limit, rows):
+        slips.append({
+            "id": str(UUID(bytes=new.ids[j])),
+            "start_slip": b["ES"][j] - a["ES"][i],
+            "finish_slip": finish_slip,
+            "duration_change": b["duration"][j] - a["duration"][i],
+            "slack_change": (b["LS"][j] - b["ES"][j]) - (a["LS"][i] - a["ES"][i]),
+            "was_critical": a["ES"][i] == a["LS"][i],
+            "is_critical": b["ES"][j] == b["LS"][j],
+        })
+
+    return {
+        "tasks": {"common": common, "added": nb - common, "removed": na - common},
+        "project_end": {"old": old.project_end, "new": new.project_end,
+                        "slip": new.project_end - old.project_end},
+        "slipped": slipped,
+        "improved": improved,
+        "slips": slips,
+        "critical_path": {
+            "added": [str(UUID(bytes=k)) for k in crit_added],
+            "removed": [str(UUID(bytes=k)) for k in crit_removed],
+            "added_count": crit_added_count,
+            "removed_count": crit_removed_count,
+        },
+    }
+
+
+def current_snapshot(db: Session, project_id: Optional[UUID] = None) -> Snapshot:
+    """
+    Snapshot of the current schedule (the cached graph CPM)
+
+    Raises:
+        ValueError: If the graph contains a cycle
+    """
+    from crud import task_durations
+    from core.components import cached_graph_cpm
+
+    return build_snapshot(cached_graph_cpm(db), task_durations(db, project_id))
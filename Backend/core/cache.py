@@ -0,0 +1,330 @@
+"""
+CPM result cache shared across uvicorn workers
+Versioned entries, pluggable backends, Postgres LISTEN/NOTIFY invalidation
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import select as select_module
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from config import CPM_CACHE_BACKEND, CPM_CACHE_DIR, CPM_NOTIFY_CHANNEL
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no flock, fall back to the local backend
+    fcntl = None
+
+
+# Key for the CPM result over the whole task graph. The suffix changes with
+# the result's shape, so entries left by an older deploy are never served.
+GRAPH_CACHE_KEY = "cpm:graph:v4"
+
+
+class CacheBackend:
+    """
+    Versioned key/value store.
+
+    Every key has a monotonically increasing version. Values are stored
+    together with the version they were computed from, and `get` only
+    returns a value whose version is still current, so bumping the version
+    invalidates the entry without having to delete it.
+    """
+
+    def version(self, key: str) -> int:
+        raise NotImplementedError
+
+    def bump(self, key: str) -> int:
+        raise NotImplementedError
+
+    def get(self, key: str, version: int) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, version: int, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key: str):
+        yield
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], version_key: Optional[str] = None) -> Any:
+        """
+        Return the cached value for key, computing it at most once per
+        version across everyone sharing this backend.
+
+        version_key names the key whose version tags the value (default:
+        key itself), for values derived from the same data as another key
+        and invalidated with it.
+
+        The version is read BEFORE compute() runs, so a mutation that lands
+        while we compute leaves our result tagged with a stale version.
+        """
+        version_key = version_key or key
+        version = self.version(version_key)
+        value = self.get(key, version)
+        if value is not None:
+            return value
+
+        with self.lock(key):
+            # Another worker may have filled it while we waited for the lock
+            version = self.version(version_key)
+            value = self.get(key, version)
+            if value is not None:
+                return value
+
+            value = compute()
+            self.set(key, version, value)
+            return value
+
+
+class NullCache(CacheBackend):
+    """Caching disabled"""
+
+    def version(self, key: str) -> int:
+        return 0
+
+    def bump(self, key: str) -> int:
+        return 0
+
+    def get(self, key: str, version: int) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, version: int, value: Any) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+
+class LocalCache(CacheBackend):
+    """In-process stand-in: one copy per worker, same semantics as the shared store"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._entries: Dict[str, tuple] = {}
+        self._guard = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def bump(self, key: str) -> int:
+        with self._guard:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._entries.pop(key, None)
+            return self._versions[key]
+
+    def get(self, key: str, version: int) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, key: str, version: int, value: Any) -> None:
+        self._entries[key] = (version, value)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    @contextmanager
+    def lock(self, key: str):
+        with self._guard:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            yield
+
+
+class SharedFileCache(CacheBackend):
+    """
+    Host-wide store for all worker processes.
+
+    Versions live in a fixed table of 64-bit counters in a memory-mapped
+    file, so checking freshness is a plain memory read. Keys hash into the
+    table; a collision only causes an extra invalidation, never a stale hit.
+    Values are pickled into one file per key, prefixed with their version,
+    and replaced atomically.
+    """
+
+    SLOTS = 4096
+    _SLOT = struct.Struct("<Q")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        versions_path = os.path.join(directory, "versions")
+        fd = os.open(versions_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            size = self.SLOTS * self._SLOT.size
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._versions = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._versions_lock_path = versions_path + ".lock"
+
+    def _slot_offset(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return (int.from_bytes(digest, "little") % self.SLOTS) * self._SLOT.size
+
+    def _entry_path(self, key: str, suffix: str = ".pkl") -> str:
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, name + suffix)
+
+    @contextmanager
+    def _flock(self, path: str):
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def version(self, key: str) -> int:
+        return self._SLOT.unpack_from(self._versions, self._slot_offset(key))[0]
+
+    def bump(self, key: str) -> int:
+        offset = self._slot_offset(key)
+        with self._flock(self._versions_lock_path):
+            version = self._SLOT.unpack_from(self._versions, offset)[0] + 1
+            self._SLOT.pack_into(self._versions, offset, version)
+        return version
+
+    def get(self, key: str, version: int) -> Optional[Any]:
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                header = f.read(self._SLOT.size)
+                if len(header) != self._SLOT.size or self._SLOT.unpack(header)[0] != version:
+                    return None
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key: str, version: int, value: Any) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._SLOT.pack(version))
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        # The .lock file stays: unlinking it could split holders and waiters
+        try:
+            os.unlink(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def lock(self, key: str):
+        with self._flock(self._entry_path(key, ".lock")):
+            yield
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide cache backend selected by CPM_CACHE_BACKEND"""
+    global _cache
+    if _cache is None:
+        backend = CPM_CACHE_BACKEND.lower()
+        if backend == "shared" and fcntl is None:
+            print("⚠️  Shared CPM cache needs fcntl - falling back to local cache")
+            backend = "local"
+
+        if backend == "shared":
+            _cache = SharedFileCache(CPM_CACHE_DIR)
+        elif backend == "local":
+            _cache = LocalCache()
+        else:
+            _cache = NullCache()
+    return _cache
+
+
+# ==================== INVALIDATION ====================
+
+def notify_graph_changed(db: Session, key: str = GRAPH_CACHE_KEY) -> None:
+    """
+    Invalidate cached results for key once db commits.
+
+    Call this inside the mutating transaction, before commit. The NOTIFY is
+    only delivered to listeners if the transaction commits, and the local
+    version bump runs after commit so no reader can tag pre-commit data
+    with the new version.
+    """
+    db.execute(
+        text("SELECT pg_notify(:channel, :key)"),
+        {"channel": CPM_NOTIFY_CHANNEL, "key": key},
+    )
+    event.listen(db, "after_commit", lambda session: get_cache().bump(key), once=True)
+
+
+def start_invalidation_listener(engine) -> Optional[threading.Thread]:
+    """
+    LISTEN for invalidations from other workers and hosts in a daemon thread.
+
+    Workers on the same host already share versions through the cache
+    directory; this covers other hosts and writes made outside the API.
+    """
+    if isinstance(get_cache(), NullCache):
+        return None
+
+    thread = threading.Thread(
+        target=_listen_forever, args=(engine,), name="cpm-cache-listener", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _listen_forever(engine) -> None:
+    backoff = 1
+    while True:
+        raw = None
+        try:
+            raw = engine.raw_connection()
+            raw.detach()  # long-lived: keep it out of the request pool
+            conn = raw.connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{CPM_NOTIFY_CHANNEL}"')
+
+            # Anything may have changed while we were not listening
+            get_cache().bump(GRAPH_CACHE_KEY)
+            print(f"👂 Listening for CPM cache invalidations on '{CPM_NOTIFY_CHANNEL}'")
+            backoff = 1
+
+            while True:
+                if select_module.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    get_cache().bump(notify.payload or GRAPH_CACHE_KEY)
+        except Exception as e:
+            print(f"❌ CPM cache listener error: {str(e)} - reconnecting in {backoff}s")
+            if raw is not None:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
@@ -0,0 +1,346 @@
+"""
+Connected-component decomposition for CPM
+Disconnected task graphs are scheduled independently (in parallel on the
+process pool) and merged back into the global result. Component results
+are cached by content, so a change to one component only recomputes it.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from config import CPM_COMPONENT_CACHE_TASKS, CPM_POOL_WORKERS
+from cpm import calculate_cpm, dependency_offset
+from core.cache import get_cache, GRAPH_CACHE_KEY
+from core.hierarchy import TaskTree, rollup_schedule
+from core.pool import get_process_pool, uses_processes
+
+# Smaller components are cheaper to recompute than to keep in the result cache
+CACHE_MIN_TASKS = 64
+# Below this many tasks to compute, pickling to the pool costs more than it saves
+PARALLEL_MIN_TASKS = 20000
+
+# (ids, durations, edges as (pred_index, succ_index, type, lag))
+ComponentInput = Tuple[List[str], List[int], List[Tuple[int, int, str, int]]]
+
+
+def find_components(task_ids: List[str], edges: List[Tuple]) -> List[List[str]]:
+    """
+    Weakly connected components via union-find over (pred, succ, ...) edges.
+
+    Returns lists of task ids; components and the ids inside them keep the
+    order of task_ids.
+    """
+    index = {tid: i for i, tid in enumerate(task_ids)}
+    parent = list(range(len(task_ids)))
+    size = [1] * len(task_ids)
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    for edge in edges:
+        ra, rb = index[edge[0]], index[edge[1]]
+        # Inline roots check: most edges join tasks that are already roots
+        # or one hop away, and a call per edge dominates otherwise
+        if parent[ra] != ra:
+            ra = find(ra)
+        if parent[rb] != rb:
+            rb = find(rb)
+        if ra == rb:
+            continue
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+
+    groups: Dict[int, List[str]] = {}
+    for i, tid in enumerate(task_ids):
+        groups.setdefault(find(i), []).append(tid)
+    return list(groups.values())
+
+
+# ==================== COMPONENT RESULT CACHE ====================
+
+_results: "OrderedDict[bytes, Dict]" = OrderedDict()
+_results_sizes: Dict[bytes, int] = {}
+_cached_tasks = 0
+_results_lock = threading.Lock()
+
+
+def graph_digest(tasks: Iterable[Tuple[str, int]], edges: Iterable[Tuple[str, str, str, int]]) -> bytes:
+    """
+    Content key of a task graph: (id, duration) rows and (pred, succ, type,
+    lag) edges. Rows come back from the database in heap order, which
+    moves whenever a row is updated, so both are sorted before hashing.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update("\n".join(sorted(f"{tid}\t{d}" for tid, d in tasks)).encode())
+    digest.update(b"\0")
+    digest.update("\n".join(sorted(f"{p}\t{s}\t{kind}\t{lag}" for p, s, kind, lag in edges)).encode())
+    return digest.digest()
+
+
+def _fingerprint(component: ComponentInput) -> bytes:
+    ids, durations, edges = component
+    return graph_digest(zip(ids, durations), ((ids[p], ids[s], kind, lag) for p, s, kind, lag in edges))
+
+
+def _cache_get(key: bytes) -> Optional[Dict]:
+    with _results_lock:
+        result = _results.get(key)
+        if result is not None:
+            _results.move_to_end(key)
+        return result
+
+
+def _cache_put(key: bytes, size: int, result: Dict) -> None:
+    global _cached_tasks
+    with _results_lock:
+        if key in _results:
+            return
+        _results[key] = result
+        _results_sizes[key] = size
+        _cached_tasks += size
+        while _cached_tasks > CPM_COMPONENT_CACHE_TASKS and len(_results) > 1:
+            old, _ = _results.popitem(last=False)
+            _cached_tasks -= _results_sizes.pop(old)
+
+
+# ==================== COMPUTATION ====================
+
+def _cpm_batch(batch: List[ComponentInput]) -> List[Dict]:
+    """Runs in the pool: CPM for each component in the batch"""
+    results = []
+    for ids, durations, edges in batch:
+        tasks = [{"id": tid, "duration": d} for tid, d in zip(ids, durations)]
+        dependencies = [
+            {"task_id": ids[s], "depends_on_task_id": ids[p], "type": kind, "lag": lag}
+            for p, s, kind, lag in edges
+        ]
+        results.append(calculate_cpm(tasks, dependencies))
+    return results
+
+
+def _compute(components: List[ComponentInput], executor: Optional[Executor]) -> List[Dict]:
+    total = sum(len(c[0]) for c in components)
+    if executor is None or total < PARALLEL_MIN_TASKS or len(components) < 2:
+        return _cpm_batch(components)
+
+    # A few batches per worker so one giant component doesn't idle the rest
+    target = max(PARALLEL_MIN_TASKS // 4, total // (max(CPM_POOL_WORKERS, 1) * 4))
+    batches, batch, batch_size = [], [], 0
+    for c in sorted(components, key=lambda c: -len(c[0])):
+        batch.append(c)
+        batch_size += len(c[0])
+        if batch_size >= target:
+            batches.append(batch)
+            batch, batch_size = [], 0
+    if batch:
+        batches.append(batch)
+
+    futures = [executor.submit(_cpm_batch, b) for b in batches]
+    by_id = {}
+    for b, future in zip(batches, futures):
+        for c, result in zip(b, future.result()):
+            by_id[id(c)] = result
+    return [by_id[id(c)] for c in components]
+
+
+def calculate_cpm_by_component(
+    tasks: List[Dict],
+    dependencies: List[Dict],
+    executor: Optional[Executor] = None,
+) -> Dict:
+    """
+    Same result as calculate_cpm, plus per-component schedules.
+    Components are computed on executor (the process pool) when given.
+
+    Each component is scheduled on its own and the results are merged:
+    ES/EF are unchanged, and LS/LF/slack shift by how much earlier the
+    component ends than the whole graph (every sink's LF is the global
+    project_end). Only components ending at project_end are on the global
+    critical path, and only they have drag.
+
+    Returns calculate_cpm's keys plus:
+        "components": [
+            {"id": smallest task id, "tasks": int, "project_end": int,
+             "critical_path": [task_id, ...], "key": content digest (hex)},
+            ...
+        ]
+
+    ES lists the tasks component by component, in this order, so
+    components[i] covers the next components[i]["tasks"] keys of ES.
+
+    Raises:
+        ValueError: If any component contains a cycle
+    """
+    durations = {
+        str(t["id"]): int(t.get("duration", 0)) + int(t.get("buffer_time", 0))
+        for t in tasks
+    }
+    task_ids = list(durations)
+    edges = []
+    for d in dependencies:
+        pred, succ = str(d["depends_on_task_id"]), str(d["task_id"])
+        # Ignore if references missing tasks (as calculate_cpm does)
+        if pred in durations and succ in durations:
+            edges.append((pred, succ, d.get("type") or "FS", int(d.get("lag") or 0)))
+
+    groups = find_components(task_ids, edges)
+    if len(groups) == 1:
+        # One connected graph: nothing to split or merge
+        result = calculate_cpm(tasks, dependencies)
+        result["components"] = [_summary(groups[0], result, graph_digest(durations.items(), edges))]
+        return result
+
+    component_of = {}
+    positions = {}
+    for c, ids in enumerate(groups):
+        for i, tid in enumerate(ids):
+            component_of[tid] = c
+            positions[tid] = i
+    component_edges: List[List[Tuple[int, int, str, int]]] = [[] for _ in groups]
+    for pred, succ, kind, lag in edges:
+        component_edges[component_of[succ]].append((positions[pred], positions[succ], kind, lag))
+
+    inputs = [
+        (ids, [durations[tid] for tid in ids], component_edges[c])
+        for c, ids in enumerate(groups)
+    ]
+
+    # Reuse cached results for components that haven't changed
+    results: List[Optional[Dict]] = [None] * len(inputs)
+    keys = [_fingerprint(component) for component in inputs]
+    missing = []
+    for c, component in enumerate(inputs):
+        if len(component[0]) >= CACHE_MIN_TASKS:
+            results[c] = _cache_get(keys[c])
+        if results[c] is None:
+            missing.append(c)
+
+    computed = _compute([inputs[c] for c in missing], executor)
+    for c, result in zip(missing, computed):
+        results[c] = result
+        if len(inputs[c][0]) >= CACHE_MIN_TASKS:
+            _cache_put(keys[c], len(inputs[c][0]), result)
+
+    return merge_component_results(groups, results, inputs, keys)
+
+
+def _summary(ids: List[str], result: Dict, key: bytes) -> Dict:
+    return {
+        "id": min(ids),
+        "tasks": len(ids),
+        "project_end": result["project_end"],
+        "critical_path": result["critical_path"],
+        # Same key and same project_end offset: same stored schedule (core/schedule.py)
+        "key": key.hex(),
+    }
+
+
+def _shifted_floats(component: ComponentInput, r: Dict, shift: int, project_end: int) -> Tuple[Dict, Dict]:
+    """
+    Free/independent float of a component that ends `shift` days before
+    project_end: sinks gain the shift, and predecessors' LS move with it.
+    Same formulas as cpm.calculate_floats, on the component's index edges.
+    """
+    ids, durations, edges = component
+    ES, LS = r["ES"], r["LS"]
+    # Latest start that delays no successor, earliest start if every
+    # predecessor runs late
+    next_start = [project_end - d for d in durations]
+    late_start = [0] * len(ids)
+    for p, s, kind, lag in edges:
+        offset = dependency_offset(kind, lag, durations[p], durations[s])
+        start = ES[ids[s]] - offset
+        if start < next_start[p]:
+            next_start[p] = start
+        start = LS[ids[p]] + shift + offset
+        if start > late_start[s]:
+            late_start[s] = start
+
+    free_float, independent_float = {}, {}
+    for i, tid in enumerate(ids):
+        free_float[tid] = next_start[i] - ES[tid]
+        independent_float[tid] = max(0, next_start[i] - late_start[i])
+    return free_float, independent_float
+
+
+def merge_component_results(groups: List[List[str]], results: List[Dict],
+                            inputs: List[ComponentInput], keys: List[bytes]) -> Dict:
+    """Combine per-component CPM results into one graph-wide result"""
+    ends = sorted((r["project_end"] for r in results), reverse=True)
+    project_end = ends[0] if ends else 0
+    # Cutting a critical task can only bring the end down to the next-longest component
+    runner_up = ends[1] if len(ends) > 1 else 0
+    ES, EF, LS, LF, slack = {}, {}, {}, {}, {}
+    free_float, independent_float, drag = {}, {}, {}
+    critical_path = []
+    components = []
+
+    for ids, r, component, key in zip(groups, results, inputs, keys):
+        shift = project_end - r["project_end"]
+        ES.update(r["ES"])
+        EF.update(r["EF"])
+        if shift:
+            LS.update((tid, v + shift) for tid, v in r["LS"].items())
+            LF.update((tid, v + shift) for tid, v in r["LF"].items())
+            slack.update((tid, v + shift) for tid, v in r["slack"].items())
+            ff, independent = _shifted_floats(component, r, shift, project_end)
+            free_float.update(ff)
+            independent_float.update(independent)
+            drag.update(dict.fromkeys(ids, 0))
+        else:
+            LS.update(r["LS"])
+            LF.update(r["LF"])
+            slack.update(r["slack"])
+            free_float.update(r["free_float"])
+            independent_float.update(r["independent_float"])
+            limit = project_end - runner_up
+            drag.update((tid, min(v, limit)) for tid, v in r["drag"].items())
+            critical_path.extend(r["critical_path"])
+
+        components.append(_summary(ids, r, key))
+
+    return {
+        "ES": ES,
+        "EF": EF,
+        "LS": LS,
+        "LF": LF,
+        "slack": slack,
+        "free_float": free_float,
+        "independent_float": independent_float,
+        "drag": drag,
+        "project_end": project_end,
+        "critical_path": critical_path,
+        "components": components,
+    }
+
+
+def cached_graph_cpm(db: Session) -> Dict:
+    """
+    CPM for the whole task graph, computed once per graph version for every
+    worker on this host (see core/cache.py). Summary tasks are rolled up
+    into result["summaries"] (see core/hierarchy.py).
+
+    Raises:
+        ValueError: If the graph contains a cycle
+    """
+    from crud import load_task_tree
+    from core.graph_loader import load_cpm_inputs
+
+    executor = get_process_pool() if uses_processes() else None
+
+    def compute() -> Dict:
+        result = calculate_cpm_by_component(*load_cpm_inputs(db), executor=executor)
+        result["summaries"] = rollup_schedule(result, TaskTree(load_task_tree(db)))
+        return result
+
+    return get_cache().get_or_compute(GRAPH_CACHE_KEY, compute)
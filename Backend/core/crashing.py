@@ -0,0 +1,361 @@
+"""
+Schedule compression (crashing)
+Shortens task durations to bring project_end down to a target at the
+lowest cost. Each step finds the cheapest set of tasks that cuts every
+critical path (a minimum cut over the critical subgraph), shortens them
+as far as the schedule allows, and updates the CPM values incrementally:
+only tasks downstream/upstream of the shortened ones are revisited.
+"""
+
+from collections import deque
+from operator import add
+from typing import Dict, List, Sequence, Set, Tuple
+
+INF = float("inf")
+
+
+class IncrementalSchedule:
+    """
+    CPM over index arrays that stays current as durations change.
+
+    head[v] = ES (longest path from the start to v)
+    tail[v] = longest path from v to the end, including v's duration,
+              so LS = end - tail and slack = end - head - tail
+    """
+
+    def __init__(self, durations: List[int], edges: Sequence[Tuple[int, int]]):
+        n = len(durations)
+        self.dur = list(durations)
+        self.succ: List[List[int]] = [[] for _ in range(n)]
+        self.pred: List[List[int]] = [[] for _ in range(n)]
+        for p, s in edges:
+            self.succ[p].append(s)
+            self.pred[s].append(p)
+
+        indeg = [len(p) for p in self.pred]
+        queue = deque(v for v in range(n) if indeg[v] == 0)
+        order = []
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for w in self.succ[v]:
+                indeg[w] -= 1
+                if indeg[w] == 0:
+                    queue.append(w)
+        if len(order) != n:
+            raise ValueError("Cycle detected in task dependencies")
+
+        self.order = order
+        self.position = [0] * n
+        for i, v in enumerate(order):
+            self.position[v] = i
+        self.sources = [v for v in range(n) if not self.pred[v]]
+
+        self.head = [0] * n
+        for v in order:
+            if self.pred[v]:
+                self.head[v] = max(self.head[p] + self.dur[p] for p in self.pred[v])
+        self.tail = [0] * n
+        for v in reversed(order):
+            self.tail[v] = self.dur[v] + max((self.tail[s] for s in self.succ[v]), default=0)
+        self.end = max(self.tail, default=0)
+
+    def slack(self, v: int) -> int:
+        return self.end - self.head[v] - self.tail[v]
+
+    def change(self, deltas: Dict[int, int]) -> None:
+        """
+        Add deltas[v] days to each task's duration and repair head/tail.
+
+        Only tasks downstream (head) or upstream (tail) of a changed task
+        are recomputed, and propagation stops wherever a value comes out
+        the same; the rest of the topological order is just stepped over.
+        """
+        head, tail, dur, order = self.head, self.tail, self.dur, self.order
+        pred, succ, position = self.pred, self.succ, self.position
+        head_of, dur_of, tail_of = head.__getitem__, dur.__getitem__, tail.__getitem__
+        for v, delta in deltas.items():
+            dur[v] += delta
+
+        dirty = bytearray(len(order))
+        for v in deltas:
+            for w in succ[v]:
+                dirty[w] = 1
+        for i in range(min(position[v] for v in deltas), len(order)):
+            w = order[i]
+            if dirty[w]:
+                preds = pred[w]
+                start = max(map(add, map(head_of, preds), map(dur_of, preds)))
+                if start != head[w]:
+                    head[w] = start
+                    for x in succ[w]:
+                        dirty[x] = 1
+
+        dirty = bytearray(len(order))
+        for v in deltas:
+            dirty[v] = 1
+        for i in range(max(position[v] for v in deltas), -1, -1):
+            v = order[i]
+            if dirty[v]:
+                length = dur[v] + max(map(tail_of, succ[v]), default=0)
+                if length != tail[v]:
+                    tail[v] = length
+                    for p in pred[v]:
+                        dirty[p] = 1
+
+        self.end = max((tail[v] for v in self.sources), default=0)
+
+    def next_critical(self) -> float:
+        """Days until the longest non-critical path becomes critical"""
+        end = self.end
+        longest = max((k for k in map(add, self.head, self.tail) if k < end), default=None)
+        return INF if longest is None else end - longest
+
+    def critical_subgraph(self) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """Zero-slack tasks and the tight edges between them (every critical path)"""
+        head, tail, dur, end = self.head, self.tail, self.dur, self.end
+        nodes = [v for v in self.sources if tail[v] == end]
+        seen = set(nodes)
+        edges = []
+        queue = deque(nodes)
+        while queue:
+            v = queue.popleft()
+            finish = head[v] + dur[v]
+            for w in self.succ[v]:
+                if head[w] == finish and finish + tail[w] == end:
+                    edges.append((v, w))
+                    if w not in seen:
+                        seen.add(w)
+                        nodes.append(w)
+                        queue.append(w)
+        return nodes, edges
+
+
+def _min_cut(nodes: List[int], edges: List[Tuple[int, int]], capacity: Dict[int, float],
+             starts: Set[int], finishes: Set[int]) -> Tuple[float, List[int]]:
+    """
+    Cheapest set of nodes meeting every start -> finish path (node
+    capacities, infinite edges). Nodes are split into in (2i) and out
+    (2i + 1) halves joined by the node's capacity; Edmonds-Karp max flow,
+    then the cut is read off the residual graph.
+    """
+    local = {v: i for i, v in enumerate(nodes)}
+    source, sink = 2 * len(nodes), 2 * len(nodes) + 1
+    residual: List[Dict[int, float]] = [{} for _ in range(sink + 1)]
+
+    def arc(a: int, b: int, cap: float) -> None:
+        residual[a][b] = residual[a].get(b, 0) + cap
+        residual[b].setdefault(a, 0)
+
+    for v, i in local.items():
+        arc(2 * i, 2 * i + 1, capacity[v])
+        if v in starts:
+            arc(source, 2 * i, INF)
+        if v in finishes:
+            arc(2 * i + 1, sink, INF)
+    for a, b in edges:
+        arc(2 * local[a] + 1, 2 * local[b], INF)
+
+    flow = 0.0
+    while True:
+        parent = {source: None}
+        queue = deque([source])
+        while queue and sink not in parent:
+            a = queue.popleft()
+            for b, cap in residual[a].items():
+                if cap > 0 and b not in parent:
+                    parent[b] = a
+                    queue.append(b)
+        if sink not in parent:
+            break
+        path = []
+        b = sink
+        while parent[b] is not None:
+            path.append((parent[b], b))
+            b = parent[b]
+        pushed = min(residual[a][b] for a, b in path)
+        if pushed == INF:
+            return INF, []
+        for a, b in path:
+            residual[a][b] -= pushed
+            residual[b][a] += pushed
+        flow += pushed
+
+    # Source side of the cut: everything still reachable in the residual graph
+    reachable = {source}
+    queue = deque([source])
+    while queue:
+        a = queue.popleft()
+        for b, cap in residual[a].items():
+            if cap > 0 and b not in reachable:
+                reachable.add(b)
+                queue.append(b)
+    cut = [v for v, i in local.items() if 2 * i in reachable and 2 * i + 1 not in reachable]
+    return flow, cut
+
+
+def _separates(cut: List[int], edges: List[Tuple[int, int]], starts: Set[int], finishes: Set[int]) -> bool:
+    """True if every start -> finish path over edges passes through cut"""
+    blocked = set(cut)
+    succ: Dict[int, List[int]] = {}
+    for a, b in edges:
+        succ.setdefault(a, []).append(b)
+    queue = deque(v for v in starts if v not in blocked)
+    seen = set(queue)
+    while queue:
+        v = queue.popleft()
+        if v in finishes:
+            return False
+        for w in succ.get(v, ()):
+            if w not in seen and w not in blocked:
+                seen.add(w)
+                queue.append(w)
+    return True
+
+
+def crash_schedule(
+    durations: List[int],
+    edges: Sequence[Tuple[int, int]],
+    target_end: int,
+    max_crash: List[int],
+    cost_per_day: List[float],
+) -> Dict:
+    """
+    Shorten durations until the project ends by target_end, cheapest first.
+
+    Args:
+        durations: Scheduled length of each task (duration + buffer)
+        edges: (predecessor, successor) task indices
+        max_crash: Days each task may be shortened
+        cost_per_day: Cost of shortening each task by one day
+
+    Returns:
+        {
+            "original_end": int, "achieved_end": int, "feasible": bool,
+            "total_cost": float,
+            "crash": {task index: days},
+            "steps": [{"end": int, "days": int, "tasks": [index, ...], "cost": float}],
+        }
+
+    Greedy by cut: every step is the cheapest way to save the next days,
+    which is optimal when costs are linear and cuts stay nested. Tasks
+    shortened more than the final schedule needs are given days back at
+    the end, most expensive first.
+
+    Raises:
+        ValueError: If the graph contains a cycle
+    """
+    schedule = IncrementalSchedule(durations, edges)
+    original_end = schedule.end
+    remaining = list(max_crash)
+    steps = []
+
+    cut: List[int] = []
+    while schedule.end > target_end:
+        nodes, critical_edges = schedule.critical_subgraph()
+        starts = {v for v in nodes if not schedule.pred[v]}
+        finishes = {v for v in nodes if schedule.tail[v] == schedule.dur[v]}
+        # Crashing only ever adds critical paths, so while the last cut can
+        # still shrink and still meets every critical path it stays the
+        # cheapest one and the max flow can be skipped
+        if not (cut and all(remaining[v] > 0 and schedule.dur[v] > 0 for v in cut)
+                and _separates(cut, critical_edges, starts, finishes)):
+            capacity = {
+                v: cost_per_day[v] if remaining[v] > 0 and schedule.dur[v] > 0 else INF
+                for v in nodes
+            }
+            cost, cut = _min_cut(nodes, critical_edges, capacity, starts, finishes)
+            if cost == INF:
+                break  # every remaining critical path runs through tasks that can't shrink
+        cost = sum(cost_per_day[v] for v in cut)
+
+        # As many days as the cut stays valid: until a cut task runs out, or
+        # a path that is not critical yet becomes critical
+        days = int(min(
+            schedule.end - target_end,
+            min(min(remaining[v], schedule.dur[v]) for v in cut),
+            schedule.next_critical(),
+        ))
+        schedule.change({v: -days for v in cut})
+        for v in cut:
+            remaining[v] -= days
+        steps.append({"end": schedule.end, "days": days, "tasks": cut, "cost": cost * days})
+
+    crash = {v: max_crash[v] - remaining[v] for v in range(len(durations)) if remaining[v] != max_crash[v]}
+
+    # Give back days the final schedule doesn't need (slack on a crashed task)
+    for v in sorted(crash, key=lambda v: -cost_per_day[v]):
+        back = min(crash[v], schedule.slack(v))
+        if back > 0:
+            schedule.change({v: back})
+            crash[v] -= back
+    crash = {v: days for v, days in crash.items() if days}
+
+    return {
+        "original_end": original_end,
+        "achieved_end": schedule.end,
+        "feasible": schedule.end <= target_end,
+        "total_cost": sum(cost_per_day[v] * days for v, days in crash.items()),
+        "crash": crash,
+        "steps": steps,
+    }
+
+
+def crash_project(
+    tasks: List[Dict],
+    dependencies: List[Dict],
+    target_end: int,
+    limits: Dict[str, Tuple[int, float]],
+    default_max_fraction: float = 0.0,
+    default_cost_per_day: float = 1.0,
+) -> Dict:
+    """
+    crash_schedule over calculate_cpm-shaped inputs.
+
+    limits maps task id -> (max crash days, cost per day); other tasks may
+    lose default_max_fraction of their duration at default_cost_per_day.
+    Only duration is shortened, never buffer_time.
+
+    Returns crash_schedule's result with task ids, and "reductions":
+    [{"task_id", "days", "cost", "duration"}] where duration is the new one.
+
+    Dependencies must be finish-to-start; a lag becomes a task of that
+    length that can't be shortened. Other types and leads don't add up
+    along paths the way the cuts need, so they raise ValueError.
+    """
+    ids = [str(t["id"]) for t in tasks]
+    index = {tid: i for i, tid in enumerate(ids)}
+    base = [int(t.get("duration", 0)) for t in tasks]
+    durations = [d + int(t.get("buffer_time", 0)) for d, t in zip(base, tasks)]
+
+    max_crash, cost_per_day = [], []
+    for tid, d in zip(ids, base):
+        days, cost = limits.get(tid, (int(d * default_max_fraction), default_cost_per_day))
+        max_crash.append(max(0, min(days, d)))
+        cost_per_day.append(cost)
+
+    edges = []
+    for d in dependencies:
+        pred, succ = index.get(str(d["depends_on_task_id"])), index.get(str(d["task_id"]))
+        if pred is None or succ is None:
+            continue
+        lag = int(d.get("lag") or 0)
+        if (d.get("type") or "FS") != "FS" or lag < 0:
+            raise ValueError("Schedule compression supports finish-to-start dependencies without leads only")
+        if lag:
+            durations.append(lag)
+            max_crash.append(0)
+            cost_per_day.append(0.0)
+            edges += ((pred, len(durations) - 1), (len(durations) - 1, succ))
+        else:
+            edges.append((pred, succ))
+
+    result = crash_schedule(durations, edges, target_end, max_crash, cost_per_day)
+    result["reductions"] = [
+        {"task_id": ids[v], "days": days, "cost": cost_per_day[v] * days, "duration": base[v] - days}
+        for v, days in sorted(result.pop("crash").items(), key=lambda item: ids[item[0]])
+    ]
+    for step in result["steps"]:
+        step["tasks"] = [ids[v] for v in step["tasks"]]
+    result["target_end"] = target_end
+    return result
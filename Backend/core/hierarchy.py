@@ -0,0 +1,353 @@
+"""
+Work breakdown hierarchy
+Tasks nest under summary tasks. The CPM itself only schedules leaf tasks;
+summaries are rolled up from their subtasks afterwards. Top-level views
+schedule a condensed graph instead, where every collapsed summary is one
+block, so an executive dashboard never pays for the leaves underneath.
+"""
+
+from collections import deque
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from cpm import calculate_cpm, dependency_offset
+from core.cache import get_cache, GRAPH_CACHE_KEY
+
+# Condensed-graph index; tagged with the graph version, so any task or
+# dependency change rebuilds it
+HIERARCHY_CACHE_KEY = "cpm:hierarchy:v1"
+
+
+class TaskTree:
+    """Parent/child links and dates of the tasks in crud.load_task_tree"""
+
+    def __init__(self, rows: Dict[str, Tuple[Optional[str], Optional[date], Optional[date]]]):
+        self.parent: Dict[str, str] = {tid: row[0] for tid, row in rows.items() if row[0] is not None}
+        self.dates: Dict[str, Tuple[Optional[date], Optional[date]]] = {
+            tid: (row[1], row[2]) for tid, row in rows.items()
+        }
+        self.children: Dict[str, List[str]] = {}
+        for child, parent in self.parent.items():
+            self.children.setdefault(parent, []).append(child)
+
+    def ancestors(self, tid: str) -> List[str]:
+        """Summaries above tid, parent first"""
+        chain = []
+        parent = self.parent.get(tid)
+        while parent is not None:
+            chain.append(parent)
+            parent = self.parent.get(parent)
+        return chain
+
+    def summaries_bottom_up(self) -> List[str]:
+        """Every summary, each one after all summaries nested under it"""
+        order = []
+        stack = [tid for tid in self.children if tid not in self.parent]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(child for child in self.children[node] if child in self.children)
+        order.reverse()
+        return order
+
+
+# ==================== ROLLUPS ====================
+
+def rollup_schedule(result: Dict, tree: TaskTree) -> Dict[str, Dict]:
+    """
+    Summary values from a leaf CPM result: the earliest start and latest
+    finish below each summary, its least slack, and whether anything below
+    it is critical. duration is the rolled-up span (EF - ES); dates are the
+    earliest start_date and latest target_completion_date below it.
+
+    Returns: {summary_id: {"ES", "EF", "LS", "LF", "slack", "critical",
+                           "duration", "start_date", "target_completion_date"}}
+    """
+    ES, EF, LS, LF, slack = result["ES"], result["EF"], result["LS"], result["LF"], result["slack"]
+    critical = set(result["critical_path"])
+
+    rollups: Dict[str, Dict] = {}
+    for summary in tree.summaries_bottom_up():
+        rows = []
+        for child in tree.children[summary]:
+            if child in rollups:
+                rows.append(rollups[child])
+            elif child in ES:
+                start_date, target_date = tree.dates.get(child, (None, None))
+                rows.append({
+                    "ES": ES[child], "EF": EF[child], "LS": LS[child], "LF": LF[child],
+                    "slack": slack[child], "critical": child in critical,
+                    "start_date": start_date, "target_completion_date": target_date,
+                })
+        if not rows:
+            continue  # subtasks created after this CPM run
+
+        start = min(r["ES"] for r in rows)
+        finish = max(r["EF"] for r in rows)
+        rollups[summary] = {
+            "ES": start,
+            "EF": finish,
+            "LS": min(r["LS"] for r in rows),
+            "LF": max(r["LF"] for r in rows),
+            "slack": min(r["slack"] for r in rows),
+            "critical": any(r["critical"] for r in rows),
+            "duration": finish - start,
+            "start_date": min((r["start_date"] for r in rows if r["start_date"]), default=None),
+            "target_completion_date": max(
+                (r["target_completion_date"] for r in rows if r["target_completion_date"]), default=None
+            ),
+        }
+    return rollups
+
+
+# ==================== CONDENSED GRAPH ====================
+
+def build_summary_index(tasks: List[Dict], dependencies: List[Dict], tree: TaskTree) -> Dict:
+    """
+    Everything a summary-level CPM needs, computed once per graph version:
+
+        dur:    leaf durations (duration + buffer_time)
+        span:   each summary's own length, the longest path through its
+                leaves using only links inside it
+        top:    top-level tasks and summaries
+        links:  leaf links between different top-level branches, mapped to
+                the branch roots and deduplicated, as (pred, succ, type, lag)
+        branch: for each top-level summary, the leaf links touching it
+
+    A request then only walks the links of the branches it expands.
+    """
+    dur = {str(t["id"]): int(t.get("duration", 0)) + int(t.get("buffer_time", 0)) for t in tasks}
+    parent = tree.parent
+
+    root: Dict[str, str] = {}
+    top: List[str] = []
+    seen = set()
+    for tid in dur:
+        r = tid
+        while r in parent:
+            r = parent[r]
+        root[tid] = r
+        if r not in seen:
+            seen.add(r)
+            top.append(r)
+
+    edges = []
+    links = set()
+    branch: Dict[str, List[Tuple[str, str, str, int]]] = {}
+    for d in dependencies:
+        pred, succ = str(d["depends_on_task_id"]), str(d["task_id"])
+        if pred not in dur or succ not in dur:
+            continue
+        edge = (pred, succ, d.get("type") or "FS", int(d.get("lag") or 0))
+        edges.append(edge)
+        rp, rs = root[pred], root[succ]
+        if rp != rs:
+            links.add((rp, rs, edge[2], edge[3]))
+        if rp in tree.children:
+            branch.setdefault(rp, []).append(edge)
+        if rs != rp and rs in tree.children:
+            branch.setdefault(rs, []).append(edge)
+
+    return {
+        "parent": dict(parent),
+        "children": tree.children,
+        "top": top,
+        "dur": dur,
+        "span": _summary_spans(dur, edges, tree, root),
+        "links": list(links),
+        "branch": branch,
+    }
+
+
+def _summary_spans(dur: Dict[str, int], edges: List[Tuple[str, str, str, int]],
+                   tree: TaskTree, root: Dict[str, str]) -> Dict[str, int]:
+    """
+    Forward pass per summary over the nested leaves, in one topological
+    order: each link only counts for the summaries holding both its ends.
+    O(links x nesting depth).
+    """
+    ancestors = {tid: tree.ancestors(tid) for tid in dur if tid in tree.parent}
+    shared = {tid: set(chain) for tid, chain in ancestors.items()}
+
+    preds: Dict[str, List[Tuple[str, int]]] = {}
+    indeg = dict.fromkeys(ancestors, 0)
+    succs: Dict[str, List[str]] = {}
+    for pred, succ, kind, lag in edges:
+        if pred in ancestors and succ in ancestors and root[pred] == root[succ]:
+            preds.setdefault(succ, []).append((pred, dependency_offset(kind, lag, dur[pred], dur[succ])))
+            succs.setdefault(pred, []).append(succ)
+            indeg[succ] += 1
+
+    queue = deque(tid for tid, n in indeg.items() if n == 0)
+    early: Dict[Tuple[str, str], int] = {}  # (summary, leaf) -> ES inside that summary
+    span: Dict[str, int] = {}
+    visited = 0
+    while queue:
+        node = queue.popleft()
+        visited += 1
+        for summary in ancestors[node]:
+            start = 0
+            for pred, offset in preds.get(node, ()):
+                if summary in shared[pred]:
+                    start = max(start, early[summary, pred] + offset)
+            early[summary, node] = start
+            span[summary] = max(span.get(summary, 0), start + dur[node])
+        for succ in succs.get(node, ()):
+            indeg[succ] -= 1
+            if indeg[succ] == 0:
+                queue.append(succ)
+
+    if visited != len(ancestors):
+        raise ValueError("Cycle detected in task dependencies")
+    return span
+
+
+def cached_summary_index(db: Session) -> Dict:
+    """build_summary_index for the current graph, shared like the CPM result"""
+    from crud import load_task_tree
+    from core.graph_loader import load_cpm_inputs
+
+    return get_cache().get_or_compute(
+        HIERARCHY_CACHE_KEY,
+        lambda: build_summary_index(*load_cpm_inputs(db), TaskTree(load_task_tree(db))),
+        version_key=GRAPH_CACHE_KEY,
+    )
+
+
+def _cyclic(nodes: List[str], links: Iterable[Tuple[str, str, str, int]]) -> List[str]:
+    """Nodes on a cycle: members of strongly connected groups of two or more (Tarjan)"""
+    succ: Dict[str, List[str]] = {}
+    for pred, s, _, _ in links:
+        succ.setdefault(pred, []).append(s)
+
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    cyclic = []
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(succ.get(root, ())))]
+        while work:
+            node, it = work[-1]
+            for s in it:
+                if s not in index:
+                    index[s] = low[s] = len(index)
+                    stack.append(s)
+                    on_stack.add(s)
+                    work.append((s, iter(succ.get(s, ()))))
+                    break
+                if s in on_stack and index[s] < low[node]:
+                    low[node] = index[s]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == node:
+                            break
+                    if len(group) > 1:
+                        cyclic.extend(group)
+    return cyclic
+
+
+def summary_cpm(index: Dict, expand: Iterable[str] = ()) -> Dict:
+    """
+    CPM over top-level tasks, with the summaries in expand (and everything
+    above them) opened up into their children.
+
+    A collapsed summary is one task as long as its span; leaf links between
+    blocks keep their type and lag but attach to the block's start and
+    finish, so this is a planning view: the leaf CPM (GET /api/cpm) stays
+    the exact schedule. With every summary expanded the two agree.
+
+    Collapsed summaries that depend on each other both ways can't be
+    scheduled as blocks; they are opened up too, until no such loop is
+    left, and listed in "auto_expanded".
+
+    Returns the calculate_cpm result over the visible tasks, plus
+        "tasks": [{"id", "parent_id", "summary": bool, "duration"}]
+        "expanded": [summary_id, ...]
+        "auto_expanded": [summary_id, ...]
+
+    Raises:
+        ValueError: If an id in expand isn't a summary, or the leaf
+            graph itself contains a cycle
+    """
+    parent, children = index["parent"], index["children"]
+
+    expanded = set()
+
+    def open_up(tid: Optional[str]) -> None:
+        while tid is not None and tid not in expanded:
+            expanded.add(tid)
+            tid = parent.get(tid)
+
+    for tid in expand:
+        if tid not in children:
+            raise ValueError(f"Task {tid} is not a summary task")
+        open_up(tid)
+
+    def block(tid: str) -> str:
+        # Highest collapsed task on the way up from tid
+        found = tid
+        node = parent.get(tid)
+        while node is not None:
+            if node not in expanded:
+                found = node
+            node = parent.get(node)
+        return found
+
+    auto_expanded: List[str] = []
+    while True:
+        visible = []
+        stack = index["top"][::-1]
+        while stack:
+            node = stack.pop()
+            if node in expanded:
+                stack.extend(children[node][::-1])
+            else:
+                visible.append(node)
+
+        links = {link for link in index["links"] if link[0] not in expanded and link[1] not in expanded}
+        for summary in expanded:
+            if summary in parent:
+                continue  # top-level branches hold the links
+            for pred, succ, kind, lag in index["branch"].get(summary, ()):
+                pred, succ = block(pred), block(succ)
+                if pred != succ:
+                    links.add((pred, succ, kind, lag))
+
+        # Leaves on a loop are a real cycle: calculate_cpm reports it below
+        looped = sorted(tid for tid in _cyclic(visible, links) if tid in children)
+        if not looped:
+            break
+        for tid in looped:
+            open_up(tid)
+        auto_expanded.extend(looped)
+
+    dur, span = index["dur"], index["span"]
+    durations = {tid: span.get(tid, 0) if tid in children else dur.get(tid, 0) for tid in visible}
+    result = calculate_cpm(
+        [{"id": tid, "duration": durations[tid]} for tid in visible],
+        [{"task_id": s, "depends_on_task_id": p, "type": kind, "lag": lag} for p, s, kind, lag in links],
+    )
+
+    result["tasks"] = [
+        {"id": tid, "parent_id": parent.get(tid), "summary": tid in children, "duration": durations[tid]}
+        for tid in visible
+    ]
+    result["expanded"] = sorted(expanded)
+    result["auto_expanded"] = auto_expanded
+    return result
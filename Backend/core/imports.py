@@ -0,0 +1,483 @@
+"""
+Schedule import
+Uploaded CSV or MS Project XML is spooled to disk and parsed as a stream.
+Tasks are bulk-inserted in chunks while the file is read; dependencies
+and parent links once every external id is known. Everything happens in
+one transaction, and acyclicity is checked once at the end. Imported links
+only connect imported tasks, so the check covers them alone.
+Progress lives in the CPM cache so any worker can answer a poll.
+"""
+
+import csv
+import io
+import math
+import os
+import re
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import date, datetime, timezone
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+
+from config import CPM_JOB_TTL, IMPORT_CHUNK_ROWS
+from core.cache import LocalCache, NullCache, get_cache, notify_graph_changed
+from models import Task, TaskDependency
+
+FORMATS = ("csv", "msproject")
+
+IMPORT_KEY_PREFIX = "import:"
+IDS_KEY_PREFIX = "import-ids:"
+
+# Warnings kept on the record; the rest are only counted
+MAX_WARNINGS = 20
+
+_fallback_store = LocalCache()
+_guard = threading.Lock()
+_owned: Dict[str, float] = {}  # import_id -> start time, for TTL cleanup
+
+
+# ==================== PROGRESS ====================
+
+def _store():
+    # Records need somewhere to live even with the result cache disabled
+    cache = get_cache()
+    return _fallback_store if isinstance(cache, NullCache) else cache
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _read(key: str) -> Optional[Dict]:
+    store = _store()
+    return store.get(key, store.version(key))
+
+
+def _write(key: str, value) -> None:
+    store = _store()
+    store.set(key, store.version(key), value)
+
+
+def _update(import_id: str, **fields) -> None:
+    record = _read(IMPORT_KEY_PREFIX + import_id)
+    if record is not None:
+        record.update(fields)
+        _write(IMPORT_KEY_PREFIX + import_id, record)
+
+
+def _prune_expired() -> None:
+    cutoff = time.time() - CPM_JOB_TTL
+    with _guard:
+        stale = [import_id for import_id, started in _owned.items() if started < cutoff]
+        for import_id in stale:
+            del _owned[import_id]
+    for import_id in stale:
+        _store().delete(IMPORT_KEY_PREFIX + import_id)
+        _store().delete(IDS_KEY_PREFIX + import_id)
+
+
+def new_import(fmt: str, size: int, project_id: Optional[UUID]) -> Dict:
+    """Create the record for an upload that has been spooled to disk"""
+    _prune_expired()
+    import_id = uuid.uuid4().hex
+    record = {
+        "import_id": import_id,
+        "status": "queued",
+        "format": fmt,
+        "project_id": str(project_id) if project_id else None,
+        "bytes_total": size,
+        "bytes_read": 0,
+        "tasks": 0,
+        "dependencies": 0,
+        "warnings": [],
+        "skipped": 0,
+        "error": None,
+        "created_at": _now(),
+        "finished_at": None,
+    }
+    _write(IMPORT_KEY_PREFIX + import_id, record)
+    with _guard:
+        _owned[import_id] = time.time()
+    return record
+
+
+def get_import(import_id: str) -> Optional[Dict]:
+    return _read(IMPORT_KEY_PREFIX + import_id)
+
+
+def get_import_ids(import_id: str) -> Optional[Dict[str, str]]:
+    """{external id: task UUID} of a finished import"""
+    return _read(IDS_KEY_PREFIX + import_id)
+
+
+# ==================== PARSERS ====================
+# Both yield one dict per task:
+#   {"external_id", "name", "duration", "buffer_time", "description",
+#    "status", "start_date", "target_completion_date", "parent",
+#    "links": [(predecessor external id, type, lag), ...]}
+# CSV predecessors are yielded as written, with type None: they are split
+# into id, type and lag once every id in the file is known (_resolve_link).
+
+_CSV_COLUMNS = {
+    "id": "external_id", "uid": "external_id", "external_id": "external_id", "task_id": "external_id",
+    "name": "name", "task": "name", "title": "name", "task name": "name",
+    "duration": "duration",
+    "buffer_time": "buffer_time", "buffer": "buffer_time",
+    "description": "description", "notes": "description",
+    "status": "status",
+    "start_date": "start_date", "start": "start_date",
+    "target_completion_date": "target_completion_date", "finish": "target_completion_date", "end": "target_completion_date",
+    "parent": "parent", "parent_id": "parent",
+    "predecessors": "predecessors", "depends_on": "predecessors",
+}
+
+_STATUSES = {
+    "not_started": "not_started", "not started": "not_started", "not-started": "not_started", "todo": "not_started",
+    "in_progress": "in_progress", "in progress": "in_progress", "in-progress": "in_progress",
+    "done": "done", "complete": "done", "completed": "done",
+}
+
+# "12", "12FS", "12SS+2", "12FF-1d" (MS Project's predecessor notation); a
+# lag is only read after an explicit type, so "PROJ-12" is an id, not PROJ-12d
+_LINK = re.compile(r"^(.+?)(?:(FS|SS|FF|SF)(?:\s*([+-]\s*\d+)\s*(?:d|days?)?)?)?$", re.IGNORECASE)
+_DAYS = re.compile(r"^(\d+(?:\.\d+)?)\s*(?:d|days?)?$", re.IGNORECASE)
+
+
+def _days(value: str, what: str) -> int:
+    match = _DAYS.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid {what} {value!r}")
+    return math.ceil(float(match.group(1)))
+
+
+def _date(value: str) -> Optional[date]:
+    value = value.strip()
+    return date.fromisoformat(value[:10]) if value else None
+
+
+def _csv_links(value: str) -> List[Tuple[str, None, int]]:
+    return [(token.strip(), None, 0) for token in re.split(r"[;,]", value) if token.strip()]
+
+
+def _resolve_link(token: str, known: Set[str]) -> Tuple[str, str, int]:
+    """
+    (id, type, lag) of a CSV predecessor. A token that is itself a task id
+    is a plain FS link, so ids ending in a type or a number ("TASKSS",
+    "PROJ-12") are never split.
+    """
+    if token in known:
+        return token, "FS", 0
+    match = _LINK.match(token)
+    ext, kind, lag = match.group(1).strip(), (match.group(2) or "FS").upper(), match.group(3)
+    return ext, kind, int(lag.replace(" ", "")) if lag else 0
+
+
+def parse_csv(f: BinaryIO) -> Iterator[Dict]:
+    """
+    One task per row. Needs id and name columns; duration (days), status,
+    buffer_time, description, start_date, target_completion_date, parent
+    (an id) and predecessors ("3;5SS+2;7FF-1") are optional.
+    """
+    wrapper = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    try:
+        yield from _csv_rows(csv.reader(wrapper))
+    finally:
+        wrapper.detach()  # leave the file open for the caller
+
+
+def _csv_rows(reader) -> Iterator[Dict]:
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [_CSV_COLUMNS.get(h.strip().lower()) for h in header]
+    if "external_id" not in columns or "name" not in columns:
+        raise ValueError("CSV needs 'id' and 'name' columns")
+
+    for line, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        fields = {column: cell for column, cell in zip(columns, row) if column}
+        try:
+            status = fields.get("status", "").strip().lower()
+            if status and status not in _STATUSES:
+                raise ValueError(f"Unknown status {status!r}")
+            yield {
+                "external_id": fields["external_id"].strip(),
+                "name": fields["name"].strip(),
+                "duration": _days(fields.get("duration") or "0", "duration"),
+                "buffer_time": _days(fields.get("buffer_time") or "0", "buffer_time"),
+                "description": fields.get("description") or None,
+                "status": _STATUSES.get(status, "not_started"),
+                "start_date": _date(fields.get("start_date", "")),
+                "target_completion_date": _date(fields.get("target_completion_date", "")),
+                "parent": fields.get("parent", "").strip() or None,
+                "links": _csv_links(fields.get("predecessors", "")),
+            }
+        except ValueError as e:
+            raise ValueError(f"Line {line}: {e}")
+
+
+# MS Project link types: PredecessorLink/Type
+_MSP_LINK_TYPES = {"0": "FF", "1": "FS", "2": "SF", "3": "SS"}
+_MSP_DURATION = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:([\d.]+)S)?)?$")
+
+
+def _msp_minutes(value: str, minutes_per_day: int) -> float:
+    match = _MSP_DURATION.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration {value!r}")
+    d, h, m, s = (float(g) if g else 0 for g in match.groups())
+    return d * minutes_per_day + h * 60 + m + s / 60
+
+
+def parse_msproject(f: BinaryIO) -> Iterator[Dict]:
+    """
+    Tasks from an MS Project XML export (File > Save As > XML). Durations
+    and lags are converted to days with the file's MinutesPerDay; the
+    outline level gives the parent. Percentage lags are not supported.
+    """
+    minutes_per_day = 480
+    outline: List[str] = []
+    path: List[ET.Element] = []
+    for event, elem in ET.iterparse(f, events=("start", "end")):
+        if event == "start":
+            path.append(elem)
+            continue
+        path.pop()
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if tag == "MinutesPerDay" and len(path) == 1:
+            minutes_per_day = int(elem.text or 480) or 480
+        if len(path) != 2:
+            continue
+        # A direct child of a collection (Tasks, Resources, ...): done with it
+        path[1].remove(elem)
+        if tag != "Task":
+            continue
+
+        fields = {}
+        links = []
+        for child in elem:
+            name = child.tag.rsplit("}", 1)[-1]
+            if name == "PredecessorLink":
+                link = {c.tag.rsplit("}", 1)[-1]: c.text or "" for c in child}
+                lag = int(link.get("LinkLag") or 0) / 10 / minutes_per_day
+                links.append((link.get("PredecessorUID", "").strip(),
+                              _MSP_LINK_TYPES.get(link.get("Type", "1"), "FS"), round(lag)))
+            else:
+                fields[name] = child.text or ""
+        level = int(fields.get("OutlineLevel") or 1)
+        if fields.get("IsNull") == "1" or level == 0:
+            continue  # blank rows and the project summary task
+
+        uid = fields.get("UID", "").strip()
+        del outline[level - 1:]
+        outline.append(uid)
+        done = float(fields.get("PercentComplete") or 0)
+        try:
+            yield {
+                "external_id": uid,
+                "name": (fields.get("Name") or "").strip(),
+                "duration": math.ceil(_msp_minutes(fields.get("Duration") or "PT0H", minutes_per_day) / minutes_per_day),
+                "buffer_time": 0,
+                "description": fields.get("Notes") or None,
+                "status": "done" if done >= 100 else "in_progress" if done > 0 else "not_started",
+                "start_date": _date(fields.get("Start", "")),
+                "target_completion_date": _date(fields.get("Finish", "")),
+                "parent": outline[-2] if len(outline) > 1 else None,
+                "links": links,
+            }
+        except ValueError as e:
+            raise ValueError(f"Task UID {uid}: {e}")
+
+
+_PARSERS = {"csv": parse_csv, "msproject": parse_msproject}
+
+
+# ==================== IMPORT ====================
+
+def _find_cycle(remaining: set, preds: Dict[int, List[int]]) -> List[int]:
+    """A cycle among nodes Kahn's algorithm could not order"""
+    node = next(iter(remaining))
+    seen: Dict[int, int] = {}
+    walk = []
+    while node not in seen:
+        seen[node] = len(walk)
+        walk.append(node)
+        node = next(p for p in preds[node] if p in remaining)
+    return walk[seen[node]:][::-1]
+
+
+def _check_acyclic(edges: List[Tuple[int, int]], n: int, names: List[str]) -> None:
+    succs: Dict[int, List[int]] = {}
+    preds: Dict[int, List[int]] = {}
+    indeg = [0] * n
+    for pred, succ in edges:
+        succs.setdefault(pred, []).append(succ)
+        preds.setdefault(succ, []).append(pred)
+        indeg[succ] += 1
+    queue = deque(i for i in range(n) if indeg[i] == 0)
+    ordered = 0
+    while queue:
+        node = queue.popleft()
+        ordered += 1
+        for succ in succs.get(node, ()):
+            indeg[succ] -= 1
+            if indeg[succ] == 0:
+                queue.append(succ)
+    if ordered != n:
+        cycle = _find_cycle({i for i in range(n) if indeg[i] > 0}, preds)
+        path = " -> ".join(names[i] for i in cycle + cycle[:1])
+        raise ValueError(f"Dependencies form a cycle: {path}")
+
+
+def run_import(import_id: str, path: str, fmt: str, project_id: Optional[UUID]) -> None:
+    """
+    Parse the spooled file and insert its tasks and dependencies in one
+    transaction; runs in the background after the upload is accepted.
+    """
+    from database import SessionLocal
+    from core.schedule import refresh_schedule
+
+    start = time.perf_counter()
+    warnings: List[str] = []
+    skipped = 0
+
+    def warn(message: str) -> None:
+        nonlocal skipped
+        skipped += 1
+        if len(warnings) < MAX_WARNINGS:
+            warnings.append(message)
+
+    _update(import_id, status="running", started_at=_now())
+    db = SessionLocal.session_factory()
+    try:
+        ids: Dict[str, uuid.UUID] = {}  # external id -> UUID, assigned on first mention
+        order: List[str] = []           # external ids in file order
+        defined = set()
+        parents: List[Tuple[str, str]] = []
+        links: List[Tuple[str, str, str, int]] = []
+        batch: List[Dict] = []
+        tasks_table = Task.__table__
+
+        with open(path, "rb") as f:
+            for row in _PARSERS[fmt](f):
+                ext = row["external_id"]
+                if not ext:
+                    raise ValueError(f"Task {row['name']!r} has no id")
+                if not row["name"]:
+                    raise ValueError(f"Task {ext} has no name")
+                if ext in defined:
+                    raise ValueError(f"Duplicate task id {ext}")
+                tid = ids.setdefault(ext, uuid.uuid4())
+                defined.add(ext)
+                order.append(ext)
+                batch.append({
+                    "id": tid,
+                    "name": row["name"][:255],
+                    "duration": row["duration"],
+                    "buffer_time": row["buffer_time"],
+                    "description": row["description"],
+                    "status": row["status"],
+                    "start_date": row["start_date"],
+                    "target_completion_date": row["target_completion_date"],
+                    "project_id": project_id,
+                })
+                if row["parent"]:
+                    parents.append((ext, row["parent"]))
+                    ids.setdefault(row["parent"], uuid.uuid4())
+                for pred, kind, lag in row["links"]:
+                    links.append((pred, ext, kind, lag))
+
+                if len(batch) >= IMPORT_CHUNK_ROWS:
+                    db.execute(tasks_table.insert(), batch)
+                    batch = []
+                    _update(import_id, bytes_read=f.tell(), tasks=len(order))
+            if batch:
+                db.execute(tasks_table.insert(), batch)
+            _update(import_id, bytes_read=f.tell(), tasks=len(order))
+
+        for i, (pred, succ, kind, lag) in enumerate(links):
+            if kind is None:
+                pred, kind, lag = _resolve_link(pred, defined)
+                links[i] = (pred, succ, kind, lag)
+        referenced = dict.fromkeys(ids)
+        referenced.update(dict.fromkeys(pred for pred, _, _, _ in links))
+        unknown = [ext for ext in referenced if ext not in defined]
+        if unknown:
+            raise ValueError(f"Unknown task ids referenced: {', '.join(unknown[:10])}")
+
+        # Parents can come after their subtasks, so they are linked once all rows exist
+        _update(import_id, status="linking")
+        summaries = set()
+        for i in range(0, len(parents), IMPORT_CHUNK_ROWS):
+            chunk = parents[i:i + IMPORT_CHUNK_ROWS]
+            db.execute(
+                text("""
+                    UPDATE tasks AS t SET parent_id = v.parent_id
+                    FROM unnest(CAST(:ids AS uuid[]), CAST(:parents AS uuid[])) AS v(id, parent_id)
+                    WHERE t.id = v.id
+                """),
+                {"ids": [str(ids[c]) for c, _ in chunk], "parents": [str(ids[p]) for _, p in chunk]},
+            )
+        parent_of = dict(parents)
+        for child, parent in parents:
+            summaries.add(parent)
+            # Walk up: a task nested under itself would loop forever here
+            node, steps = parent, 0
+            while node in parent_of:
+                node = parent_of[node]
+                steps += 1
+                if node == child or steps > len(parents):
+                    raise ValueError(f"Task {child} is nested under itself")
+
+        index = {ext: i for i, ext in enumerate(order)}
+        edges: List[Tuple[int, int]] = []
+        rows: List[Dict] = []
+        seen_links = set()
+        for pred, succ, kind, lag in links:
+            if pred == succ:
+                warn(f"Task {succ} depends on itself; link skipped")
+            elif pred in summaries or succ in summaries:
+                warn(f"Link {pred} -> {succ} touches a summary task; link its subtasks instead (skipped)")
+            elif (pred, succ) in seen_links:
+                warn(f"Duplicate link {pred} -> {succ} skipped")
+            else:
+                seen_links.add((pred, succ))
+                edges.append((index[pred], index[succ]))
+                rows.append({
+                    "task_id": ids[succ], "depends_on_task_id": ids[pred], "type": kind, "lag": lag,
+                })
+
+        _update(import_id, status="validating", skipped=skipped, warnings=warnings)
+        _check_acyclic(edges, len(order), order)
+
+        _update(import_id, status="inserting dependencies")
+        deps_table = TaskDependency.__table__
+        for i in range(0, len(rows), IMPORT_CHUNK_ROWS):
+            db.execute(deps_table.insert(), rows[i:i + IMPORT_CHUNK_ROWS])
+            _update(import_id, dependencies=min(i + IMPORT_CHUNK_ROWS, len(rows)))
+
+        notify_graph_changed(db)
+        db.commit()
+        _write(IDS_KEY_PREFIX + import_id, {ext: str(ids[ext]) for ext in order})
+        _update(import_id, status="done", dependencies=len(rows), finished_at=_now())
+        print(f"📦 Import {import_id}: {len(order)} tasks, {len(rows)} dependencies "
+              f"in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Import {import_id} failed: {str(e)}")
+        _update(import_id, status="failed", error=str(e), finished_at=_now())
+        return
+    finally:
+        db.close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    refresh_schedule()
@@ -0,0 +1,260 @@
+"""
+Background CPM jobs
+Enqueue a CPM computation on the process pool and poll for the result.
+Jobs are deduplicated per graph version, and job records live in the CPM
+cache so any worker on the host can answer a poll.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from config import CPM_JOB_TTL
+from core.cache import (
+    CacheBackend, LocalCache, NullCache, SharedFileCache, get_cache, GRAPH_CACHE_KEY,
+)
+from core.components import calculate_cpm_by_component
+from core.hierarchy import TaskTree, rollup_schedule
+from core.pool import get_process_pool, uses_processes
+
+JOB_KEY_PREFIX = "cpm-job:"
+RESULT_KEY_PREFIX = "cpm-job-result:"
+_SUBMIT_LOCK_KEY = "cpm-jobs"
+
+FINISHED = ("done", "failed")
+
+_guard = threading.Lock()
+_futures: Dict[str, Future] = {}            # jobs this process submitted and is still running
+_finished_events: Dict[str, threading.Event] = {}
+_owned: Dict[str, float] = {}               # job_id -> submit time, for TTL cleanup
+_fallback_store = LocalCache()
+_untracked_generation = 0                   # stands in for the graph version when caching is off
+
+
+def _store() -> CacheBackend:
+    # Job records need somewhere to live even with the result cache disabled
+    cache = get_cache()
+    return _fallback_store if isinstance(cache, NullCache) else cache
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _read(key: str) -> Optional[Any]:
+    store = _store()
+    return store.get(key, store.version(key))
+
+
+def _write(key: str, value: Any) -> None:
+    store = _store()
+    store.set(key, store.version(key), value)
+
+
+def _update(job_id: str, **fields) -> None:
+    record = _read(JOB_KEY_PREFIX + job_id)
+    if record is not None:
+        record.update(fields)
+        _write(JOB_KEY_PREFIX + job_id, record)
+
+
+def _graph_version() -> int:
+    cache = get_cache()
+    if isinstance(cache, NullCache):
+        # No version tracking: only jobs still in flight can be shared
+        return _untracked_generation
+    return cache.version(GRAPH_CACHE_KEY)
+
+
+def _job_id(version: int) -> str:
+    # Versions are only host-wide with the shared store; otherwise they are
+    # per process, and the pid keeps ids from meaning different graphs
+    if isinstance(_store(), SharedFileCache):
+        return f"cpm-{version}"
+    return f"cpm-{os.getpid()}-{version}"
+
+
+def _owner_alive(record: Dict) -> bool:
+    pid = record.get("_owner_pid")
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+        return True
+    except (OSError, TypeError):
+        return False
+
+
+def _expired(record: Dict) -> bool:
+    if record["status"] not in FINISHED or not record.get("finished_at"):
+        return False
+    finished = datetime.fromisoformat(record["finished_at"])
+    return (datetime.now(timezone.utc) - finished).total_seconds() > CPM_JOB_TTL
+
+
+def _prune_expired() -> None:
+    cutoff = time.time() - CPM_JOB_TTL
+    with _guard:
+        stale = [job_id for job_id, submitted in _owned.items()
+                 if submitted < cutoff and job_id not in _futures]
+        for job_id in stale:
+            del _owned[job_id]
+            _finished_events.pop(job_id, None)
+    for job_id in stale:
+        record = _read(JOB_KEY_PREFIX + job_id)
+        if record is None or _expired(record):
+            _store().delete(JOB_KEY_PREFIX + job_id)
+            _store().delete(RESULT_KEY_PREFIX + job_id)
+
+
+def public_view(record: Dict) -> Dict:
+    return {k: v for k, v in record.items() if not k.startswith("_")}
+
+
+# ==================== SUBMIT / POLL ====================
+
+def submit_cpm_job() -> Dict:
+    """
+    Enqueue CPM for the current graph version and return its job record.
+
+    Submitting again while the graph is unchanged returns the existing job
+    (queued, running or done) instead of starting another computation.
+    """
+    _prune_expired()
+    cache = get_cache()
+    version = _graph_version()
+    job_id = _job_id(version)
+
+    with _store().lock(_SUBMIT_LOCK_KEY):
+        existing = get_job(job_id)
+        if existing is not None and existing["status"] != "failed" and (
+            existing["status"] in FINISHED or _owner_alive(existing)
+        ):
+            return existing
+
+        record = {
+            "job_id": job_id,
+            "status": "queued",
+            "graph_version": version,
+            "submitted_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "_owner_pid": os.getpid(),
+        }
+
+        # Already computed for this version by GET /api/cpm or an earlier job
+        cached = cache.get(GRAPH_CACHE_KEY, version)
+        if cached is not None:
+            _write(RESULT_KEY_PREFIX + job_id, cached)
+            record.update(status="done", started_at=record["submitted_at"], finished_at=_now())
+            _write(JOB_KEY_PREFIX + job_id, record)
+            return record
+
+        _write(JOB_KEY_PREFIX + job_id, record)
+
+    # The child publishes its own result when it can reach the same store;
+    # otherwise (local store with worker processes) it hands it back to us
+    publish = not uses_processes() or isinstance(_store(), SharedFileCache)
+    future = get_process_pool().submit(_execute_job, job_id, version, publish)
+    with _guard:
+        _futures[job_id] = future
+        _finished_events[job_id] = threading.Event()
+        _owned[job_id] = time.time()
+    future.add_done_callback(lambda f: _on_job_done(job_id, version, f))
+    print(f"📥 Queued CPM job {job_id}")
+    return record
+
+
+def get_job(job_id: str) -> Optional[Dict]:
+    """Job record, or None if unknown or expired"""
+    record = _read(JOB_KEY_PREFIX + job_id)
+    if record is None or _expired(record):
+        return None
+    return record
+
+
+def get_job_result(job_id: str) -> Optional[Dict]:
+    return _read(RESULT_KEY_PREFIX + job_id)
+
+
+def wait_for_job(job_id: str, timeout: float) -> Optional[Dict]:
+    """Block up to timeout seconds for the job to finish, then return its record"""
+    with _guard:
+        event = _finished_events.get(job_id)
+    if event is not None:
+        event.wait(timeout)
+        return get_job(job_id)
+
+    # Owned by another worker: poll the shared record
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        record = get_job(job_id)
+        if record is None or record["status"] in FINISHED or time.monotonic() >= deadline:
+            return record
+        time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        delay = min(delay * 2, 0.5)
+
+
+# ==================== EXECUTION ====================
+
+def _execute_job(job_id: str, version: int, publish: bool) -> Optional[Dict]:
+    """Runs in the pool: load the graph, compute CPM, publish or return the result"""
+    # Imported here so the pool child opens its own engine and connections
+    from database import SessionLocal
+    from crud import load_task_tree
+    from core.graph_loader import load_cpm_inputs
+
+    if publish:
+        _update(job_id, status="running", started_at=_now())
+
+    start = time.perf_counter()
+    db = SessionLocal.session_factory()
+    try:
+        tasks, dependencies = load_cpm_inputs(db)
+        tree = TaskTree(load_task_tree(db))
+    finally:
+        db.close()
+    # Already inside the pool: components run serially here
+    result = calculate_cpm_by_component(tasks, dependencies)
+    result["summaries"] = rollup_schedule(result, tree)
+    print(f"✅ CPM job {job_id}: {len(tasks)} tasks in {time.perf_counter() - start:.2f}s")
+
+    if not publish:
+        return result
+    _finish(job_id, version, result)
+    return None
+
+
+def _finish(job_id: str, version: int, result: Dict) -> None:
+    _write(RESULT_KEY_PREFIX + job_id, result)
+
+    # Unchanged graph: serve GET /api/cpm from this result too
+    cache = get_cache()
+    if cache.version(GRAPH_CACHE_KEY) == version:
+        cache.set(GRAPH_CACHE_KEY, version, result)
+
+    _update(job_id, status="done", finished_at=_now())
+
+
+def _on_job_done(job_id: str, version: int, future: Future) -> None:
+    global _untracked_generation
+    try:
+        result = future.result()
+        if result is not None:
+            _finish(job_id, version, result)
+    except Exception as e:
+        print(f"❌ CPM job {job_id} failed: {str(e)}")
+        _update(job_id, status="failed", finished_at=_now(), error=str(e))
+    finally:
+        with _guard:
+            _futures.pop(job_id, None)
+            event = _finished_events.get(job_id)
+            if isinstance(get_cache(), NullCache):
+                _untracked_generation = max(_untracked_generation, version + 1)
+        if event is not None:
+            event.set()
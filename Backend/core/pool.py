@@ -0,0 +1,49 @@
+"""
+Process pool for CPU-bound graph work
+Keeps long computations off the request threads so they don't hold the GIL
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from config import CPM_POOL_WORKERS
+
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> Executor:
+    """
+    Return this worker's pool, started on first use.
+
+    Children are spawned rather than forked: the parent runs listener and
+    request threads, and forking a threaded process can copy held locks.
+    With CPM_POOL_WORKERS=0 work runs on a single background thread instead.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if CPM_POOL_WORKERS > 0:
+                    _pool = ProcessPoolExecutor(
+                        max_workers=CPM_POOL_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    print(f"⚙️  Started CPM process pool with {CPM_POOL_WORKERS} worker(s)")
+                else:
+                    _pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpm-pool")
+    return _pool
+
+
+def uses_processes() -> bool:
+    return CPM_POOL_WORKERS > 0
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
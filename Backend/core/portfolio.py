@@ -0,0 +1,327 @@
+"""
+Portfolio CPM
+Each project is scheduled on its own and cached; projects only exchange
+the ES/LS of their boundary tasks (the ends of cross-project
+dependencies). An edit in one project re-summarizes that project, re-solves
+the small boundary graph, and re-runs only the projects whose boundary
+values moved.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from cpm import dependency_offset
+from core.cache import get_cache, GRAPH_CACHE_KEY
+from core.components import graph_digest
+
+PORTFOLIO_CACHE_KEY = "cpm:portfolio:v1"
+
+# project_id -> (fingerprint, summary) and (schedule key, schedule); one
+# entry per project, replaced when the project changes
+_summaries: Dict[Optional[str], Tuple[Tuple, Dict]] = {}
+_schedules: Dict[Optional[str], Tuple[Tuple, Dict]] = {}
+_state_lock = threading.Lock()
+
+
+class ProjectGraph:
+    """One project's tasks and internal links, by index, plus its boundary tasks"""
+
+    def __init__(self, ids: List[str], durations: List[int], edges: List[Tuple[int, int, str, int]],
+                 boundary: List[int]):
+        self.ids = ids
+        self.durations = durations
+        self.edges = edges
+        self.boundary = boundary
+        digest = graph_digest(zip(ids, durations), ((ids[p], ids[s], kind, lag) for p, s, kind, lag in edges))
+        self.key = (digest, frozenset(ids[b] for b in boundary))
+
+
+def _summarize(project: ProjectGraph) -> Dict:
+    """
+    Everything the boundary solve needs from one project, independent of
+    the other projects:
+
+        order:  topological order (indexes)
+        succ:   index -> [(succ index, offset)]
+        es:     standalone ES (no cross-project constraints)
+        end:    standalone project end
+        tail:   longest stretch from each task's start to any finish after it
+        dist:   boundary index -> {boundary index: longest ES-to-ES path}
+        reach:  boundary index -> longest stretch from its start to a finish
+
+    dist/reach cost one forward pass per boundary task, over only the
+    tasks reachable from it.
+    """
+    n = len(project.ids)
+    dur = project.durations
+    succ: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+    indeg = [0] * n
+    for p, s, kind, lag in project.edges:
+        succ[p].append((s, dependency_offset(kind, lag, dur[p], dur[s])))
+        indeg[s] += 1
+
+    queue = deque(i for i in range(n) if indeg[i] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for s, _ in succ[node]:
+            indeg[s] -= 1
+            if indeg[s] == 0:
+                queue.append(s)
+    if len(order) != n:
+        raise ValueError("Cycle detected in task dependencies")
+
+    es = [0] * n
+    for node in order:
+        for s, offset in succ[node]:
+            if es[node] + offset > es[s]:
+                es[s] = es[node] + offset
+    end = max((es[i] + dur[i] for i in range(n)), default=0)
+
+    tail = list(dur)
+    for node in reversed(order):
+        for s, offset in succ[node]:
+            if offset + tail[s] > tail[node]:
+                tail[node] = offset + tail[s]
+
+    position = [0] * n
+    for i, node in enumerate(order):
+        position[node] = i
+    boundary = set(project.boundary)
+    dist: Dict[int, Dict[int, int]] = {}
+    reach: Dict[int, int] = {}
+    for b in project.boundary:
+        reachable = [b]
+        seen = {b}
+        for node in reachable:
+            for s, _ in succ[node]:
+                if s not in seen:
+                    seen.add(s)
+                    reachable.append(s)
+        reachable.sort(key=position.__getitem__)
+
+        d = dict.fromkeys(reachable, None)
+        d[b] = 0
+        for node in reachable:
+            for s, offset in succ[node]:
+                if d[s] is None or d[node] + offset > d[s]:
+                    d[s] = d[node] + offset
+        dist[b] = {x: v for x, v in d.items() if x in boundary and x != b}
+        reach[b] = max(v + dur[x] for x, v in d.items())
+
+    return {"order": order, "succ": succ, "es": es, "end": end, "tail": tail, "dist": dist, "reach": reach}
+
+
+def _schedule(project: ProjectGraph, summary: Dict, release: Dict[int, int], deadline: Dict[int, int]) -> Dict:
+    """
+    ES/LS for one project given its boundary values: release holds the
+    earliest start of boundary tasks, deadline their latest start relative
+    to the portfolio end (<= 0). LS/LF come back relative to that end.
+    """
+    n = len(project.ids)
+    dur, succ, order = project.durations, summary["succ"], summary["order"]
+
+    es = [0] * n
+    for b, start in release.items():
+        es[b] = start
+    for node in order:
+        for s, offset in succ[node]:
+            if es[node] + offset > es[s]:
+                es[s] = es[node] + offset
+
+    ls = [-d for d in dur]
+    for b, start in deadline.items():
+        if start < ls[b]:
+            ls[b] = start
+    for node in reversed(order):
+        for s, offset in succ[node]:
+            if ls[s] - offset < ls[node]:
+                ls[node] = ls[s] - offset
+
+    return {"es": es, "ls": ls}
+
+
+def _solve_boundary(projects: Dict[Optional[str], ProjectGraph], summaries: Dict[Optional[str], Dict],
+                    cross: List[Tuple[str, str, int]]) -> Tuple[Dict[str, int], Dict[str, int], int, Dict]:
+    """
+    Longest paths over boundary tasks only: cross-project links plus each
+    project's internal boundary-to-boundary distances.
+
+    Returns (ES, LS, portfolio end, {project_id: end}) with ES/LS by task id.
+    """
+    where: Dict[str, Tuple[Optional[str], int]] = {}
+    for pid, project in projects.items():
+        for b in project.boundary:
+            where[project.ids[b]] = (pid, b)
+
+    succ: Dict[str, List[Tuple[str, int]]] = {tid: [] for tid in where}
+    indeg = dict.fromkeys(where, 0)
+    for pred, s, offset in cross:
+        succ[pred].append((s, offset))
+        indeg[s] += 1
+    for pid, project in projects.items():
+        ids = project.ids
+        for b, targets in summaries[pid]["dist"].items():
+            for x, d in targets.items():
+                succ[ids[b]].append((ids[x], d))
+                indeg[ids[x]] += 1
+
+    queue = deque(tid for tid, n in indeg.items() if n == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for s, _ in succ[node]:
+            indeg[s] -= 1
+            if indeg[s] == 0:
+                queue.append(s)
+    if len(order) != len(where):
+        raise ValueError("Cycle detected in task dependencies")
+
+    ES = {tid: summaries[pid]["es"][b] for tid, (pid, b) in where.items()}
+    for node in order:
+        for s, offset in succ[node]:
+            if ES[node] + offset > ES[s]:
+                ES[s] = ES[node] + offset
+
+    ends = {}
+    for pid, summary in summaries.items():
+        ids = projects[pid].ids
+        ends[pid] = max([summary["end"]] + [ES[ids[b]] + r for b, r in summary["reach"].items()])
+    end = max(ends.values(), default=0)
+
+    LS = {tid: end - summaries[pid]["tail"][b] for tid, (pid, b) in where.items()}
+    for node in reversed(order):
+        for s, offset in succ[node]:
+            if LS[s] - offset < LS[node]:
+                LS[node] = LS[s] - offset
+    return ES, LS, end, ends
+
+
+def calculate_portfolio_cpm(tasks: List[Dict], dependencies: List[Dict]) -> Dict:
+    """
+    Same ES/EF/LS/LF/slack/critical_path as calculate_cpm over all tasks,
+    computed project by project (tasks grouped by "project_id").
+
+    Returns those keys plus:
+        "project_end": int,
+        "projects": [{"id": project_id | None, "tasks": int, "project_end": int,
+                      "boundary": int, "recomputed": bool}],
+        "boundary": {"tasks": int, "links": int}
+
+    Raises:
+        ValueError: If the graph contains a cycle
+    """
+    durations: Dict[str, int] = {}
+    project_of: Dict[str, Optional[str]] = {}
+    members: Dict[Optional[str], List[str]] = {}
+    for t in tasks:
+        tid = str(t["id"])
+        durations[tid] = int(t.get("duration", 0)) + int(t.get("buffer_time", 0))
+        pid = t.get("project_id")
+        project_of[tid] = pid
+        members.setdefault(pid, []).append(tid)
+
+    position = {tid: i for ids in members.values() for i, tid in enumerate(ids)}
+    internal: Dict[Optional[str], List[Tuple[int, int, str, int]]] = {pid: [] for pid in members}
+    cross = []
+    boundary: Dict[Optional[str], set] = {pid: set() for pid in members}
+    for d in dependencies:
+        pred, succ = str(d["depends_on_task_id"]), str(d["task_id"])
+        if pred not in durations or succ not in durations:
+            continue
+        kind, lag = d.get("type") or "FS", int(d.get("lag") or 0)
+        if project_of[pred] == project_of[succ]:
+            internal[project_of[pred]].append((position[pred], position[succ], kind, lag))
+        else:
+            cross.append((pred, succ, dependency_offset(kind, lag, durations[pred], durations[succ])))
+            boundary[project_of[pred]].add(position[pred])
+            boundary[project_of[succ]].add(position[succ])
+
+    projects = {
+        pid: ProjectGraph(ids, [durations[tid] for tid in ids], internal[pid], sorted(boundary[pid]))
+        for pid, ids in members.items()
+    }
+
+    summaries, recomputed = {}, set()
+    for pid, project in projects.items():
+        with _state_lock:
+            cached = _summaries.get(pid)
+        if cached is not None and cached[0] == project.key:
+            summaries[pid] = cached[1]
+        else:
+            summaries[pid] = _summarize(project)
+            recomputed.add(pid)
+            with _state_lock:
+                _summaries[pid] = (project.key, summaries[pid])
+
+    ES_b, LS_b, project_end, ends = _solve_boundary(projects, summaries, cross)
+
+    ES, EF, LS, LF, slack = {}, {}, {}, {}, {}
+    critical_path = []
+    project_rows = []
+    for pid, project in projects.items():
+        ids, dur = project.ids, project.durations
+        release = {b: ES_b[ids[b]] for b in project.boundary}
+        deadline = {b: LS_b[ids[b]] - project_end for b in project.boundary}
+        key = (project.key, frozenset(release.items()), frozenset(deadline.items()))
+        with _state_lock:
+            cached = _schedules.get(pid)
+        if cached is not None and cached[0] == key:
+            schedule = cached[1]
+        else:
+            schedule = _schedule(project, summaries[pid], release, deadline)
+            recomputed.add(pid)
+            with _state_lock:
+                _schedules[pid] = (key, schedule)
+
+        es, ls = schedule["es"], schedule["ls"]
+        for i in summaries[pid]["order"]:
+            tid = ids[i]
+            start, late = es[i], ls[i] + project_end
+            ES[tid] = start
+            EF[tid] = start + dur[i]
+            LS[tid] = late
+            LF[tid] = late + dur[i]
+            slack[tid] = late - start
+            if late == start:
+                critical_path.append(tid)
+        project_rows.append({
+            "id": pid,
+            "tasks": len(ids),
+            "project_end": ends[pid],
+            "boundary": len(project.boundary),
+            "recomputed": pid in recomputed,
+        })
+
+    with _state_lock:
+        for cache in (_summaries, _schedules):
+            for pid in [pid for pid in cache if pid not in projects]:
+                del cache[pid]
+
+    return {
+        "ES": ES,
+        "EF": EF,
+        "LS": LS,
+        "LF": LF,
+        "slack": slack,
+        "project_end": project_end,
+        "critical_path": critical_path,
+        "projects": project_rows,
+        "boundary": {"tasks": len(ES_b), "links": len(cross)},
+    }
+
+
+def cached_portfolio_cpm(db: Session) -> Dict:
+    """calculate_portfolio_cpm for the current graph, shared like the CPM result"""
+    from core.graph_loader import load_cpm_inputs
+
+    return get_cache().get_or_compute(
+        PORTFOLIO_CACHE_KEY,
+        lambda: calculate_portfolio_cpm(*load_cpm_inputs(db)),
+        version_key=GRAPH_CACHE_KEY,
+    )
@@ -0,0 +1,254 @@
+"""
+Opt-in request profiling and slow-query logging
+"""
+
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from config import (
+    PROFILE_SAMPLE_RATE,
+    PROFILE_HEADER_ENABLED,
+    PROFILE_DIR,
+    PROFILE_MAX_FILES,
+    SLOW_QUERY_MS,
+)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# "METHOD /path/{template}" of the request currently being handled
+_current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_HEADER_ENABLED or PROFILE_SAMPLE_RATE > 0
+
+
+class RequestProfile:
+    """Everything captured for one profiled request"""
+
+    def __init__(self, route: str):
+        self.id = uuid.uuid4().hex
+        self.route = route
+        self.started_at = time.time()
+        self.endpoint_profiler: Optional[cProfile.Profile] = None
+        self.endpoint_ms = 0.0
+        self.sql_ms = 0.0
+        self.sql_count = 0
+        self.slowest_sql: List[Dict] = []
+
+    def record_sql(self, statement: str, elapsed_ms: float) -> None:
+        self.sql_ms += elapsed_ms
+        self.sql_count += 1
+        self.slowest_sql.append({"ms": round(elapsed_ms, 2), "statement": statement[:500]})
+        self.slowest_sql.sort(key=lambda q: q["ms"], reverse=True)
+        del self.slowest_sql[5:]
+
+    def save(self, total_ms: float, status_code: int) -> None:
+        """
+        Write <id>.prof (pstats, loadable with snakeviz or pstats) and
+        <id>.json with the time breakdown.
+
+        The profiler covers the endpoint body (SQL, cycle checks, CPM);
+        whatever is left of total_ms was spent validating and serializing
+        the response.
+        """
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        if self.endpoint_profiler is not None:
+            self.endpoint_profiler.dump_stats(os.path.join(PROFILE_DIR, f"{self.id}.prof"))
+
+        meta = {
+            "id": self.id,
+            "route": self.route,
+            "status_code": status_code,
+            "started_at": self.started_at,
+            "total_ms": round(total_ms, 2),
+            "endpoint_ms": round(self.endpoint_ms, 2),
+            "sql_ms": round(self.sql_ms, 2),
+            "sql_count": self.sql_count,
+            "serialization_ms": round(max(total_ms - self.endpoint_ms, 0.0), 2),
+            "slowest_sql": self.slowest_sql,
+            "has_stats": self.endpoint_profiler is not None,
+        }
+        with open(os.path.join(PROFILE_DIR, f"{self.id}.json"), "w") as f:
+            json.dump(meta, f)
+
+        _prune_profiles()
+
+
+def _prune_profiles() -> None:
+    """Keep only the newest PROFILE_MAX_FILES profiles"""
+    metas = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in metas[PROFILE_MAX_FILES:]:
+        profile_id = entry.name[:-len(".json")]
+        for suffix in (".json", ".prof"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[Dict]:
+    """Metadata of stored profiles, newest first"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(PROFILE_DIR):
+        if entry.name.endswith(".json"):
+            with open(entry.path) as f:
+                profiles.append(json.load(f))
+    profiles.sort(key=lambda p: p["started_at"], reverse=True)
+    return profiles
+
+
+def load_profile(profile_id: str, top: int = 30) -> Optional[Dict]:
+    """Metadata plus the top functions by cumulative time, or None if unknown"""
+    meta_path = profile_path(profile_id, ".json")
+    if meta_path is None:
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    stats_path = profile_path(profile_id, ".prof")
+    if stats_path is not None:
+        out = io.StringIO()
+        pstats.Stats(stats_path, stream=out).sort_stats("cumulative").print_stats(top)
+        meta["stats"] = out.getvalue()
+    return meta
+
+
+def profile_path(profile_id: str, suffix: str) -> Optional[str]:
+    """Path of a stored profile file; ids are validated so they cannot escape PROFILE_DIR"""
+    try:
+        profile_id = uuid.UUID(hex=profile_id).hex
+    except ValueError:
+        return None
+    path = os.path.join(PROFILE_DIR, profile_id + suffix)
+    return path if os.path.exists(path) else None
+
+
+def _should_profile(request: Request) -> bool:
+    if PROFILE_HEADER_ENABLED and request.headers.get(PROFILE_HEADER) == "1":
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _profile_sync_endpoint(endpoint: Callable) -> Callable:
+    """
+    Run cProfile around a sync endpoint when its request is being profiled.
+
+    Sync endpoints execute in the threadpool, so the profiler has to be
+    enabled on that thread; the request's RequestProfile reaches it via the
+    copied contextvars.
+    """
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profile.endpoint_ms += (time.perf_counter() - start) * 1000
+            profile.endpoint_profiler = profiler
+
+    wrapper.profiled = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    APIRoute that tags SQL with the route that issued it and profiles
+    requests that opt in (X-Profile header or PROFILE_SAMPLE_RATE).
+
+    Usage: APIRouter(..., route_class=ProfiledRoute)
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # include_router() re-creates routes from already wrapped endpoints
+        if not asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "profiled", False):
+            endpoint = _profile_sync_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request):
+            route = f"{request.method} {self.path}"
+            route_token = _current_route.set(route)
+            try:
+                if not _should_profile(request):
+                    return await handler(request)
+
+                profile = RequestProfile(route)
+                profile_token = _current_profile.set(profile)
+                start = time.perf_counter()
+                try:
+                    response = await handler(request)
+                finally:
+                    _current_profile.reset(profile_token)
+
+                total_ms = (time.perf_counter() - start) * 1000
+                profile.save(total_ms, response.status_code)
+                response.headers[PROFILE_ID_HEADER] = profile.id
+                print(
+                    f"🔬 PROFILED {route}: {total_ms:.1f} ms "
+                    f"(endpoint {profile.endpoint_ms:.1f} ms, SQL {profile.sql_ms:.1f} ms "
+                    f"in {profile.sql_count} statements) -> /api/profiles/{profile.id}"
+                )
+                return response
+            finally:
+                _current_route.reset(route_token)
+
+        return profiled_handler
+
+
+def install_query_timer(engine) -> None:
+    """Time every statement on engine; log slow ones with the route that issued them"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record_sql(statement, elapsed_ms)
+
+        if SLOW_QUERY_MS and elapsed_ms >= SLOW_QUERY_MS:
+            route = _current_route.get() or "(no route)"
+            print(f"🐢 SLOW QUERY {elapsed_ms:.1f} ms [{route}]: {' '.join(statement.split())[:500]}")
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(context):
+        # after_cursor_execute never fires for a failed statement
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
@@ -0,0 +1,244 @@
+"""
+Materialized CPM schedule
+Writes ES/EF/LS/LF/slack/is_critical onto task rows so lists can filter
+and sort on them in SQL; summary tasks also get their rolled-up duration
+(in rollup_duration) and dates. Refreshed in the background after writes;
+only rows whose values changed are updated.
+
+A component whose content key and offset from the project end are the
+same as at the last refresh has the same schedule, so when this worker
+wrote the last refresh (its token is still in schedule_state) only the
+other components' rows are read back and compared.
+"""
+
+import threading
+import time
+from itertools import islice
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.components import cached_graph_cpm
+
+# Arbitrary app-wide key ("pm_sched") serializing refreshes across workers,
+# so an older computation can never overwrite a newer one
+SCHEDULE_LOCK_ID = 0x706D5F7363686564
+
+# Rows per UPDATE statement
+WRITE_CHUNK = 10000
+
+_state_lock = threading.Lock()
+_running = False
+_pending = False
+
+# (token, component states) of the last refresh this worker committed
+_base: Optional[Tuple[str, FrozenSet[Tuple[str, int]]]] = None
+
+
+def refresh_schedule() -> None:
+    """
+    Bring the stored schedule up to date with the current graph.
+
+    Safe to call after every write: calls that arrive while a refresh is
+    running collapse into one more pass afterwards.
+    """
+    global _running, _pending
+    with _state_lock:
+        if _running:
+            _pending = True
+            return
+        _running = True
+
+    try:
+        while True:
+            with _state_lock:
+                _pending = False
+            try:
+                _refresh_once()
+            except Exception as e:
+                print(f"❌ Schedule refresh failed: {str(e)}")
+            with _state_lock:
+                if not _pending:
+                    return
+    finally:
+        with _state_lock:
+            _running = False
+
+
+def _component_states(result: Dict) -> FrozenSet[Tuple[str, int]]:
+    # (content key, days before the project end) per component
+    end = result["project_end"]
+    return frozenset((c["key"], end - c["project_end"]) for c in result["components"])
+
+
+def _changed_task_ids(result: Dict, states: FrozenSet[Tuple[str, int]]) -> List[str]:
+    """Task ids of the components not in states (ES lists them component by component)"""
+    end = result["project_end"]
+    keys = iter(result["ES"])
+    ids: List[str] = []
+    for c in result["components"]:
+        component = islice(keys, c["tasks"])
+        if (c["key"], end - c["project_end"]) in states:
+            for _ in component:
+                pass
+        else:
+            ids.extend(component)
+    return ids
+
+
+def _refresh_once() -> None:
+    global _base
+    from database import SessionLocal
+
+    start = time.perf_counter()
+    db = SessionLocal.session_factory()
+    try:
+        db.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": SCHEDULE_LOCK_ID})
+
+        try:
+            result = cached_graph_cpm(db)
+        except ValueError as e:
+            # Cyclic graph: leave the last good schedule in place
+            print(f"⚠️  Schedule not refreshed: {str(e)}")
+            db.rollback()
+            return
+
+        token = db.execute(text("SELECT token FROM schedule_state WHERE id = 1")).scalar()
+        ids = None
+        if _base is not None and token == _base[0]:
+            ids = _changed_task_ids(result, _base[1])
+            if 2 * len(ids) > len(result["ES"]):
+                ids = None  # most of the graph moved: one scan is cheaper
+
+        changed, summaries = _changed_rows(db, result, ids)
+        for i in range(0, len(changed), WRITE_CHUNK):
+            _write_rows(db, changed[i:i + WRITE_CHUNK])
+        for i in range(0, len(summaries), WRITE_CHUNK):
+            _write_summary_rows(db, summaries[i:i + WRITE_CHUNK])
+
+        token = uuid4().hex
+        db.execute(
+            text("""
+                INSERT INTO schedule_state (id, token, updated_at) VALUES (1, :token, now())
+                ON CONFLICT (id) DO UPDATE SET token = EXCLUDED.token, updated_at = EXCLUDED.updated_at
+            """),
+            {"token": token},
+        )
+        db.commit()  # releases the schedule lock
+        _base = (token, _component_states(result))
+        scope = "all tasks" if ids is None else f"{len(ids)} task(s) in changed components"
+        print(f"📅 Schedule refreshed: {len(changed) + len(summaries)} task(s) changed "
+              f"({scope} compared) in {time.perf_counter() - start:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _changed_rows(db: Session, result: Dict,
+                  ids: Optional[List[str]] = None) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Rows whose stored values differ: (id, ES, EF, LS, LF, slack, critical)
+    for leaf tasks, and the same plus (rollup_duration, start_date,
+    target_completion_date) for summary tasks. With ids, only those leaf
+    tasks and the summary tasks are read; otherwise every task is.
+    """
+    ES, EF, LS, LF, slack = result["ES"], result["EF"], result["LS"], result["LF"], result["slack"]
+    critical = set(result["critical_path"])
+    rollups = result.get("summaries", {})
+
+    sql = (
+        "SELECT id::text, early_start, early_finish, late_start, late_finish, slack, is_critical, "
+        "rollup_duration, start_date, target_completion_date FROM tasks"
+    )
+    if ids is None:
+        stored = db.execute(text(sql))
+    else:
+        stored = db.execute(
+            text(sql + " WHERE id = ANY(CAST(:ids AS uuid[]))"),
+            {"ids": ids + list(rollups)},
+        )
+    changed, summaries = [], []
+    for row in stored:
+        tid = row[0]
+        if tid in ES:
+            values = (ES[tid], EF[tid], LS[tid], LF[tid], slack[tid], tid in critical)
+            if tuple(row[1:7]) != values:
+                changed.append((tid,) + values)
+        elif tid in rollups:
+            r = rollups[tid]
+            # Summaries without dated subtasks keep their own dates
+            values = (
+                r["ES"], r["EF"], r["LS"], r["LF"], r["slack"], r["critical"], r["duration"],
+                r["start_date"] or row[8], r["target_completion_date"] or row[9],
+            )
+            if tuple(row[1:]) != values:
+                summaries.append((tid,) + values)
+        # else: created after the CPM snapshot; the next refresh picks it up
+    return changed, summaries
+
+
+def _write_rows(db: Session, rows: List[tuple]) -> None:
+    # One statement per chunk: arrays unnested into a join, not one UPDATE per row
+    columns = list(zip(*rows))
+    db.execute(
+        text("""
+            UPDATE tasks AS t SET
+                early_start = v.es, early_finish = v.ef,
+                late_start = v.ls, late_finish = v.lf,
+                slack = v.slack, is_critical = v.critical
+            FROM unnest(
+                CAST(:ids AS uuid[]), CAST(:es AS int[]), CAST(:ef AS int[]),
+                CAST(:ls AS int[]), CAST(:lf AS int[]), CAST(:slack AS int[]),
+                CAST(:critical AS boolean[])
+            ) AS v(id, es, ef, ls, lf, slack, critical)
+            WHERE t.id = v.id
+        """),
+        {
+            "ids": list(columns[0]),
+            "es": list(columns[1]),
+            "ef": list(columns[2]),
+            "ls": list(columns[3]),
+            "lf": list(columns[4]),
+            "slack": list(columns[5]),
+            "critical": list(columns[6]),
+        },
+    )
+
+
+def _write_summary_rows(db: Session, rows: List[tuple]) -> None:
+    # Like _write_rows, plus the rolled-up duration and dates; the summary's
+    # own duration is left as entered
+    columns = list(zip(*rows))
+    db.execute(
+        text("""
+            UPDATE tasks AS t SET
+                early_start = v.es, early_finish = v.ef,
+                late_start = v.ls, late_finish = v.lf,
+                slack = v.slack, is_critical = v.critical,
+                rollup_duration = v.duration, start_date = v.start_date,
+                target_completion_date = v.target_date
+            FROM unnest(
+                CAST(:ids AS uuid[]), CAST(:es AS int[]), CAST(:ef AS int[]),
+                CAST(:ls AS int[]), CAST(:lf AS int[]), CAST(:slack AS int[]),
+                CAST(:critical AS boolean[]), CAST(:duration AS int[]),
+                CAST(:start_date AS date[]), CAST(:target_date AS date[])
+            ) AS v(id, es, ef, ls, lf, slack, critical, duration, start_date, target_date)
+            WHERE t.id = v.id
+        """),
+        {
+            "ids": list(columns[0]),
+            "es": list(columns[1]),
+            "ef": list(columns[2]),
+            "ls": list(columns[3]),
+            "lf": list(columns[4]),
+            "slack": list(columns[5]),
+            "critical": list(columns[6]),
+            "duration": list(columns[7]),
+            "start_date": list(columns[8]),
+            "target_date": list(columns[9]),
+        },
+    )
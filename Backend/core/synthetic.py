@@ -0,0 +1,194 @@
+"""
+Synthetic project generator
+Parameterized task graphs (DAGs) for seeding, benchmarks and load tests
+"""
+
+import math
+import random
+from typing import Dict, List, Tuple
+
+SHAPES = ("chain", "fanout", "fanin", "layered")
+DURATION_DISTRIBUTIONS = ("uniform", "normal", "lognormal", "fixed")
+
+
+def generate_project(
+    num_tasks: int,
+    shape: str = "layered",
+    density: float = 1.5,
+    duration_dist: str = "uniform",
+    min_duration: int = 1,
+    max_duration: int = 20,
+    max_buffer: int = 0,
+    mixed: float = 0.0,
+    seed: int = 0,
+) -> Dict:
+    """
+    Generate a random project graph.
+
+    Tasks are numbered in topological order and every edge points from a
+    lower to a higher index, so the result is always a DAG.
+
+    Args:
+        num_tasks: Number of tasks
+        shape: "chain" (long parallel chains), "fanout" (few hubs gating
+            many tasks), "fanin" (many tasks feeding few merge points) or
+            "layered" (random edges between consecutive layers)
+        density: Average number of predecessors per task
+        duration_dist: "uniform", "normal", "lognormal" (heavy tail) or "fixed"
+        min_duration / max_duration: Duration range in days
+        max_buffer: Buffer time drawn uniformly from 0..max_buffer
+        mixed: Share of dependencies that get a random SS/FF/SF type and
+            a lag between -2 and 5 days (the rest are plain FS)
+        seed: RNG seed; the same arguments always give the same project
+
+    Returns:
+        {
+            "durations": [int, ...],
+            "buffers": [int, ...],
+            "edges": [(depends_on_index, task_index), ...],  # sorted by task_index
+            "types": [str, ...], "lags": [int, ...]  # per edge, only when mixed > 0
+        }
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}', expected one of {SHAPES}")
+    if duration_dist not in DURATION_DISTRIBUTIONS:
+        raise ValueError(f"Unknown duration distribution '{duration_dist}'")
+
+    rng = random.Random(seed)
+    durations = _durations(rng, num_tasks, duration_dist, min_duration, max_duration)
+    buffers = _durations(rng, num_tasks, "uniform", 0, max_buffer) if max_buffer else [0] * num_tasks
+    edges = _EDGE_GENERATORS[shape](rng, num_tasks, density)
+    project = {"durations": durations, "buffers": buffers, "edges": edges}
+    if mixed:
+        rand = rng.random
+        types, lags = [], []
+        for _ in edges:
+            if rand() < mixed:
+                types.append(("SS", "FF", "SF")[int(rand() * 3)])
+                lags.append(int(rand() * 8) - 2)
+            else:
+                types.append("FS")
+                lags.append(0)
+        project["types"], project["lags"] = types, lags
+    return project
+
+
+def _durations(rng: random.Random, n: int, dist: str, lo: int, hi: int) -> List[int]:
+    if dist == "fixed":
+        return [lo] * n
+    if dist == "uniform":
+        rand, span = rng.random, hi - lo + 1
+        return [lo + int(rand() * span) for _ in range(n)]
+    if dist == "normal":
+        mean, sd = (lo + hi) / 2, max((hi - lo) / 6, 1e-9)
+        return [min(hi, max(lo, round(rng.gauss(mean, sd)))) for _ in range(n)]
+    # lognormal: median at lo + (hi - lo) / 4, long tail up to hi
+    mu = math.log(max(lo + (hi - lo) / 4, 1))
+    return [min(hi, max(lo, round(rng.lognormvariate(mu, 0.75)))) for _ in range(n)]
+
+
+def _sample(rng: random.Random, lo: int, hi: int, k: int) -> List[int]:
+    """k distinct sorted integers from [lo, hi); much cheaper than rng.sample for small k"""
+    span = hi - lo
+    if k >= span:
+        return list(range(lo, hi))
+    rand = rng.random
+    if k == 1:
+        return [lo + int(rand() * span)]
+    picked = set()
+    while len(picked) < k:
+        picked.add(lo + int(rand() * span))
+    return sorted(picked)
+
+
+def _pred_count(rng: random.Random, density: float) -> int:
+    """Integer predecessor count whose mean is density"""
+    whole = int(density)
+    return whole + (1 if rng.random() < density - whole else 0)
+
+
+def _chain_edges(rng: random.Random, n: int, density: float) -> List[Tuple[int, int]]:
+    # ~sqrt(n) interleaved chains; task i continues chain i % chains
+    chains = max(1, int(math.sqrt(n)))
+    edges = []
+    for i in range(1, n):
+        preds = set()
+        if i >= chains:
+            preds.add(i - chains)
+        extra = _pred_count(rng, density) - len(preds)
+        if extra > 0:
+            preds.update(_sample(rng, 0, i, extra))
+        edges.extend((p, i) for p in sorted(preds))
+    return edges
+
+
+def _fanout_edges(rng: random.Random, n: int, density: float) -> List[Tuple[int, int]]:
+    # Few hub tasks up front, everything else hangs off them
+    hubs = max(1, int(math.log2(n + 1)))
+    edges = []
+    for i in range(1, n):
+        k = min(max(_pred_count(rng, density), 1), min(i, hubs))
+        edges.extend((p, i) for p in _sample(rng, 0, min(i, hubs), k))
+    return edges
+
+
+def _fanin_edges(rng: random.Random, n: int, density: float) -> List[Tuple[int, int]]:
+    # Few merge tasks at the end, each waiting on a large share of the rest
+    merges = max(1, int(math.log2(n + 1)))
+    body = n - merges
+    edges = []
+    for i in range(1, body):
+        # Sparse random structure in the body
+        if rng.random() < 0.5:
+            edges.append((int(rng.random() * i), i))
+    per_merge = min(body, max(1, int(density * n / merges)))
+    for i in range(body, n):
+        edges.extend((p, i) for p in _sample(rng, 0, i, per_merge))
+    return edges
+
+
+def _layered_edges(rng: random.Random, n: int, density: float) -> List[Tuple[int, int]]:
+    # ~sqrt(n) layers; predecessors come from the previous layer
+    width = max(1, int(math.sqrt(n)))
+    edges = []
+    for i in range(width, n):
+        layer_start = (i // width) * width
+        prev_start = layer_start - width
+        k = min(max(_pred_count(rng, density), 1), width)
+        edges.extend((p, i) for p in _sample(rng, prev_start, layer_start, k))
+    return edges
+
+
+_EDGE_GENERATORS = {
+    "chain": _chain_edges,
+    "fanout": _fanout_edges,
+    "fanin": _fanin_edges,
+    "layered": _layered_edges,
+}
+
+
+def task_uuids(num_tasks: int, seed: int = 0) -> List[str]:
+    """Deterministic version-4 UUID strings, so a seeded project is reproducible"""
+    h = random.Random(f"uuids-{seed}").randbytes(16 * num_tasks).hex()
+    # Force the version nibble to 4 and the variant bits to 10xx
+    return [
+        f"{h[j:j + 8]}-{h[j + 8:j + 12]}-4{h[j + 13:j + 16]}-{_VARIANT[h[j + 16]]}{h[j + 17:j + 20]}-{h[j + 20:j + 32]}"
+        for j in range(0, 32 * num_tasks, 32)
+    ]
+
+
+_VARIANT = {c: "89ab"[int(c, 16) & 3] for c in "0123456789abcdef"}
+
+
+def as_cpm_input(project: Dict, ids: List = None) -> Tuple[List[Dict], List[Dict]]:
+    """Convert a generated project into calculate_cpm's (tasks, dependencies)"""
+    ids = ids or [str(i) for i in range(len(project["durations"]))]
+    tasks = [
+        {"id": ids[i], "duration": d, "buffer_time": b}
+        for i, (d, b) in enumerate(zip(project["durations"], project["buffers"]))
+    ]
+    dependencies = [{"task_id": ids[s], "depends_on_task_id": ids[p]} for p, s in project["edges"]]
+    if "types" in project:
+        for d, kind, lag in zip(dependencies, project["types"], project["lags"]):
+            d["type"], d["lag"] = kind, lag
+    return tasks, dependencies
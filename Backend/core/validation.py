@@ -3,10 +3,33 @@ Validation helpers:  cycle detection, dependency graph analysis
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import text
 from uuid import UUID
 from typing import Set, Dict, List
-from models import TaskDependency
+from core.graph_loader import load_edges
+
+
+# Advisory lock key serializing dependency inserts ("pm_deps" in ASCII).
+# The key is global, not per project: dependencies may cross projects, so a
+# cycle can close through other projects' tasks. With per-project keys, A→B
+# inside project P and C→D inside Q take different locks, and if B→…→C and
+# D→…→A already run through cross-project links, both checks pass and the
+# two inserts commit a cycle. Only a single scope covering every edge a
+# cycle could use makes the check safe.
+DEPENDENCY_GRAPH_LOCK_ID = 0x706D5F64657073
+
+
+def lock_dependency_graph(db: Session) -> None:
+    """
+    Serialize dependency inserts until the current transaction ends.
+
+    Two requests that each pass detect_cycle on their own can still create
+    a cycle together (A→B and B→A). Holding this transaction-scoped
+    advisory lock across the duplicate/cycle check and the insert makes the
+    check see every previously committed edge. Plain reads and task writes
+    are not blocked, unlike a table lock.
+    """
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": DEPENDENCY_GRAPH_LOCK_ID})
 
 
 def detect_cycle(db: Session, new_task_id: UUID, new_depends_on_id: UUID) -> bool:
@@ -31,22 +54,18 @@ def detect_cycle(db: Session, new_task_id: UUID, new_depends_on_id: UUID) -> boo
     print(f"\n🔍 CYCLE DETECTION")
     print(f"   Checking:  {new_depends_on_id} → {new_task_id}")
     
-    # Build current dependency graph
-    stmt = select(TaskDependency)
-    all_deps = db.execute(stmt).scalars().all()
+    # Build current dependency graph (edge columns only, ids as text)
+    all_deps = load_edges(db)
     
     # Create adjacency list:  depends_on_id → [task_ids]
     # Example: if B depends on A, then A → [B]
     graph = {}
-    for dep in all_deps: 
-        depends_on = str(dep.depends_on_task_id)
-        task = str(dep.task_id)
-        
+    for depends_on, task_id in all_deps: 
         if depends_on not in graph:
             graph[depends_on] = []
-        graph[depends_on].append(task)
-        
-        print(f"   Current edge: {depends_on} → {task}")
+        graph[depends_on].append(task_id)
+    
+    print(f"   Current graph: {len(all_deps)} edges")
     
     # Convert UUIDs to strings for comparison
     task_str = str(new_task_id)
@@ -76,7 +95,7 @@ def _dfs_has_path(graph:  Dict[str, List[str]], start: str, target: str, visited
         graph:  Adjacency list where graph[a] = [b, c] means a → b and a → c
         start: Starting node
         target: Target node to reach
-        visited: Set of already visited nodes (for recursion)
+        visited: Set of already visited nodes (shared across calls if given)
         
     Returns: 
         True if path exists, False otherwise
@@ -84,37 +103,32 @@ def _dfs_has_path(graph:  Dict[str, List[str]], start: str, target: str, visited
     if visited is None:
         visited = set()
     
-    # Base case: we reached the target
-    if start == target:
-        return True
-    
-    # Base case: already visited this node (prevent infinite loops)
-    if start in visited:
-        return False
-    
-    visited.add(start)
-    
-    # Recursively check all neighbors
-    for neighbor in graph.get(start, []):
-        if _dfs_has_path(graph, neighbor, target, visited):
+    # Iterative so long dependency chains cannot hit the recursion limit
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        
+        # Reached the target
+        if node == target:
             return True
+        
+        # Already visited this node (prevent infinite loops)
+        if node in visited:
+            continue
+        
+        visited.add(node)
+        stack.extend(graph.get(node, []))
     
     return False
 
 
 def build_dependency_graph(db: Session) -> dict:
     """Build adjacency list of tasks and their dependencies"""
-    stmt = select(TaskDependency)
-    deps = db.execute(stmt).scalars().all()
-
     # adjacency:  depends_on → [tasks that depend]
     graph = {}
     reverse_graph = {}
 
-    for dep in deps:
-        task_id = str(dep.task_id)
-        depends_on_id = str(dep.depends_on_task_id)
-
+    for depends_on_id, task_id in load_edges(db):
         if depends_on_id not in graph:
             graph[depends_on_id] = []
         graph[depends_on_id]. append(task_id)
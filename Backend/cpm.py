@@ -1,10 +1,30 @@
 """
 Critical Path Method (CPM) algorithm implementation
-Computes earliest/latest start/finish times, slack, and critical path
+Computes earliest/latest start/finish times, slack, float metrics, drag,
+and critical path
 """
 
-from typing import Dict, List
-from collections import defaultdict, deque
+import heapq
+from itertools import accumulate
+from operator import add, sub
+from typing import Dict, List, Sequence, Tuple
+
+DEPENDENCY_TYPES = ("FS", "SS", "FF", "SF")
+
+# Which end of the predecessor a dependency starts from, and which end of
+# the successor it constrains: FS = finish -> start, SF = start -> finish
+_FROM_FINISH = {"FS": 1, "SS": 0, "FF": 1, "SF": 0}
+_TO_FINISH = {"FS": 0, "SS": 0, "FF": 1, "SF": 1}
+
+
+def dependency_offset(kind: str, lag: int, pred_duration: int, succ_duration: int) -> int:
+    """
+    Every dependency type reduces to ES[succ] >= ES[pred] + offset:
+        FS: EF[pred] + lag <= ES[succ]     SS: ES[pred] + lag <= ES[succ]
+        FF: EF[pred] + lag <= EF[succ]     SF: ES[pred] + lag <= EF[succ]
+    A negative lag is a lead.
+    """
+    return _FROM_FINISH[kind] * pred_duration + lag - _TO_FINISH[kind] * succ_duration
 
 
 def calculate_cpm(tasks: List[Dict], dependencies: List[Dict]) -> Dict:
@@ -13,7 +33,9 @@ def calculate_cpm(tasks: List[Dict], dependencies: List[Dict]) -> Dict:
 
     Args:
         tasks: List of dicts with keys: id, duration (int), buffer_time (int)
-        dependencies: List of dicts with keys: task_id, depends_on_task_id
+        dependencies: List of dicts with keys: task_id, depends_on_task_id,
+            and optionally type ("FS", "SS", "FF" or "SF"; default "FS")
+            and lag (days, negative for a lead; default 0)
 
     Returns:
         {
@@ -22,93 +44,294 @@ def calculate_cpm(tasks: List[Dict], dependencies: List[Dict]) -> Dict:
             "LS": {task_id: latest_start_day},
             "LF": {task_id:  latest_finish_day},
             "slack": {task_id: slack_days},
+            "free_float": {task_id: days it can slip without delaying any successor},
+            "independent_float": {task_id: days it can slip even if predecessors finish
+                                  late and successors start early},
+            "drag": {task_id: days the project shortens if its duration were zero},
             "project_end": int,
             "critical_path": [task_id, ...]  # tasks with slack == 0
         }
+
+    Raises:
+        ValueError: If the graph contains a cycle or an unknown dependency type
     """
-    if not tasks: 
+    if not tasks:
         return {
             "ES": {},
             "EF": {},
             "LS": {},
             "LF": {},
             "slack": {},
+            "free_float": {},
+            "independent_float": {},
+            "drag": {},
             "project_end": 0,
             "critical_path": [],
         }
 
-    # Build task duration map (duration + buffer)
-    dur = {}
-    task_ids = []
+    # Build task duration map (duration + buffer). Tasks are then numbered
+    # 0..n-1, and every pass below works on lists indexed by that number
+    dur_of = {}
     for t in tasks:
-        tid = str(t["id"])
-        task_ids.append(tid)
-        dur[tid] = int(t. get("duration", 0)) + int(t.get("buffer_time", 0))
+        dur_of[str(t["id"])] = int(t. get("duration", 0)) + int(t.get("buffer_time", 0))
+    ids = list(dur_of)
+    dur = list(dur_of.values())
+    index = dict(zip(ids, range(len(ids))))
+    n = len(ids)
 
-    # Build adjacency lists
-    graph = {tid: [] for tid in task_ids}  # depends_on -> [task]
-    reverse_graph = {tid: [] for tid in task_ids}  # task -> [depends_on]
+    # Build adjacency lists. Every link, whatever its type and lag, is
+    # ES[succ] >= ES[pred] + offset (see dependency_offset), and the offset
+    # is computed once here. Plain finish-to-start links (offset = the
+    # predecessor's duration) and typed or lagged ones then take the same
+    # path through every pass. Only successors are kept: two lists per
+    # task, so the cyclic GC has no more to track than for FS-only graphs.
+    succs = [[] for _ in range(n)]  # depends_on -> [task]
+    succ_offsets = [[] for _ in range(n)]
+    indeg = [0] * n
+    typed = []  # depends_on, task, type, offset of each SS/FF/SF link (flat), for drag
 
     for d in dependencies:
-        task_id = str(d["task_id"])
-        depends_on_id = str(d["depends_on_task_id"])
+        task = index.get(str(d["task_id"]))
+        depends_on = index.get(str(d["depends_on_task_id"]))
 
         # Ignore if references missing tasks
-        if task_id not in graph or depends_on_id not in graph:
+        if task is None or depends_on is None:
             continue
 
-        graph[depends_on_id].append(task_id)
-        reverse_graph[task_id].append(depends_on_id)
-
-    # Topological sort (Kahn's algorithm) + cycle detection
-    indeg = {tid: len(reverse_graph[tid]) for tid in task_ids}
-    q = deque([tid for tid in task_ids if indeg[tid] == 0])
-    topo_order = []
+        kind = d.get("type") or "FS"
+        lag = d.get("lag")
+        if kind == "FS" and not lag:
+            offset = dur[depends_on]
+        else:
+            if kind not in _FROM_FINISH:
+                raise ValueError(f"Unknown dependency type '{kind}'")
+            offset = dependency_offset(kind, int(lag or 0), dur[depends_on], dur[task])
+            if kind != "FS":
+                typed += (depends_on, task, kind, offset)
+        succs[depends_on].append(task)
+        succ_offsets[depends_on].append(offset)
+        indeg[task] += 1
 
-    while q:
-        node = q.popleft()
-        topo_order.append(node)
-        for nbr in graph[node]:
+    # Topological sort (Kahn's algorithm) + cycle detection, with the
+    # forward pass folded in: a task's ES is final once it is reached, so
+    # it is pushed to the successors then (nothing starts before day 0,
+    # even with a lead)
+    ES = [0] * n
+    topo_order = [node for node in range(n) if not indeg[node]]
+    for node in topo_order:  # grows while it is walked, like a queue
+        es = ES[node]
+        for nbr, offset in zip(succs[node], succ_offsets[node]):
+            if es + offset > ES[nbr]:
+                ES[nbr] = es + offset
             indeg[nbr] -= 1
-            if indeg[nbr] == 0:
-                q.append(nbr)
+            if not indeg[nbr]:
+                topo_order.append(nbr)
 
-    if len(topo_order) != len(task_ids):
+    if len(topo_order) != n:
         raise ValueError("Cycle detected in task dependencies")
+    EF = list(map(add, ES, dur))
 
-    # Forward pass: compute ES, EF
-    ES = {}
-    EF = {}
-    for node in topo_order:
-        if not reverse_graph[node]:  # No dependencies
-            ES[node] = 0
-        else:
-            ES[node] = max(EF[pred] for pred in reverse_graph[node])
-        EF[node] = ES[node] + dur. get(node, 0)
-
-    # Project end time
-    project_end = max(EF. values()) if EF else 0
+    # Project end time (with SS/FF links the last task to finish needn't be a sink)
+    project_end = max(EF)
 
     # Backward pass: compute LS, LF
-    LS = {}
-    LF = {}
+    LS = [project_end - d for d in dur]
+    ls_of = LS.__getitem__
     for node in reversed(topo_order):
-        if not graph[node]:    # No successors
-            LF[node] = project_end
-        else:
-            LF[node] = min(LS[succ] for succ in graph[node])
-        LS[node] = LF[node] - dur.get(node, 0)
+        s = succs[node]
+        if s:
+            start = min(map(sub, map(ls_of, s), succ_offsets[node]))
+            if start < LS[node]:
+                LS[node] = start
+    LF = list(map(add, LS, dur))
 
     # Compute slack and critical path
-    slack = {node: LS[node] - ES[node] for node in task_ids}
-    critical_path = [node for node in topo_order if slack. get(node, 0) == 0]
+    slack = list(map(sub, LS, ES))
+    critical_path = [ids[node] for node in topo_order if not slack[node]]
+
+    free_float, independent_float = calculate_floats(dur, succs, succ_offsets, ES, LS, project_end)
+    drag = calculate_drag(topo_order, dur, succs, succ_offsets, typed, ES, EF, LS, slack, project_end)
 
     return {
-        "ES": ES,
-        "EF": EF,
-        "LS": LS,
-        "LF": LF,
-        "slack": slack,
+        "ES": dict(zip(ids, ES)),
+        "EF": dict(zip(ids, EF)),
+        "LS": dict(zip(ids, LS)),
+        "LF": dict(zip(ids, LF)),
+        "slack": dict(zip(ids, slack)),
+        "free_float": dict(zip(ids, free_float)),
+        "independent_float": dict(zip(ids, independent_float)),
+        "drag": dict(zip(ids, drag)),
         "project_end": project_end,
         "critical_path": critical_path,
-    }
\ No newline at end of file
+    }
+
+
+def calculate_floats(
+    dur: List[int],
+    succs: List[List[int]],
+    succ_offsets: List[List[int]],
+    ES: List[int],
+    LS: List[int],
+    project_end: int,
+) -> Tuple[List[int], List[int]]:
+    """
+    Free and independent float from the forward and backward passes.
+
+    free float        = earliest successor ES - EF
+    independent float = max(0, earliest successor ES - latest predecessor LF - duration)
+
+    Tasks without successors measure against project_end, tasks without
+    predecessors against day 0. Other link types and lags use the bound
+    the link puts on the task (ES - offset for a successor, LS + offset
+    for a predecessor) in place of ES/LF.
+    """
+    # Earliest start if every predecessor runs late, pushed along the links
+    late_start = [0] * len(dur)
+    for node, s in enumerate(succs):
+        ls = LS[node]
+        for nbr, offset in zip(s, succ_offsets[node]):
+            if ls + offset > late_start[nbr]:
+                late_start[nbr] = ls + offset
+
+    es_of = ES.__getitem__
+    free_float = [0] * len(dur)
+    independent_float = [0] * len(dur)
+    for node, s in enumerate(succs):
+        # Latest start that delays no successor
+        next_start = project_end - dur[node]
+        if s:
+            start = min(map(sub, map(es_of, s), succ_offsets[node]))
+            if start < next_start:
+                next_start = start
+        ff = next_start - ES[node]
+        free_float[node] = ff
+        if ff > 0:  # independent float is never above free float
+            independent_float[node] = max(0, next_start - late_start[node])
+    return free_float, independent_float
+
+
+def calculate_drag(
+    topo_order: List[int],
+    dur: List[int],
+    succs: List[List[int]],
+    succ_offsets: List[List[int]],
+    typed: list,
+    ES: List[int],
+    EF: List[int],
+    LS: List[int],
+    slack: List[int],
+    project_end: int,
+) -> List[int]:
+    """
+    Critical path drag: how much project_end drops if a task's duration
+    were zero. Zero for tasks with slack.
+
+    drag(v) = min(duration(v), project_end - longest path avoiding v).
+    In topological order every path avoiding v lies entirely before v,
+    entirely after v, or has an edge (u, w) jumping over v's position, so
+    the longest such path is the best of:
+        EF[u] for u before v                  (paths ending before v)
+        project_end - LS[w] for w after v     (paths starting after v)
+        ES[u] + offset + project_end - LS[w]  (u -> w with u before, w after v)
+    The first two are prefix/suffix maxima; the jumping edges are swept
+    with a heap keyed on length, dropping edges once the sweep passes w.
+    One pass over tasks and edges instead of a CPM rerun per task.
+
+    SS, FF and SF links don't pass through a task's duration, and a path
+    into its finish and out of its start gets longer as it shrinks. Tasks
+    with such links compare against the longest path through them at zero
+    duration instead, so their drag can be below the duration, or negative
+    (shortening the task would delay the project).
+    """
+    drag = [0] * len(dur)
+    critical = [i for i, node in enumerate(topo_order) if not slack[node] and dur[node] > 0]
+    if not critical:
+        return drag
+
+    # A path shorter than project_end by the longest critical duration or
+    # more can't limit any drag. Through edge u -> w that gap is
+    # LS[w] - ES[u] - offset >= slack[u], so only near-critical tails need a look.
+    longest = max(dur[topo_order[i]] for i in critical)
+    position = [0] * len(dur)
+    for i, node in enumerate(topo_order):
+        position[node] = i
+    jumps = []
+    for u in topo_order:
+        if slack[u] >= longest:
+            continue
+        pu = position[u]
+        limit = ES[u] + longest
+        for w, offset in zip(succs[u], succ_offsets[u]):
+            if LS[w] - offset < limit:
+                pw = position[w]
+                if pw > pu + 1:
+                    jumps.append((pu, pw, ES[u] + offset + project_end - LS[w]))
+    jumps.sort()
+
+    # before[i]: longest path ending among topo_order[:i + 1]
+    before = list(accumulate(map(EF.__getitem__, topo_order), max))
+    # after[i]: longest path starting among topo_order[i:]
+    after = list(accumulate((project_end - LS[w] for w in reversed(topo_order)), max))[::-1]
+
+    # Critical tasks with SS/FF/SF links get an entry in one of these (maybe
+    # empty), listing the links into their finish or out of their start
+    on_critical = {topo_order[i] for i in critical}
+    into_finish: Dict[int, List[Tuple[int, int]]] = {}
+    out_of_start: Dict[int, List[Tuple[int, int]]] = {}
+    for u, w, kind, offset in zip(typed[::4], typed[1::4], typed[2::4], typed[3::4]):
+        if w in on_critical:
+            links = into_finish.setdefault(w, [])
+            if _TO_FINISH[kind]:
+                links.append((u, offset))
+        if u in on_critical:
+            links = out_of_start.setdefault(u, [])
+            if not _FROM_FINISH[kind]:
+                links.append((w, offset))
+
+    n = len(topo_order)
+    heap: List[Tuple[int, int]] = []  # (-length, head position)
+    j = 0
+    for i in critical:
+        while j < len(jumps) and jumps[j][0] < i:
+            heapq.heappush(heap, (-jumps[j][2], jumps[j][1]))
+            j += 1
+        while heap and heap[0][1] <= i:
+            heapq.heappop(heap)
+        longest_without = max(
+            before[i - 1] if i else 0,
+            after[i + 1] if i + 1 < n else 0,
+            -heap[0][0] if heap else 0,
+        )
+        node = topo_order[i]
+        if node in into_finish or node in out_of_start:
+            through = _zero_duration_path(
+                node, dur[node], into_finish.get(node, ()), out_of_start.get(node, ()),
+                ES, LS, project_end,
+            )
+            drag[node] = project_end - max(longest_without, through)
+        else:
+            drag[node] = min(dur[node], project_end - longest_without)
+    return drag
+
+
+def _zero_duration_path(
+    node: int,
+    duration: int,
+    into_finish: Sequence[Tuple[int, int]],
+    out_of_start: Sequence[Tuple[int, int]],
+    ES: List[int],
+    LS: List[int],
+    project_end: int,
+) -> int:
+    """Longest path through node if its duration were zero"""
+    # node starts as before, unless a link into its finish held it back
+    # (that link's offset has -duration in it)
+    arrive = ES[node]
+    for u, offset in into_finish:
+        arrive = max(arrive, ES[u] + offset + duration)
+    # node itself (now finishing as it starts), or on through a successor;
+    # links out of its finish lose the duration, links out of its start don't
+    leave = project_end - LS[node] - duration
+    for w, offset in out_of_start:
+        leave = max(leave, offset + project_end - LS[w])
+    return arrive + leave
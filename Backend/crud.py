@@ -3,14 +3,66 @@ CRUD operations for Tasks and TaskDependencies
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, exists, func, text, union_all, cast, Date, TIMESTAMP
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import date, timedelta
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple
 from fastapi import HTTPException
 
-from models import Task, TaskDependency
-from schemas import TaskCreate, TaskUpdate, DependencyCreate
-from core.validation import detect_cycle
+from models import Baseline, BaselineTaskSet, Project, Task, TaskDependency, TaskStatusEnum
+from schemas import BaselineCreate, ProjectCreate, TaskCreate, TaskUpdate, TaskFilter, DependencyCreate, TimelineZoom
+from core.validation import detect_cycle, lock_dependency_graph
+from core.cache import notify_graph_changed
+
+
+# Task fields that feed the CPM calculation; other edits leave cached results valid
+SCHEDULE_FIELDS = {"duration", "buffer_time", "parent_id", "project_id"}
+
+
+# ==================== PROJECTS ====================
+
+def get_project(db: Session, project_id: UUID) -> Optional[Project]:
+    """Get a single project by ID"""
+    return db.execute(select(Project).where(Project.id == project_id)).scalars().first()
+
+
+def list_projects(db: Session) -> List[Project]:
+    """All projects, oldest first"""
+    return db.execute(select(Project).order_by(Project.created_at, Project.id)).scalars().all()
+
+
+def create_project(db: Session, project_in: ProjectCreate) -> Project:
+    """Create a new project"""
+    project = Project(name=project_in.name, description=project_in.description)
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    return project
+
+
+def delete_project(db: Session, project_id: UUID) -> None:
+    """Delete a project and (by cascade) its tasks"""
+    projects_table = Project.__table__
+    stmt = delete(projects_table).where(projects_table.c.id == project_id).returning(projects_table.c.id)
+    if db.execute(stmt).first() is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    _drop_unused_task_sets(db)  # its baselines went with it
+    notify_graph_changed(db)
+    db.commit()
+
+
+def project_task_ids(db: Session, project_id: UUID) -> List[str]:
+    """Ids of the tasks in a project"""
+    return [str(tid) for tid in db.execute(select(Task.id).where(Task.project_id == project_id)).scalars()]
+
+
+def _check_project(db: Session, project_id: UUID) -> None:
+    if get_project(db, project_id) is None:
+        db.rollback()  # release the graph lock, if held
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
 
 # ==================== TASKS ====================
@@ -21,14 +73,324 @@ def get_task(db: Session, task_id: UUID) -> Optional[Task]:
     return db.execute(stmt).scalars().first()
 
 
-def list_tasks(db: Session, limit: int = 100, skip: int = 0) -> List[Task]:
-    """List all tasks with pagination"""
-    stmt = select(Task).offset(skip).limit(limit)
+# ?order= values for list_tasks, backed by the materialized schedule columns
+TASK_ORDER_FIELDS = {
+    "ES": Task.early_start,
+    "EF": Task.early_finish,
+    "LS": Task.late_start,
+    "LF": Task.late_finish,
+    "slack": Task.slack,
+    "name": Task.name,
+}
+
+
+def _filter_tasks(stmt, filters: Optional[TaskFilter]):
+    """Apply TaskFilter conditions to a select over tasks"""
+    if filters is None:
+        return stmt
+    if filters.project_id is not None:
+        stmt = stmt.where(Task.project_id == filters.project_id)
+    if filters.status:
+        stmt = stmt.where(Task.status.in_([s.value for s in filters.status]))
+    if filters.start_from is not None:
+        stmt = stmt.where(Task.start_date >= filters.start_from)
+    if filters.start_to is not None:
+        stmt = stmt.where(Task.start_date <= filters.start_to)
+    if filters.target_from is not None:
+        stmt = stmt.where(Task.target_completion_date >= filters.target_from)
+    if filters.target_to is not None:
+        stmt = stmt.where(Task.target_completion_date <= filters.target_to)
+    if filters.duration_min is not None:
+        stmt = stmt.where(Task.duration >= filters.duration_min)
+    if filters.duration_max is not None:
+        stmt = stmt.where(Task.duration <= filters.duration_max)
+    if filters.critical is not None:
+        stmt = stmt.where(Task.is_critical.is_(filters.critical))
+    if filters.slack_lt is not None:
+        stmt = stmt.where(Task.slack < filters.slack_lt)
+    return stmt
+
+
+def list_tasks(
+    db: Session,
+    limit: int = 100,
+    skip: int = 0,
+    filters: Optional[TaskFilter] = None,
+    order: Optional[str] = None,
+) -> List[Task]:
+    """
+    List tasks with pagination.
+    Optionally filter (see TaskFilter) and sort by a TASK_ORDER_FIELDS key
+    ("-" prefix for descending). Tasks not yet scheduled sort last.
+    """
+    stmt = _filter_tasks(select(Task), filters)
+    if order:
+        column = TASK_ORDER_FIELDS[order.lstrip("-")]
+        direction = column.desc() if order.startswith("-") else column.asc()
+        # id breaks ties so pages don't overlap
+        stmt = stmt.order_by(direction.nulls_last(), Task.id)
+    stmt = stmt.offset(skip).limit(limit)
     return db.execute(stmt).scalars().all()
 
 
+def count_tasks_by_status(db: Session, filters: Optional[TaskFilter] = None) -> Dict[str, int]:
+    """Task count per status (board columns) in one GROUP BY, plus the total"""
+    stmt = _filter_tasks(select(Task.status, func.count()), filters).group_by(Task.status)
+    counts = {status.value: 0 for status in TaskStatusEnum}
+    for status, count in db.execute(stmt):
+        counts[status.value] = count
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+# ==================== SEARCH ====================
+
+# Matches ranked per query. Ranking reads every candidate's tsvector, so a
+# word found in most tasks would otherwise rank the whole table
+SEARCH_CANDIDATES = 2000
+SEARCH_HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5, StartSel=<b>, StopSel=</b>"
+
+_trigram_available: Optional[bool] = None
+
+
+def _has_trigram(db: Session) -> bool:
+    """Whether pg_trgm is installed (migration 005); checked once per process"""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first() is not None
+        if not _trigram_available:
+            print("⚠️  pg_trgm not installed - fuzzy task search disabled")
+    return _trigram_available
+
+
+def search_tasks(db: Session, query: str, limit: int = 20) -> List[Dict]:
+    """
+    Full-text search over task names and descriptions.
+
+    Ranked with ts_rank_cd (name matches weigh more); snippets are built
+    only for the returned rows. If that finds fewer than limit tasks, fills
+    up with fuzzy name matches (pg_trgm), which tolerate typos.
+
+    Top-N limitation: the GIN index can find matches but not order them by
+    rank, and ranking every match of a common word costs ~1s on 1M tasks.
+    So only the first SEARCH_CANDIDATES matches the index returns (in table
+    order, not by rank) are ranked. Queries with fewer matches are ranked
+    exactly; for more, the hits are the best of that sample and a better
+    match further down the table can be missed (tests/test_search.py).
+
+    Returns: [{"task": Task, "rank": float, "headline": str | None, "match": "fulltext" | "fuzzy"}]
+    """
+    tsquery = func.websearch_to_tsquery("english", query)
+    candidates = (
+        select(Task.id, Task.search_vector)
+        .where(Task.search_vector.op("@@")(tsquery))
+        .limit(SEARCH_CANDIDATES)
+        .subquery()
+    )
+    rank = func.ts_rank_cd(candidates.c.search_vector, tsquery)
+    top = (
+        select(candidates.c.id, rank.label("rank"))
+        .order_by(rank.desc())
+        .limit(limit)
+        .subquery()
+    )
+    headline = func.ts_headline(
+        "english", func.coalesce(Task.description, Task.name), tsquery, SEARCH_HEADLINE_OPTIONS
+    )
+    stmt = (
+        select(Task, top.c.rank, headline)
+        .join(top, top.c.id == Task.id)
+        .order_by(top.c.rank.desc(), Task.id)
+    )
+    hits = [
+        {"task": task, "rank": task_rank, "headline": snippet, "match": "fulltext"}
+        for task, task_rank, snippet in db.execute(stmt)
+    ]
+
+    if len(hits) < limit and _has_trigram(db):
+        # "%" uses the GiST trigram index; "<->" (distance) orders by it
+        stmt = (
+            select(Task, func.similarity(Task.name, query))
+            .where(Task.name.op("%")(query))
+            .order_by(Task.name.op("<->")(query))
+            .limit(limit)
+        )
+        found = {hit["task"].id for hit in hits}
+        for task, similarity in db.execute(stmt):
+            if len(hits) == limit:
+                break
+            if task.id not in found:
+                hits.append({"task": task, "rank": similarity, "headline": None, "match": "fuzzy"})
+    return hits
+
+
+def _is_summary(db: Session, task_id: UUID) -> bool:
+    """Whether any task is nested under task_id"""
+    return db.execute(select(exists().where(Task.parent_id == task_id))).scalar()
+
+
+def _has_dependencies(db: Session, task_id: UUID) -> bool:
+    return db.execute(select(exists().where(
+        (TaskDependency.task_id == task_id) | (TaskDependency.depends_on_task_id == task_id)
+    ))).scalar()
+
+
+def _check_parent(db: Session, parent_id: UUID, task_id: Optional[UUID] = None) -> None:
+    """
+    Validate nesting a task under parent_id. Takes the dependency graph lock
+    (held until commit/rollback) so a dependency can't be added to the
+    parent while it becomes a summary.
+    """
+    lock_dependency_graph(db)
+
+    if get_task(db, parent_id) is None:
+        db.rollback()  # release the graph lock
+        raise HTTPException(status_code=404, detail=f"Parent task {parent_id} not found")
+
+    if task_id is not None:
+        # Walk up from the new parent: meeting the task itself means a loop
+        ancestors = text("""
+            WITH RECURSIVE up AS (
+                SELECT id, parent_id FROM tasks WHERE id = :parent_id
+                UNION
+                SELECT t.id, t.parent_id FROM tasks t JOIN up ON t.id = up.parent_id
+            )
+            SELECT 1 FROM up WHERE id = :task_id
+        """)
+        if db.execute(ancestors, {"parent_id": parent_id, "task_id": task_id}).first():
+            db.rollback()
+            raise HTTPException(status_code=400, detail="A task can't be nested under itself or one of its subtasks")
+
+    if _has_dependencies(db, parent_id):
+        db.rollback()
+        raise HTTPException(
+            status_code=400, detail="Parent task has dependencies; summary tasks can't be linked directly"
+        )
+
+
+# ==================== TIMELINE ====================
+
+# Upper bound on columns per request: a window this wide at this zoom is
+# wider than any screen
+TIMELINE_MAX_BUCKETS = 1000
+
+
+def _next_bucket(day: date, zoom: TimelineZoom) -> date:
+    if zoom == TimelineZoom.day:
+        return day + timedelta(days=1)
+    if zoom == TimelineZoom.week:
+        return day + timedelta(days=7)
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _bucket_starts(start: date, end: date, zoom: TimelineZoom) -> List[date]:
+    """First day of every bucket overlapping [start, end], same truncation as date_trunc"""
+    if zoom == TimelineZoom.week:
+        current = start - timedelta(days=start.weekday())
+    elif zoom == TimelineZoom.month:
+        current = start.replace(day=1)
+    else:
+        current = start
+    starts = []
+    while current <= end:
+        if len(starts) == TIMELINE_MAX_BUCKETS:
+            raise HTTPException(
+                status_code=400, detail=f"Window too wide for zoom={zoom.value}; use a coarser zoom"
+            )
+        starts.append(current)
+        current = _next_bucket(current, zoom)
+    return starts
+
+
+def timeline(
+    db: Session,
+    start: date,
+    end: date,
+    zoom: TimelineZoom,
+    per_bucket: int = 20,
+    project_id: Optional[UUID] = None,
+) -> Dict:
+    """
+    Gantt data for the tasks whose bars overlap [start, end].
+
+    Bars are grouped into zoom-sized buckets by their first visible day.
+    A bucket with at most per_bucket bars lists them; a denser one is
+    summarized (counts by status, critical bars, bars in progress), so the
+    payload grows with the number of columns on screen, not the project.
+    All three queries use the GiST index on timeline_span (migration 009).
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end is before start")
+    starts = _bucket_starts(start, end, zoom)
+
+    span = Task.timeline_span
+    first_day = func.greatest(func.lower(span), start)
+    last_day = func.upper(span) - 1  # daterange upper bounds are exclusive
+    bucket = cast(func.date_trunc(zoom.value, cast(first_day, TIMESTAMP)), Date)
+    end_bucket = cast(func.date_trunc(zoom.value, cast(last_day, TIMESTAMP)), Date)
+
+    def visible(stmt):
+        stmt = stmt.where(span.op("&&")(func.daterange(start, end, "[]")))
+        if project_id is not None:
+            stmt = stmt.where(Task.project_id == project_id)
+        return stmt
+
+    buckets = {
+        b: {"start": b, "end": _next_bucket(b, zoom) - timedelta(days=1), "starting": 0, "active": 0,
+            "by_status": {}, "critical": 0, "summarized": False, "bars": []}
+        for b in starts
+    }
+
+    stmt = visible(
+        select(bucket, Task.status, func.count(), func.count().filter(Task.is_critical.is_(True)))
+    ).group_by(bucket, Task.status)
+    for b, status, count, critical in db.execute(stmt):
+        row = buckets[b]
+        row["starting"] += count
+        row["by_status"][status.value] = count
+        row["critical"] += critical
+
+    # Bars in progress: started in or before a bucket and not finished before it
+    finished = dict(db.execute(
+        visible(select(end_bucket, func.count())).where(last_day < end).group_by(end_bucket)
+    ).all())
+    started = ended = 0
+    for b in starts:
+        started += buckets[b]["starting"]
+        buckets[b]["active"] = started - ended
+        ended += finished.get(b, 0)
+
+    for row in buckets.values():
+        row["summarized"] = row["starting"] > per_bucket
+    sparse = [b for b in starts if 0 < buckets[b]["starting"] <= per_bucket]
+    if sparse:
+        stmt = visible(select(
+            Task.id, Task.name, Task.status, func.lower(span), last_day,
+            Task.is_critical, Task.slack, Task.parent_id, bucket,
+        )).where(bucket.in_(sparse)).order_by(bucket, func.lower(span), Task.id)
+        for tid, name, status, bar_start, bar_end, critical, slack, parent_id, b in db.execute(stmt):
+            buckets[b]["bars"].append({
+                "id": tid, "name": name, "status": status.value, "start_date": bar_start,
+                "end_date": bar_end, "is_critical": critical, "slack": slack, "parent_id": parent_id,
+            })
+
+    return {
+        "start": start,
+        "end": end,
+        "zoom": zoom,
+        "total": sum(row["starting"] for row in buckets.values()),
+        "buckets": [buckets[b] for b in starts],
+    }
+
+
 def create_task(db: Session, task_in: TaskCreate) -> Task:
-    """Create a new task"""
+    """Create a new task, optionally nested under a summary task (parent_id)"""
+    if task_in.project_id is not None:
+        _check_project(db, task_in.project_id)
+    if task_in.parent_id is not None:
+        _check_parent(db, task_in.parent_id)
     task = Task(
         name=task_in.name,
         duration=task_in.duration,
@@ -37,39 +399,72 @@ def create_task(db: Session, task_in: TaskCreate) -> Task:
         buffer_time=task_in.buffer_time,
         start_date=task_in.start_date,
         target_completion_date=task_in.target_completion_date,
+        parent_id=task_in.parent_id,
+        project_id=task_in.project_id,
     )
     db.add(task)
+    notify_graph_changed(db)
     db.commit()
     db.refresh(task)
     return task
 
 
 def update_task(db: Session, task_id: UUID, task_in: TaskUpdate) -> Task:
-    """Update an existing task"""
-    task = get_task(db, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
+    """
+    Update an existing task.
+    Single UPDATE ... RETURNING round trip: no SELECT before, no refresh after.
+    """
     update_data = task_in.dict(exclude_unset=True)
-    for field, value in update_data. items():
-        setattr(task, field, value)
+    if not update_data:
+        task = get_task(db, task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return task
+
+    if update_data.get("project_id") is not None:
+        _check_project(db, update_data["project_id"])
+    if update_data.get("parent_id") is not None:
+        _check_parent(db, update_data["parent_id"], task_id)
+
+    tasks_table = Task.__table__
+    stmt = (
+        update(tasks_table)
+        .where(tasks_table.c.id == task_id)
+        .values(**update_data)
+        .returning(*_TASK_ROW_COLUMNS)
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Task not found")
 
-    db.add(task)
+    if SCHEDULE_FIELDS & update_data.keys():
+        notify_graph_changed(db)
     db.commit()
-    db.refresh(task)
-    return task
+    return _task_from_row(row)
 
 
 def delete_task(db: Session, task_id: UUID) -> None:
-    """Delete a task"""
-    task = get_task(db, task_id)
-    if not task:
+    """Delete a task with a single DELETE ... RETURNING"""
+    tasks_table = Task.__table__
+    stmt = delete(tasks_table).where(tasks_table.c.id == task_id).returning(tasks_table.c.id)
+    if db.execute(stmt).first() is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.delete(task)
+    notify_graph_changed(db)
     db.commit()
 
 
+# Everything but the generated columns (search document, timeline span)
+_TASK_ROW_COLUMNS = [c for c in Task.__table__.c if c.computed is None]
+
+
+def _task_from_row(row) -> Task:
+    """Detached Task built from a RETURNING row (not added to the session)"""
+    return Task(**row._mapping)
+
+
 # ==================== TASK DEPENDENCIES ====================
 
 def get_dependency(db: Session, dep_id: UUID) -> Optional[TaskDependency]:
@@ -100,6 +495,7 @@ def create_dependency(
     print(f"🔗 CREATE DEPENDENCY REQUEST")
     print(f"   task_id (depends): {task_id}")
     print(f"   depends_on_task_id (prerequisite): {depends_on_task_id}")
+    print(f"   type: {dep_in.type.value}, lag: {dep_in.lag}")
     print(f"{'='*70}")
 
     # Validate both tasks exist
@@ -121,6 +517,10 @@ def create_dependency(
 
     print(f"   ✅ Not a self-dependency")
 
+    # Serialize concurrent inserts from here until commit/rollback, so the
+    # duplicate and cycle checks below see every committed edge
+    lock_dependency_graph(db)
+
     # Check for existing dependency
     stmt = select(TaskDependency).where(
         (TaskDependency.task_id == task_id)
@@ -129,16 +529,24 @@ def create_dependency(
     existing = db.execute(stmt).scalars().first()
     if existing:
         print(f"   ❌ REJECTED: Dependency already exists")
+        db.rollback()  # release the graph lock
         raise HTTPException(status_code=400, detail="Dependency already exists")
 
     print(f"   ✅ Dependency doesn't already exist")
 
+    # Summary tasks are scheduled from their subtasks, never linked directly
+    if _is_summary(db, task_id) or _is_summary(db, depends_on_task_id):
+        print(f"   ❌ REJECTED: Summary task")
+        db.rollback()  # release the graph lock
+        raise HTTPException(status_code=400, detail="Dependencies can't link summary tasks; link their subtasks")
+
     # Detect cycle
     print(f"\n   🔍 Checking for cycles...")
     if detect_cycle(db, task_id, depends_on_task_id):
         print(f"\n{'='*70}")
         print(f"   ❌ REJECTED: Cycle would be created!")
         print(f"{'='*70}\n")
+        db.rollback()  # release the graph lock
         raise HTTPException(status_code=400, detail="Dependency would create a cycle")
 
     # Create dependency
@@ -146,9 +554,12 @@ def create_dependency(
     dep = TaskDependency(
         task_id=task_id,
         depends_on_task_id=depends_on_task_id,
+        type=dep_in.type,
+        lag=dep_in.lag,
     )
     db.add(dep)
-    db.commit()
+    notify_graph_changed(db)
+    db.commit()  # releases the graph lock
     db.refresh(dep)
     
     print(f"\n{'='*70}")
@@ -160,10 +571,118 @@ def create_dependency(
 
 
 def delete_dependency(db: Session, dep_id: UUID) -> None:
-    """Delete a dependency"""
-    dep = get_dependency(db, dep_id)
-    if not dep:
+    """Delete a dependency with a single DELETE ... RETURNING"""
+    deps_table = TaskDependency.__table__
+    stmt = delete(deps_table).where(deps_table.c.id == dep_id).returning(deps_table.c.id)
+    if db.execute(stmt).first() is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Dependency not found")
 
-    db.delete(dep)
-    db.commit()
\ No newline at end of file
+    notify_graph_changed(db)
+    db.commit()
+
+
+# ==================== CPM GRAPH ====================
+
+def project_dates(db: Session) -> Tuple[Optional[date], Optional[date]]:
+    """(earliest start_date, latest target_completion_date) over all tasks"""
+    return tuple(db.execute(
+        select(func.min(Task.start_date), func.max(Task.target_completion_date))
+    ).one())
+
+
+def load_task_tree(db: Session) -> Dict[str, Tuple[Optional[str], Optional[date], Optional[date]]]:
+    """
+    {task_id: (parent_id, start_date, target_completion_date)} for every
+    task in a hierarchy (nested tasks and the top-level summaries above
+    them); standalone tasks are left out.
+    """
+    columns = (Task.id, Task.parent_id, Task.start_date, Task.target_completion_date)
+    nested = select(*columns).where(Task.parent_id.isnot(None))
+    parents = select(Task.parent_id).where(Task.parent_id.isnot(None))
+    roots = select(*columns).where(Task.parent_id.is_(None), Task.id.in_(parents))
+    return {
+        str(tid): (str(parent_id) if parent_id else None, start, target)
+        for tid, parent_id, start, target in db.execute(union_all(nested, roots))
+    }
+
+
+def task_names(db: Session, task_ids: List[str]) -> Dict[str, str]:
+    """{task_id: name} for the given ids"""
+    stmt = select(Task.id, Task.name).where(Task.id.in_(task_ids))
+    return {str(tid): name for tid, name in db.execute(stmt)}
+
+
+def task_durations(db: Session, project_id: Optional[UUID] = None) -> Dict[str, int]:
+    """{task_id: duration} for all tasks, or one project's"""
+    stmt = select(Task.id, Task.duration)
+    if project_id is not None:
+        stmt = stmt.where(Task.project_id == project_id)
+    return {str(tid): duration or 0 for tid, duration in db.execute(stmt)}
+
+
+# ==================== BASELINES ====================
+
+def create_baseline(db: Session, baseline_in: BaselineCreate, digest: bytes, ids: bytes, data: bytes,
+                    task_count: int, project_end: int, critical_count: int) -> Baseline:
+    """Store an encoded snapshot (see core/baselines.py); the task set row is shared"""
+    if baseline_in.project_id is not None:
+        _check_project(db, baseline_in.project_id)
+    db.execute(
+        pg_insert(BaselineTaskSet.__table__)
+        .values(digest=digest, task_count=task_count, ids=ids)
+        .on_conflict_do_nothing(index_elements=["digest"])
+    )
+    baseline = Baseline(
+        name=baseline_in.name,
+        project_id=baseline_in.project_id,
+        task_set=digest,
+        task_count=task_count,
+        project_end=project_end,
+        critical_count=critical_count,
+        size_bytes=len(data),
+        data=data,
+    )
+    db.add(baseline)
+    db.commit()
+    db.refresh(baseline)
+    return baseline
+
+
+def get_baseline(db: Session, baseline_id: UUID) -> Optional[Baseline]:
+    """Get a baseline's metadata (the snapshot column stays deferred)"""
+    return db.execute(select(Baseline).where(Baseline.id == baseline_id)).scalars().first()
+
+
+def list_baselines(db: Session, project_id: Optional[UUID] = None) -> List[Baseline]:
+    """Baselines, newest first; optionally one project's"""
+    stmt = select(Baseline).order_by(Baseline.created_at.desc())
+    if project_id is not None:
+        stmt = stmt.where(Baseline.project_id == project_id)
+    return db.execute(stmt).scalars().all()
+
+
+def load_baseline_snapshot(db: Session, baseline_id: UUID) -> Optional[Tuple[bytes, bytes]]:
+    """(packed task ids, encoded columns) of a baseline"""
+    stmt = (
+        select(BaselineTaskSet.ids, Baseline.data)
+        .join(BaselineTaskSet, BaselineTaskSet.digest == Baseline.task_set)
+        .where(Baseline.id == baseline_id)
+    )
+    row = db.execute(stmt).first()
+    return (bytes(row[0]), bytes(row[1])) if row else None
+
+
+def delete_baseline(db: Session, baseline_id: UUID) -> None:
+    """Delete a baseline, and its task set once no baseline uses it"""
+    stmt = delete(Baseline.__table__).where(Baseline.id == baseline_id).returning(Baseline.id)
+    if db.execute(stmt).first() is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Baseline not found")
+    _drop_unused_task_sets(db)
+    db.commit()
+
+
+def _drop_unused_task_sets(db: Session) -> None:
+    used = select(Baseline.task_set).where(Baseline.task_set == BaselineTaskSet.digest)
+    db.execute(delete(BaselineTaskSet.__table__).where(~exists(used)))
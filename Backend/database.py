@@ -1,11 +1,16 @@
 """
 Database connection and session management
-SQLAlchemy setup for PostgreSQL
+SQLAlchemy setup for PostgreSQL, with an optional read replica
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy. orm import sessionmaker, scoped_session
-from config import DATABASE_URL
+import re
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy. orm import Session, sessionmaker, scoped_session
+from config import DATABASE_URL, REPLICA_DATABASE_URL, REPLICA_READ_YOUR_WRITES_SECONDS
 
 # Create engine
 engine = create_engine(
@@ -25,14 +30,92 @@ SessionLocal = scoped_session(
     )
 )
 
+# Streaming replica for read-only endpoints; None when not configured
+replica_engine = create_engine(
+    REPLICA_DATABASE_URL,
+    echo=False,
+    future=True,
+    pool_pre_ping=True,
+) if REPLICA_DATABASE_URL else None
+
+ReplicaSession = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=replica_engine,
+    expire_on_commit=False,
+) if replica_engine is not None else None
+
+# Where a write's WAL position goes back to the client, and comes back in on reads
+LSN_HEADER = "X-DB-LSN"
+LSN_COOKIE = "db_lsn"
+_LSN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
 
-def get_db():
+def _stamp_lsn(response: Response) -> None:
+    # Runs after the commit, so the current WAL position covers it
+    with engine.connect() as conn:
+        lsn = conn.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+    response.headers[LSN_HEADER] = lsn
+    response.set_cookie(
+        LSN_COOKIE, lsn, max_age=REPLICA_READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax"
+    )
+
+
+def get_db(response: Response):
     """
-    Dependency for FastAPI to get DB session
+    Dependency for FastAPI to get DB session (primary)
     Usage: db:  Session = Depends(get_db)
+
+    With a replica configured, every commit hands the client the primary's
+    WAL position (X-DB-LSN header and db_lsn cookie), so its next reads can
+    tell whether the replica has seen the write yet.
+    """
+    # A fresh session per request, not the thread-scoped one: FastAPI runs
+    # dependencies and endpoints on arbitrary threadpool threads, so a
+    # thread-local session ends up shared by concurrent requests
+    db = SessionLocal.session_factory()
+    if replica_engine is not None:
+        event.listen(db, "after_commit", lambda session: _stamp_lsn(response))
+    try:
+        yield db
+    finally:
+        db. close()
+
+
+def _replica_session(lsn: Optional[str]) -> Optional[Session]:
+    """A replica session, or None if the replica is down or hasn't replayed up to lsn"""
+    db = ReplicaSession()
+    try:
+        if lsn and _LSN.match(lsn):
+            caught_up = db.execute(
+                text("SELECT coalesce(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), false)"),
+                {"lsn": lsn},
+            ).scalar()
+            if not caught_up:
+                db.close()
+                return None
+        else:
+            db.connection()  # fail here rather than mid-request if the replica is down
+        return db
+    except DBAPIError as e:
+        print(f"⚠️  Replica unavailable, reading from primary: {str(e).splitlines()[0]}")
+        db.close()
+        return None
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only endpoints: a replica session when one is
+    configured and has caught up with the client's last write, otherwise
+    the primary.
+    Usage: db:  Session = Depends(get_read_db)
     """
-    db = SessionLocal()
+    db = None
+    if replica_engine is not None:
+        db = _replica_session(request.headers.get(LSN_HEADER) or request.cookies.get(LSN_COOKIE))
+    if db is None:
+        db = SessionLocal.session_factory()
     try:
         yield db
     finally:
-        db. close()
\ No newline at end of file
+        db. close()
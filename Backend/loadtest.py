@@ -0,0 +1,351 @@
+"""
+End-to-end load test for the Backend API.
+Drives a running (or spawned) uvicorn instance with a weighted mix of
+board/timeline traffic, or replays a recorded request log, and reports
+throughput and latency percentiles per route at each concurrency level.
+
+Run from Backend/ directory against a local Postgres (PATCHed tasks are
+restored and created dependencies removed afterwards):
+    python loadtest.py --spawn --users 1,4,16,64 --duration 20
+    python loadtest.py --base-url http://localhost:8000 --mix list_tasks=70,cpm=20,patch_task=8,create_dependency=2
+    python loadtest.py --spawn --replay requests.jsonl --users 8
+Replay files are JSON lines {"method": "GET", "path": "/api/cpm", "body": {...}}
+or uvicorn access-log lines ('"GET /api/cpm HTTP/1.1" 200'); bodies missing
+from access logs are synthesized like the mix does.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_MIX = "list_tasks=60,cpm=25,patch_task=12,create_dependency=3"
+UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+ACCESS_LOG_RE = re.compile(r'"(GET|POST|PATCH|PUT|DELETE) (\S+) HTTP/[\d.]+"')
+
+
+class LoadContext:
+    """Task ids and bookkeeping shared by all simulated users"""
+
+    def __init__(self, tasks: List[Dict]):
+        self.tasks = tasks
+        self.task_ids = [t["id"] for t in tasks]
+        self.original = {t["id"]: {"start_date": t["start_date"], "duration": t["duration"]} for t in tasks}
+        self.patched = set()
+        self.created_dependencies = []
+        self.lock = threading.Lock()
+
+
+# Each scenario returns (method, path, body)
+def _list_tasks(ctx: LoadContext, rng: random.Random):
+    return "GET", "/api/tasks/", None
+
+
+def _cpm(ctx: LoadContext, rng: random.Random):
+    return "GET", "/api/cpm", None
+
+
+def _patch_task(ctx: LoadContext, rng: random.Random):
+    task_id = rng.choice(ctx.task_ids)
+    with ctx.lock:
+        ctx.patched.add(task_id)
+    if rng.random() < 0.8:
+        # Timeline drag: move the bar
+        body = {"start_date": (date.today() + timedelta(days=rng.randint(0, 120))).isoformat()}
+    else:
+        # Timeline resize: change the duration
+        body = {"duration": rng.randint(1, 30)}
+    return "PATCH", f"/api/tasks/{task_id}", body
+
+
+def _create_dependency(ctx: LoadContext, rng: random.Random):
+    task_id, depends_on = rng.sample(ctx.task_ids, 2)
+    return "POST", "/api/dependencies/", {"task_id": task_id, "depends_on_task_id": depends_on}
+
+
+SCENARIOS = {
+    "list_tasks": _list_tasks,
+    "cpm": _cpm,
+    "patch_task": _patch_task,
+    "create_dependency": _create_dependency,
+}
+
+
+def route_label(method: str, path: str) -> str:
+    """Group concrete paths by route: /api/tasks/<uuid> → /api/tasks/{id}"""
+    return f"{method} {UUID_RE.sub('{id}', path.split('?')[0])}"
+
+
+def load_replay(path: str) -> List[Tuple[str, str, Optional[Dict]]]:
+    requests = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                requests.append((entry["method"].upper(), entry["path"], entry.get("body")))
+                continue
+            match = ACCESS_LOG_RE.search(line)
+            if match:
+                requests.append((match.group(1), match.group(2), None))
+    return requests
+
+
+def _replayed(ctx: LoadContext, rng: random.Random, method: str, path: str, body: Optional[Dict]):
+    """Fill in what an access log cannot record: bodies, and ids that no longer exist"""
+    if body is not None or method in ("GET", "DELETE"):
+        return method, path, body
+    if method == "PATCH" and path.startswith("/api/tasks/"):
+        return _patch_task(ctx, rng)
+    if method == "POST" and path.startswith("/api/dependencies"):
+        return _create_dependency(ctx, rng)
+    return method, path, body
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, label: str, seconds: float, status: Optional[int]):
+        with self.lock:
+            if status is None:
+                self.errors[label] += 1
+            else:
+                self.latencies[label].append(seconds)
+                self.statuses[label][status] += 1
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(stats: Stats, elapsed: float) -> Dict[str, Dict]:
+    summary = {}
+    labels = set(stats.latencies) | set(stats.errors)
+    for label in sorted(labels):
+        values = sorted(stats.latencies.get(label, []))
+        summary[label] = {
+            "requests": len(values),
+            "errors": stats.errors.get(label, 0),
+            "rps": round(len(values) / elapsed, 2) if elapsed else 0,
+            "p50_ms": round(_percentile(values, 50) * 1000, 2),
+            "p90_ms": round(_percentile(values, 90) * 1000, 2),
+            "p99_ms": round(_percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0,
+            "statuses": dict(stats.statuses.get(label, {})),
+        }
+    all_values = sorted(v for values in stats.latencies.values() for v in values)
+    summary["ALL"] = {
+        "requests": len(all_values),
+        "errors": sum(stats.errors.values()),
+        "rps": round(len(all_values) / elapsed, 2) if elapsed else 0,
+        "p50_ms": round(_percentile(all_values, 50) * 1000, 2),
+        "p90_ms": round(_percentile(all_values, 90) * 1000, 2),
+        "p99_ms": round(_percentile(all_values, 99) * 1000, 2),
+        "max_ms": round(all_values[-1] * 1000, 2) if all_values else 0,
+    }
+    return summary
+
+
+def _request(conn: http.client.HTTPConnection, method: str, path: str, body: Optional[Dict]):
+    payload = json.dumps(body) if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload is not None else {}
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    data = response.read()
+    return response.status, data
+
+
+def run_level(base_url: str, ctx: LoadContext, users: int, duration: float, mix: Dict[str, int],
+              replay: Optional[List], think_ms: float, seed: int) -> Dict[str, Dict]:
+    """Run `users` closed-loop clients for `duration` seconds"""
+    url = urlparse(base_url)
+    stats = Stats()
+    stop_at = time.perf_counter() + duration
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    replay_cursor = [0]
+    replay_lock = threading.Lock()
+
+    def next_request(rng: random.Random):
+        if replay:
+            with replay_lock:
+                entry = replay[replay_cursor[0] % len(replay)]
+                replay_cursor[0] += 1
+            return _replayed(ctx, rng, *entry)
+        return SCENARIOS[rng.choices(names, weights)[0]](ctx, rng)
+
+    def user(user_index: int):
+        rng = random.Random(seed * 1000 + user_index)
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=120)
+        while time.perf_counter() < stop_at:
+            method, path, body = next_request(rng)
+            label = route_label(method, path)
+            start = time.perf_counter()
+            try:
+                status, data = _request(conn, method, path, body)
+            except (OSError, http.client.HTTPException):
+                stats.record(label, time.perf_counter() - start, None)
+                conn.close()
+                conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=120)
+                continue
+            stats.record(label, time.perf_counter() - start, status)
+            if method == "POST" and path.startswith("/api/dependencies") and status == 201:
+                with ctx.lock:
+                    ctx.created_dependencies.append(json.loads(data)["id"])
+            if think_ms:
+                time.sleep(rng.expovariate(1000 / think_ms))
+        conn.close()
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(stats, time.perf_counter() - started)
+
+
+def print_level(users: int, summary: Dict[str, Dict]) -> None:
+    print(f"\n👥 {users} concurrent users")
+    print(f"   {'route':34s} {'reqs':>7s} {'err':>5s} {'req/s':>8s} {'p50 ms':>9s} {'p90 ms':>9s} "
+          f"{'p99 ms':>9s} {'max ms':>9s}  statuses")
+    for label, s in summary.items():
+        statuses = " ".join(f"{code}×{count}" for code, count in sorted(s.get("statuses", {}).items()))
+        print(f"   {label:34s} {s['requests']:7d} {s['errors']:5d} {s['rps']:8.1f} {s['p50_ms']:9.1f} "
+              f"{s['p90_ms']:9.1f} {s['p99_ms']:9.1f} {s['max_ms']:9.1f}  {statuses}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(workers: int) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--no-access-log"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            if _request(conn, "GET", "/health", None)[0] == 200:
+                return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+def cleanup(base_url: str, ctx: LoadContext) -> None:
+    """Undo the writes the load test made"""
+    url = urlparse(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    for dep_id in ctx.created_dependencies:
+        _request(conn, "DELETE", f"/api/dependencies/{dep_id}", None)
+    for task_id in ctx.patched:
+        _request(conn, "PATCH", f"/api/tasks/{task_id}", ctx.original[task_id])
+    conn.close()
+    print(f"\n🧹 Restored {len(ctx.patched)} tasks, removed {len(ctx.created_dependencies)} dependencies")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--spawn", action="store_true", help="start uvicorn main:app on a free port for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when --spawn is used")
+    parser.add_argument("--users", default="1,4,16,32", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=15, help="seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights, scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument("--replay", help="replay this request log instead of the mix")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a user's requests")
+    parser.add_argument("--p99-slo-ms", type=float, default=500, help="p99 target used for the capacity verdict")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write all results as JSON here")
+    args = parser.parse_args()
+
+    mix = {}
+    for part in args.mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario '{name}'")
+        mix[name] = int(weight or 1)
+    replay = load_replay(args.replay) if args.replay else None
+
+    proc = None
+    base_url = args.base_url
+    if args.spawn:
+        proc, base_url = spawn_server(args.workers)
+        print(f"🚀 Spawned uvicorn main:app ({args.workers} worker(s)) at {base_url}")
+
+    try:
+        url = urlparse(base_url)
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+        status, data = _request(conn, "GET", "/api/tasks/?limit=1000", None)
+        conn.close()
+        if status != 200 or len(json.loads(data)) < 2:
+            print("❌ Need at least two tasks to load test - seed some data first (seed_synthetic_data.py)")
+            return 1
+        ctx = LoadContext(json.loads(data))
+
+        print(f"\n{'='*70}")
+        print(f"📈 LOAD TEST {base_url} - {'replay of ' + args.replay if replay else 'mix ' + args.mix}")
+        print(f"{'='*70}")
+
+        levels = {}
+        capacity = None
+        for users in [int(u) for u in args.users.split(",")]:
+            summary = run_level(base_url, ctx, users, args.duration, mix, replay, args.think_ms, args.seed)
+            levels[users] = summary
+            print_level(users, summary)
+            if summary["ALL"]["p99_ms"] <= args.p99_slo_ms:
+                capacity = users
+
+        print(f"\n{'='*70}")
+        if capacity is None:
+            print(f"⚠️  p99 exceeded {args.p99_slo_ms:.0f} ms at every level tested")
+        else:
+            print(f"✅ Highest tested concurrency within p99 ≤ {args.p99_slo_ms:.0f} ms: {capacity} users")
+
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"base_url": base_url, "mix": mix, "replay": args.replay,
+                           "duration_s": args.duration, "levels": levels}, f, indent=2)
+            print(f"💾 Results written to {args.output}")
+
+        cleanup(base_url, ctx)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
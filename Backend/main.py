@@ -3,11 +3,18 @@ Main FastAPI Application
 Backend API for Project Management with CPM
 """
 
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import routers - THESE ARE CRITICAL
-from routers import tasks, dependencies, cpm_route
+from routers import tasks, dependencies, cpm_route, profiles, projects, timeline, imports, baselines
+from database import engine, replica_engine
+from core.cache import start_invalidation_listener
+from core.profiling import install_query_timer
+from core.pool import shutdown_process_pool
+from core.schedule import refresh_schedule
 
 # Create FastAPI app
 app = FastAPI(
@@ -26,12 +33,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend read the write's WAL position and send it back
+    # (see get_read_db in database.py)
+    expose_headers=["X-DB-LSN"],
 )
 
 # INCLUDE ALL ROUTERS - THIS IS THE KEY PART
 app.include_router(tasks.router)
 app.include_router(dependencies.router)
 app.include_router(cpm_route.router)
+app.include_router(profiles.router)
+app.include_router(projects.router)
+app.include_router(timeline.router)
+app.include_router(imports.router)
+app.include_router(baselines.router)
+
+# Log slow SQL together with the route that issued it
+install_query_timer(engine)
+if replica_engine is not None:
+    install_query_timer(replica_engine)
+
+
+@app.on_event("startup")
+def start_cache_listener():
+    """Keep this worker's CPM cache in sync with writes made by other workers"""
+    start_invalidation_listener(engine)
+
+
+@app.on_event("startup")
+def start_schedule_refresh():
+    """Catch the stored schedule up with writes made while no worker was running"""
+    threading.Thread(target=refresh_schedule, name="schedule-refresh", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def stop_process_pool():
+    shutdown_process_pool()
 
 # Root endpoint
 @app.get("/")
@@ -1,11 +1,12 @@
 """
 SQLAlchemy ORM models
-Defines Tasks and TaskDependencies tables
+Defines Projects, Tasks, TaskDependencies and Baselines tables
 """
 
-from sqlalchemy import Column, Text, Integer, Date, Enum, TIMESTAMP, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Text, Integer, Boolean, Date, Enum, ForeignKey, Index, LargeBinary, TIMESTAMP, Computed, func
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR, DATERANGE
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 import enum
 import uuid
 
@@ -19,6 +20,32 @@ class TaskStatusEnum(str, enum.Enum):
     done = "done"
 
 
+class DependencyTypeEnum(str, enum.Enum):
+    """Dependency type: which end of the prerequisite gates which end of the task"""
+    FS = "FS"  # finish-to-start
+    SS = "SS"  # start-to-start
+    FF = "FF"  # finish-to-finish
+    SF = "SF"  # start-to-finish
+
+
+class Project(Base):
+    """Project model - a group of tasks scheduled as one unit in the portfolio"""
+    __tablename__ = "projects"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=func.gen_random_uuid()
+    )
+    name = Column(Text, nullable=False)
+    description = Column(Text, nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<Project(id={self.id}, name={self.name})>"
+
+
 class Task(Base):
     """Task model - represents a task in the project"""
     __tablename__ = "tasks"
@@ -48,6 +75,64 @@ class Task(Base):
         onupdate=func.now(),
     )
 
+    # Project the task belongs to; NULL for tasks outside any project
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=True)
+
+    # Summary task this one is nested under; a task with subtasks is a
+    # summary whose dates and schedule are rolled up from them
+    parent_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True)
+
+    # Materialized CPM schedule (days from project start), refreshed in the
+    # background after schedule-affecting writes; NULL until first computed
+    early_start = Column(Integer, nullable=True)
+    early_finish = Column(Integer, nullable=True)
+    late_start = Column(Integer, nullable=True)
+    late_finish = Column(Integer, nullable=True)
+    slack = Column(Integer, nullable=True)
+    is_critical = Column(Boolean, nullable=True)
+    # Summary tasks only: span of their subtasks, kept apart from the
+    # duration the user entered
+    rollup_duration = Column(Integer, nullable=True)
+
+    # Full-text search document, generated by Postgres; deferred so it is
+    # never loaded (or returned) with ordinary task queries
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
+    # Gantt bar interval (inclusive), generated by Postgres for the timeline's
+    # GiST overlap index; deferred like search_vector
+    timeline_span = deferred(Column(
+        DATERANGE,
+        Computed(
+            "CASE WHEN start_date IS NULL THEN NULL ELSE daterange("
+            "start_date, greatest(coalesce(target_completion_date, start_date + duration - 1), start_date), '[]'"
+            ") END",
+            persisted=True,
+        ),
+    ))
+
+    __table_args__ = (
+        Index("ix_tasks_slack", "slack"),
+        Index("ix_tasks_early_start", "early_start"),
+        Index("ix_tasks_parent_id", "parent_id"),
+        Index("ix_tasks_project_id", "project_id"),
+        Index("ix_tasks_critical_early_start", "early_start", postgresql_where=is_critical),
+        # Board columns: status filter/count plus the range filters within a column
+        Index("ix_tasks_status_start_date", "status", "start_date"),
+        Index("ix_tasks_status_target_date", "status", "target_completion_date"),
+        Index("ix_tasks_status_duration", "status", "duration"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_tasks_timeline_span", "timeline_span", postgresql_using="gist"),
+        # Needs the pg_trgm extension
+        Index("ix_tasks_name_trgm", "name", postgresql_using="gist", postgresql_ops={"name": "gist_trgm_ops"}),
+    )
+
     def __repr__(self):
         return f"<Task(id={self.id}, name={self.name})>"
 
@@ -65,7 +150,61 @@ class TaskDependency(Base):
     )
     task_id = Column(UUID(as_uuid=True), nullable=False)
     depends_on_task_id = Column(UUID(as_uuid=True), nullable=False)
+    type = Column(
+        Enum(DependencyTypeEnum, name="dependency_type"),
+        nullable=False,
+        default=DependencyTypeEnum.FS,
+        server_default=DependencyTypeEnum.FS.value,
+    )
+    # Days between the linked ends; negative for a lead
+    lag = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<TaskDependency(task={self.task_id}, depends_on={self.depends_on_task_id})>"
+
+
+class BaselineTaskSet(Base):
+    """Sorted task ids of one or more baselines (see core/baselines.py)"""
+    __tablename__ = "baseline_task_sets"
+
+    digest = Column(LargeBinary, primary_key=True)  # sha256 of ids
+    task_count = Column(Integer, nullable=False)
+    ids = Column(LargeBinary, nullable=False)  # 16-byte UUIDs, concatenated
+
+
+class Baseline(Base):
+    """Baseline model - a frozen copy of the schedule to compare against"""
+    __tablename__ = "baselines"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=func.gen_random_uuid()
+    )
+    name = Column(Text, nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=True)
+    task_set = Column(LargeBinary, ForeignKey("baseline_task_sets.digest"), nullable=False)
+    task_count = Column(Integer, nullable=False)
+    project_end = Column(Integer, nullable=False)
+    critical_count = Column(Integer, nullable=False)
+    size_bytes = Column(Integer, nullable=False)  # compressed columns, ids not included
+    data = deferred(Column(LargeBinary, nullable=False))
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_baselines_project_id", "project_id", "created_at"),
+    )
+
     def __repr__(self):
-        return f"<TaskDependency(task={self.task_id}, depends_on={self.depends_on_task_id})>"
\ No newline at end of file
+        return f"<Baseline(id={self.id}, name={self.name})>"
+
+
+class ScheduleState(Base):
+    """Token of the last schedule refresh (see core/schedule.py); a single row"""
+    __tablename__ = "schedule_state"
+
+    id = Column(Integer, primary_key=True)
+    token = Column(Text, nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
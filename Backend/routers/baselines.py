@@ -0,0 +1,125 @@
+"""
+Baseline endpoints:   snapshot the schedule, list, delete, and diff against it
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import traceback
+
+from database import get_db, get_read_db
+from core.baselines import current_snapshot, decode_snapshot, diff_snapshots, encode_columns, encode_ids
+from core.profiling import ProfiledRoute
+from crud import (
+    create_baseline, get_baseline, list_baselines, load_baseline_snapshot, delete_baseline, task_names,
+)
+from schemas import BaselineCreate, BaselineOut
+
+router = APIRouter(prefix="/api/baselines", tags=["baselines"], route_class=ProfiledRoute)
+
+
+@router.post("/", response_model=BaselineOut, status_code=201)
+def create_baseline_endpoint(baseline_in: BaselineCreate, db: Session = Depends(get_db)):
+    """Freeze the current CPM schedule (all tasks, or one project's)"""
+    try:
+        print(f"\n📥 POST /api/baselines - {baseline_in.name}")
+        snapshot = current_snapshot(db, baseline_in.project_id)
+        digest, ids = encode_ids(snapshot)
+        data = encode_columns(snapshot)
+        result = create_baseline(
+            db, baseline_in, digest, ids, data,
+            task_count=len(snapshot), project_end=snapshot.project_end, critical_count=snapshot.critical,
+        )
+        print(f"✅ Baseline {result.id}: {len(snapshot)} tasks in {len(data)} bytes")
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"❌ Error in create_baseline_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/", response_model=List[BaselineOut])
+def list_baselines_endpoint(
+    project_id: Optional[UUID] = Query(None, description="Only this project's baselines"),
+    db: Session = Depends(get_read_db),
+):
+    """List baselines, newest first"""
+    return list_baselines(db, project_id)
+
+
+@router.get("/{baseline_id}", response_model=BaselineOut)
+def get_baseline_endpoint(baseline_id: UUID, db: Session = Depends(get_read_db)):
+    """Get a baseline"""
+    baseline = get_baseline(db, baseline_id)
+    if baseline is None:
+        raise HTTPException(status_code=404, detail="Baseline not found")
+    return baseline
+
+
+@router.delete("/{baseline_id}")
+def delete_baseline_endpoint(baseline_id: UUID, db: Session = Depends(get_db)):
+    """Delete a baseline"""
+    try:
+        print(f"\n📥 DELETE /api/baselines/{baseline_id}")
+        delete_baseline(db, baseline_id)
+        print(f"✅ Baseline deleted")
+        return {"status": "deleted", "baseline_id": str(baseline_id)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in delete_baseline_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/{baseline_id}/diff", response_model=Dict[str, Any])
+def diff_baseline_endpoint(
+    baseline_id: UUID,
+    against: str = Query("current", description="Another baseline id, or 'current' for the live schedule"),
+    limit: int = Query(100, ge=0, le=1000, description="Rows listed in slips and critical path changes"),
+    db: Session = Depends(get_db),
+):
+    """
+    Variance from this baseline to the current schedule (or a later
+    baseline): project end slip, the tasks that slipped most, and tasks
+    that joined or left the critical path. Slips are in days.
+    """
+    try:
+        print(f"\n📥 GET /api/baselines/{baseline_id}/diff - against={against}")
+        baseline = get_baseline(db, baseline_id)
+        if baseline is None:
+            raise HTTPException(status_code=404, detail="Baseline not found")
+        old = decode_snapshot(*load_baseline_snapshot(db, baseline_id))
+
+        if against == "current":
+            new = current_snapshot(db, baseline.project_id)
+        else:
+            try:
+                other = load_baseline_snapshot(db, UUID(against))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="against must be a baseline id or 'current'")
+            if other is None:
+                raise HTTPException(status_code=404, detail="Baseline to compare against not found")
+            new = decode_snapshot(*other)
+
+        result = diff_snapshots(old, new, limit)
+        names = task_names(db, [row["id"] for row in result["slips"]])
+        for row in result["slips"]:
+            row["name"] = names.get(row["id"])
+        result["baseline"] = str(baseline_id)
+        result["against"] = against
+        print(f"✅ {result['slipped']} task(s) slipped, project end {result['project_end']['slip']:+d} day(s)")
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"❌ Error in diff_baseline_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -2,14 +2,24 @@
 Critical Path Method computation endpoint
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import crud
 from database import get_db
-from models import Task, TaskDependency
-from cpm import calculate_cpm
+from schemas import CrashRequest
+from core.profiling import ProfiledRoute
+from core.components import cached_graph_cpm
+from core.crashing import crash_project
+from core.graph_loader import load_cpm_inputs
+from core.hierarchy import cached_summary_index, summary_cpm
+from core.portfolio import cached_portfolio_cpm
+from core.jobs import submit_cpm_job, get_job, get_job_result, wait_for_job, public_view
 
-router = APIRouter(prefix="/api", tags=["cpm"])
+router = APIRouter(prefix="/api", tags=["cpm"], route_class=ProfiledRoute)
 
 
 @router.get("/cpm", response_model=Dict[str, Any])
@@ -25,30 +35,167 @@ def compute_cpm(db: Session = Depends(get_db)):
         "LF": {task_id: latest_finish_day},
         "slack": {task_id: slack_days},
         "project_end": int,
-        "critical_path":  [task_id, ...]
+        "critical_path":  [task_id, ...],
+        "components": [
+            {"id": task_id, "tasks": int, "project_end": int, "critical_path": [task_id, ...],
+             "key": content digest}
+        ]
     }
+
+    Disconnected subgraphs are scheduled separately (see core/components.py);
+    project_end and critical_path cover all of them.
+    """
+    try:
+        # Computed once per graph version for every worker on this host
+        return cached_graph_cpm(db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cpm/summary", response_model=Dict[str, Any])
+def compute_summary_cpm(
+    expand: Optional[List[str]] = Query(None, description="Summary task to show the subtasks of; repeat for several"),
+    db: Session = Depends(get_db),
+):
     """
-    # Fetch all tasks and dependencies
-    tasks_query = db.query(Task).all()
-    deps_query = db.query(TaskDependency).all()
-
-    tasks = []
-    for t in tasks_query:
-        tasks.append({
-            "id": str(t.id),
-            "duration": t.duration or 0,
-            "buffer_time": t.buffer_time or 0,
-        })
-
-    dependencies = []
-    for d in deps_query: 
-        dependencies.append({
-            "task_id": str(d.task_id),
-            "depends_on_task_id": str(d. depends_on_task_id),
-        })
+    CPM at summary level: top-level tasks, with each summary task scheduled
+    as one block and only the branches in expand opened up.
 
+    Returns the GET /api/cpm fields for the visible tasks, plus
+    {
+        "tasks": [{"id", "name", "parent_id", "summary": bool, "duration"}],
+        "expanded": [task_id, ...],      # expand plus the summaries above them
+        "auto_expanded": [task_id, ...]  # opened because blocks looped both ways
+    }
+
+    Summary durations are the length of their own subtask network; links
+    between blocks keep their type and lag (see core/hierarchy.py).
+    """
     try:
-        result = calculate_cpm(tasks, dependencies)
+        result = summary_cpm(cached_summary_index(db), expand or ())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    names = crud.task_names(db, [t["id"] for t in result["tasks"]])
+    for task in result["tasks"]:
+        task["name"] = names.get(task["id"])
+    return result
+
+
+@router.get("/cpm/portfolio", response_model=Dict[str, Any])
+def compute_portfolio_cpm(
+    project_id: Optional[UUID] = Query(None, description="Only return this project's tasks"),
+    db: Session = Depends(get_db),
+):
+    """
+    CPM across all projects, including cross-project dependencies.
+
+    Returns:
+    {
+        "ES", "EF", "LS", "LF", "slack": {task_id: days},
+        "project_end": int,
+        "critical_path": [task_id, ...],
+        "projects": [{"id", "tasks", "project_end", "boundary", "recomputed"}],
+        "boundary": {"tasks": int, "links": int}
+    }
+
+    Values match GET /api/cpm. Each project is computed and cached on its
+    own; only ES/LS of tasks on cross-project links are propagated between
+    projects (see core/portfolio.py).
+    """
+    try:
+        result = cached_portfolio_cpm(db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if project_id is None:
         return result
+
+    pid = str(project_id)
+    if not any(p["id"] == pid for p in result["projects"]):
+        raise HTTPException(status_code=404, detail="Project has no scheduled tasks")
+    tasks = set(crud.project_task_ids(db, project_id))
+    narrowed = {
+        key: {tid: v for tid, v in result[key].items() if tid in tasks}
+        for key in ("ES", "EF", "LS", "LF", "slack")
+    }
+    narrowed["critical_path"] = [tid for tid in result["critical_path"] if tid in tasks]
+    narrowed["project_end"] = result["project_end"]
+    narrowed["projects"] = [p for p in result["projects"] if p["id"] == pid]
+    return narrowed
+
+
+@router.post("/cpm/crash", response_model=Dict[str, Any])
+def crash_schedule(request: CrashRequest, db: Session = Depends(get_db)):
+    """
+    Find the cheapest duration reductions that bring project_end down to
+    the target.
+
+    The target is target_end (days), or target_date counted from
+    project_start; with neither, the latest task target_completion_date.
+    Nothing is written: apply the suggested durations with PATCH /api/tasks/{task_id}.
+
+    Returns:
+    {
+        "target_end": int, "original_end": int, "achieved_end": int,
+        "feasible": bool, "total_cost": float,
+        "reductions": [{"task_id", "days", "cost", "duration"}],
+        "steps": [{"end": int, "days": int, "tasks": [task_id, ...], "cost": float}]
+    }
+    """
+    target_end = request.target_end
+    if target_end is None:
+        earliest_start, latest_target = crud.project_dates(db)
+        target_date = request.target_date or latest_target
+        if target_date is None:
+            raise HTTPException(status_code=400, detail="No target given and no task has a target_completion_date")
+        start = request.project_start or earliest_start or date.today()
+        target_end = (target_date - start).days
+        if target_end < 0:
+            raise HTTPException(status_code=400, detail="Target date is before the project start")
+
+    tasks, dependencies = load_cpm_inputs(db)
+    known = {t["id"] for t in tasks}
+    limits = {str(l.task_id): (l.max_crash_days, l.cost_per_day) for l in request.tasks}
+    unknown = sorted(set(limits) - known)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown task ids: {', '.join(unknown[:10])}")
+
+    try:
+        return crash_project(
+            tasks, dependencies, target_end, limits,
+            request.default_max_crash_fraction, request.default_cost_per_day,
+        )
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ==================== BACKGROUND JOBS ====================
+
+@router.post("/cpm/jobs", status_code=202, response_model=Dict[str, Any])
+def create_cpm_job():
+    """
+    Queue CPM for the current graph on the worker process pool.
+
+    Returns the job record immediately; poll GET /api/cpm/jobs/{job_id}.
+    While the graph is unchanged, every submission returns the same job.
+    """
+    return public_view(submit_cpm_job())
+
+
+@router.get("/cpm/jobs/{job_id}", response_model=Dict[str, Any])
+def get_cpm_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish"),
+):
+    """
+    Job status: queued, running, done or failed.
+    Finished jobs include "result" (same shape as GET /api/cpm).
+    """
+    record = wait_for_job(job_id, wait) if wait else get_job(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="CPM job not found")
+
+    response = public_view(record)
+    if record["status"] == "done":
+        response["result"] = get_job_result(job_id)
+    return response
@@ -2,13 +2,15 @@
 Dependency endpoints:  CRUD operations and validation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 import traceback
 
-from database import get_db
+from database import get_db, get_read_db
+from core.profiling import ProfiledRoute
+from core.schedule import refresh_schedule
 from crud import (
     get_dependency,
     list_dependencies,
@@ -17,12 +19,12 @@ from crud import (
 )
 from schemas import DependencyCreate, DependencyOut
 
-router = APIRouter(prefix="/api/dependencies", tags=["dependencies"])
+router = APIRouter(prefix="/api/dependencies", tags=["dependencies"], route_class=ProfiledRoute)
 
 
 @router.post("/", response_model=DependencyOut, status_code=201)
 def create_dependency_endpoint(
-    dep_in: DependencyCreate, db: Session = Depends(get_db)
+    dep_in: DependencyCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
 ):
     """
     Create a new task dependency.
@@ -35,6 +37,7 @@ def create_dependency_endpoint(
     try: 
         print(f"\n📥 POST /api/dependencies - Creating dependency")
         result = create_dependency(db, dep_in)
+        background_tasks.add_task(refresh_schedule)
         print(f"✅ Dependency created: {result.id}")
         return result
     except HTTPException:
@@ -49,7 +52,7 @@ def create_dependency_endpoint(
 def list_dependencies_endpoint(
     task_id: Optional[UUID] = Query(None),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     List dependencies. 
@@ -67,11 +70,14 @@ def list_dependencies_endpoint(
 
 
 @router.delete("/{dep_id}")
-def delete_dependency_endpoint(dep_id: UUID, db: Session = Depends(get_db)):
+def delete_dependency_endpoint(
+    dep_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     """Delete a dependency"""
     try:
         print(f"\n📥 DELETE /api/dependencies/{dep_id}")
         delete_dependency(db, dep_id)
+        background_tasks.add_task(refresh_schedule)
         print(f"✅ Dependency deleted")
         return {"status": "deleted", "dep_id": str(dep_id)}
     except HTTPException:
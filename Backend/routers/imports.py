@@ -0,0 +1,102 @@
+"""
+Schedule import endpoints:   CSV / MS Project XML uploads, parsed in the background
+"""
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+import os
+import traceback
+
+import aiofiles
+
+import crud
+from config import IMPORT_DIR, IMPORT_MAX_BYTES
+from database import get_db
+from core.imports import FORMATS, get_import, get_import_ids, new_import, run_import
+from core.profiling import ProfiledRoute
+
+router = APIRouter(prefix="/api/import", tags=["import"], route_class=ProfiledRoute)
+
+
+def _import_project(
+    project_id: Optional[UUID] = Query(None, description="Put every imported task in this project"),
+    db: Session = Depends(get_db),
+) -> Optional[UUID]:
+    """
+    Check the target project exists. A plain def, so FastAPI runs the
+    blocking session query in its threadpool, not on the event loop.
+    """
+    if project_id is not None and crud.get_project(db, project_id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project_id
+
+
+@router.post("", status_code=202, response_model=Dict[str, Any])
+async def import_schedule(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: str = Query(..., description="csv or msproject (MS Project XML)"),
+    project_id: Optional[UUID] = Depends(_import_project),
+):
+    """
+    Import a schedule sent as the raw request body.
+
+    The body is streamed to disk, so the upload never sits in memory;
+    parsing and inserting happen after the response. Returns the import
+    record; poll GET /api/import/{import_id} for progress. Only the body
+    read is async; the project lookup runs in _import_project.
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(FORMATS)}")
+
+    os.makedirs(IMPORT_DIR, exist_ok=True)
+    path = os.path.join(IMPORT_DIR, f"{uuid4().hex}.{'csv' if format == 'csv' else 'xml'}")
+    size = 0
+    try:
+        print(f"\n📥 POST /api/import - format={format}")
+        async with aiofiles.open(path, "wb") as f:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > IMPORT_MAX_BYTES:
+                    raise HTTPException(status_code=413, detail=f"Upload exceeds {IMPORT_MAX_BYTES} bytes")
+                await f.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty upload")
+    except HTTPException:
+        os.unlink(path)
+        raise
+    except Exception as e:
+        os.unlink(path)
+        print(f"❌ Error in import_schedule: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+    record = new_import(format, size, project_id)
+    background_tasks.add_task(run_import, record["import_id"], path, format, project_id)
+    print(f"✅ Import {record['import_id']} queued ({size} bytes)")
+    return record
+
+
+@router.get("/{import_id}", response_model=Dict[str, Any])
+def get_import_status(import_id: str):
+    """
+    Import progress: queued, running, linking, validating, inserting
+    dependencies, then done or failed (with "error"; nothing is kept).
+    """
+    record = get_import(import_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return record
+
+
+@router.get("/{import_id}/ids", response_model=Dict[str, str])
+def get_import_id_map(import_id: str):
+    """Task UUIDs of a finished import, keyed by the ids used in the file"""
+    record = get_import(import_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if record["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Import is {record['status']}")
+    return get_import_ids(import_id) or {}
@@ -0,0 +1,47 @@
+"""
+Request profile endpoints: browse and download captured profiles
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from typing import Dict, Any, List
+
+from core.profiling import profiling_enabled, list_profiles, load_profile, profile_path
+
+router = APIRouter(prefix="/api/profiles", tags=["profiling"])
+
+
+def _require_profiling():
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+def list_profiles_endpoint():
+    """
+    List captured request profiles, newest first.
+    Profile a request by sending "X-Profile: 1" (when PROFILE_HEADER_ENABLED)
+    or by setting PROFILE_SAMPLE_RATE; the response carries X-Profile-Id.
+    """
+    _require_profiling()
+    return list_profiles()
+
+
+@router.get("/{profile_id}", response_model=Dict[str, Any])
+def get_profile_endpoint(profile_id: str):
+    """Time breakdown (total / endpoint / SQL / serialization) and top functions"""
+    _require_profiling()
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.get("/{profile_id}/download")
+def download_profile_endpoint(profile_id: str):
+    """Raw pstats file, e.g. for `snakeviz` or `python -m pstats`"""
+    _require_profiling()
+    path = profile_path(profile_id, ".prof")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
@@ -0,0 +1,73 @@
+"""
+Project endpoints:   create, list, delete
+"""
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+from uuid import UUID
+import traceback
+
+from database import get_db, get_read_db
+from core.profiling import ProfiledRoute
+from core.schedule import refresh_schedule
+from crud import get_project, list_projects, create_project, delete_project
+from schemas import ProjectCreate, ProjectOut
+
+router = APIRouter(prefix="/api/projects", tags=["projects"], route_class=ProfiledRoute)
+
+
+@router.post("/", response_model=ProjectOut, status_code=201)
+def create_project_endpoint(project_in: ProjectCreate, db: Session = Depends(get_db)):
+    """Create a new project; add tasks to it with project_id"""
+    try:
+        print(f"\n📥 POST /api/projects - Creating project {project_in.name}")
+        result = create_project(db, project_in)
+        print(f"✅ Project created: {result.id}")
+        return result
+    except Exception as e:
+        print(f"❌ Error in create_project_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/", response_model=List[ProjectOut])
+def list_projects_endpoint(db: Session = Depends(get_read_db)):
+    """List all projects"""
+    try:
+        print(f"\n📥 GET /api/projects")
+        results = list_projects(db)
+        print(f"✅ Retrieved {len(results)} projects")
+        return results
+    except Exception as e:
+        print(f"❌ Error in list_projects_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/{project_id}", response_model=ProjectOut)
+def get_project_endpoint(project_id: UUID, db: Session = Depends(get_read_db)):
+    """Get a project"""
+    project = get_project(db, project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+
+@router.delete("/{project_id}")
+def delete_project_endpoint(
+    project_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
+    """Delete a project together with its tasks"""
+    try:
+        print(f"\n📥 DELETE /api/projects/{project_id}")
+        delete_project(db, project_id)
+        background_tasks.add_task(refresh_schedule)
+        print(f"✅ Project deleted")
+        return {"status": "deleted", "project_id": str(project_id)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in delete_project_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -2,21 +2,63 @@
 Task endpoints:   CRUD operations
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional
+from datetime import date
 from uuid import UUID
 import traceback
 
-from database import get_db
-from crud import get_task, list_tasks, create_task, update_task, delete_task
-from schemas import TaskCreate, TaskUpdate, TaskOut
+from database import get_db, get_read_db
+from core.profiling import ProfiledRoute
+from core.schedule import refresh_schedule
+from crud import (
+    get_task,
+    list_tasks,
+    count_tasks_by_status,
+    search_tasks,
+    create_task,
+    update_task,
+    delete_task,
+    SCHEDULE_FIELDS,
+    TASK_ORDER_FIELDS,
+)
+from schemas import TaskCreate, TaskUpdate, TaskOut, TaskFilter, TaskStatus, TaskSearchHit
 
-router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+router = APIRouter(prefix="/api/tasks", tags=["tasks"], route_class=ProfiledRoute)
+
+
+def task_filters(
+    project_id: Optional[UUID] = Query(None, description="Only tasks in this project"),
+    status: Optional[List[TaskStatus]] = Query(None, description="Repeat for several statuses"),
+    start_from: Optional[date] = Query(None, description="start_date on or after"),
+    start_to: Optional[date] = Query(None, description="start_date on or before"),
+    target_from: Optional[date] = Query(None, description="target_completion_date on or after"),
+    target_to: Optional[date] = Query(None, description="target_completion_date on or before"),
+    duration_min: Optional[int] = Query(None, ge=0),
+    duration_max: Optional[int] = Query(None, ge=0),
+    critical: Optional[bool] = Query(None, description="Only tasks on (or off) the critical path"),
+    slack_lt: Optional[int] = Query(None, description="Only tasks with slack below this many days"),
+) -> TaskFilter:
+    """Query parameters shared by the list and count endpoints"""
+    return TaskFilter(
+        project_id=project_id,
+        status=status,
+        start_from=start_from,
+        start_to=start_to,
+        target_from=target_from,
+        target_to=target_to,
+        duration_min=duration_min,
+        duration_max=duration_max,
+        critical=critical,
+        slack_lt=slack_lt,
+    )
 
 
 @router.post("/", response_model=TaskOut, status_code=201)
-def create_task_endpoint(task_in: TaskCreate, db: Session = Depends(get_db)):
+def create_task_endpoint(
+    task_in: TaskCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     """Create a new task"""
     try:
         print(f"\n{'='*60}")
@@ -24,11 +66,14 @@ def create_task_endpoint(task_in: TaskCreate, db: Session = Depends(get_db)):
         print(f"   Request: name={task_in.name}, duration={task_in.duration}")
         
         result = create_task(db, task_in)
+        background_tasks.add_task(refresh_schedule)
         
         print(f"✅ SUCCESS: Task created with ID {result.id}")
         print(f"{'='*60}\n")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e: 
         print(f"\n{'='*60}")
         print(f"❌ ERROR in create_task_endpoint:")
@@ -44,15 +89,27 @@ def create_task_endpoint(task_in: TaskCreate, db: Session = Depends(get_db)):
 def list_tasks_endpoint(
     limit: int = Query(100, ge=1, le=1000),
     skip: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    order: Optional[str] = Query(
+        None,
+        pattern=f"^-?({'|'.join(TASK_ORDER_FIELDS)})$",
+        description="Sort key, '-' prefix for descending",
+    ),
+    filters: TaskFilter = Depends(task_filters),
+    db: Session = Depends(get_read_db),
 ):
-    """List all tasks"""
+    """
+    List all tasks.
+    Filter server-side so a board only fetches the column or page on
+    screen, e.g. ?status=in_progress&limit=50 or ?critical=true&slack_lt=3&order=ES
+    (schedule filters and sort keys use the stored CPM values).
+    """
     try:
         print(f"\n{'='*60}")
         print(f"📥 GET /api/tasks/")
-        print(f"   Parameters: limit={limit}, skip={skip}")
+        print(f"   Parameters: limit={limit}, skip={skip}, order={order}, "
+              f"filters={filters.dict(exclude_none=True)}")
         
-        results = list_tasks(db, limit=limit, skip=skip)
+        results = list_tasks(db, limit=limit, skip=skip, filters=filters, order=order)
         
         print(f"✅ SUCCESS: Retrieved {len(results)} tasks")
         print(f"{'='*60}\n")
@@ -69,8 +126,48 @@ def list_tasks_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/counts", response_model=Dict[str, int])
+def count_tasks_endpoint(
+    filters: TaskFilter = Depends(task_filters),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Task count per status for board column headers, with the same filters
+    as the list endpoint.
+    Returns: {"not_started": int, "in_progress": int, "done": int, "total": int}
+    """
+    try:
+        print(f"\n📥 GET /api/tasks/counts (filters={filters.dict(exclude_none=True)})")
+        return count_tasks_by_status(db, filters)
+    except Exception as e:
+        print(f"❌ Error in count_tasks_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search", response_model=List[TaskSearchHit])
+def search_tasks_endpoint(
+    q: str = Query(..., min_length=1, max_length=200, description="Words, \"phrases\", -exclusions, or"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Search task names and descriptions, best matches first.
+    Falls back to fuzzy name matching when the words themselves don't match.
+    """
+    try:
+        print(f"\n📥 GET /api/tasks/search (q={q!r}, limit={limit})")
+        results = search_tasks(db, q, limit=limit)
+        print(f"✅ {len(results)} result(s)")
+        return results
+    except Exception as e:
+        print(f"❌ Error in search_tasks_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{task_id}", response_model=TaskOut)
-def get_task_endpoint(task_id: UUID, db: Session = Depends(get_db)):
+def get_task_endpoint(task_id: UUID, db: Session = Depends(get_read_db)):
     """Get a single task by ID"""
     try: 
         print(f"\n{'='*60}")
@@ -99,7 +196,10 @@ def get_task_endpoint(task_id: UUID, db: Session = Depends(get_db)):
 
 @router.patch("/{task_id}", response_model=TaskOut)
 def update_task_endpoint(
-    task_id: UUID, task_in: TaskUpdate, db: Session = Depends(get_db)
+    task_id: UUID,
+    task_in: TaskUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
 ):
     """Update a task"""
     try: 
@@ -107,6 +207,8 @@ def update_task_endpoint(
         print(f"📥 PATCH /api/tasks/{task_id}")
         
         result = update_task(db, task_id, task_in)
+        if SCHEDULE_FIELDS & task_in.dict(exclude_unset=True).keys():
+            background_tasks.add_task(refresh_schedule)
         
         print(f"✅ SUCCESS: Task updated")
         print(f"{'='*60}\n")
@@ -126,13 +228,16 @@ def update_task_endpoint(
 
 
 @router.delete("/{task_id}")
-def delete_task_endpoint(task_id: UUID, db: Session = Depends(get_db)):
+def delete_task_endpoint(
+    task_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     """Delete a task"""
     try:
         print(f"\n{'='*60}")
         print(f"📥 DELETE /api/tasks/{task_id}")
         
         delete_task(db, task_id)
+        background_tasks.add_task(refresh_schedule)
         
         print(f"✅ SUCCESS: Task deleted")
         print(f"{'='*60}\n")
@@ -0,0 +1,46 @@
+"""
+Timeline endpoint:   Gantt bars for a date window, bucketed by zoom level
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+from uuid import UUID
+import traceback
+
+from database import get_read_db
+from core.profiling import ProfiledRoute
+from crud import timeline
+from schemas import TimelineOut, TimelineZoom
+
+router = APIRouter(prefix="/api/timeline", tags=["timeline"], route_class=ProfiledRoute)
+
+
+@router.get("/", response_model=TimelineOut)
+def timeline_endpoint(
+    start: date = Query(..., description="First visible day"),
+    end: date = Query(..., description="Last visible day"),
+    zoom: TimelineZoom = Query(TimelineZoom.week, description="Column size: day, week or month"),
+    per_bucket: int = Query(20, ge=0, le=500, description="Bars listed per column before it is summarized"),
+    project_id: Optional[UUID] = Query(None, description="Only tasks in this project"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Tasks whose bars overlap [start, end], one bucket per column.
+
+    Sparse columns list their bars; dense ones only carry counts (by
+    status, critical, in progress), so the response size depends on the
+    window and zoom, not on how many tasks the project has.
+    """
+    try:
+        print(f"\n📥 GET /api/timeline - {start}..{end} zoom={zoom.value} per_bucket={per_bucket}")
+        result = timeline(db, start, end, zoom, per_bucket=per_bucket, project_id=project_id)
+        print(f"✅ {result['total']} bar(s) in {len(result['buckets'])} bucket(s)")
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in timeline_endpoint: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import date, datetime
 from uuid import UUID
 from enum import Enum
@@ -16,6 +16,29 @@ class TaskStatus(str, Enum):
     done = "done"
 
 
+class DependencyType(str, Enum):
+    """Dependency types (finish-to-start, start-to-start, ...)"""
+    FS = "FS"
+    SS = "SS"
+    FF = "FF"
+    SF = "SF"
+
+
+class ProjectCreate(BaseModel):
+    """Schema for creating a project"""
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+
+
+class ProjectOut(ProjectCreate):
+    """Schema for project response"""
+    id: UUID
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
 class TaskBase(BaseModel):
     """Base task schema with common fields"""
     name: str = Field(..., min_length=1, max_length=255)
@@ -25,6 +48,8 @@ class TaskBase(BaseModel):
     buffer_time: int = Field(0, ge=0, description="Buffer time in days")
     start_date: Optional[date] = None
     target_completion_date: Optional[date] = None
+    parent_id: Optional[UUID] = Field(None, description="Summary task this one is nested under")
+    project_id: Optional[UUID] = Field(None, description="Project the task belongs to")
 
 
 class TaskCreate(TaskBase):
@@ -41,6 +66,22 @@ class TaskUpdate(BaseModel):
     buffer_time: Optional[int] = None
     start_date: Optional[date] = None
     target_completion_date: Optional[date] = None
+    parent_id: Optional[UUID] = None
+    project_id: Optional[UUID] = None
+
+
+class TaskFilter(BaseModel):
+    """Server-side filters for task listings (all optional, combined with AND)"""
+    project_id: Optional[UUID] = None
+    status: Optional[List[TaskStatus]] = None
+    start_from: Optional[date] = None
+    start_to: Optional[date] = None
+    target_from: Optional[date] = None
+    target_to: Optional[date] = None
+    duration_min: Optional[int] = None
+    duration_max: Optional[int] = None
+    critical: Optional[bool] = None
+    slack_lt: Optional[int] = None
 
 
 class TaskOut(TaskBase):
@@ -48,15 +89,34 @@ class TaskOut(TaskBase):
     id: UUID
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    early_start: Optional[int] = None
+    early_finish: Optional[int] = None
+    late_start: Optional[int] = None
+    late_finish: Optional[int] = None
+    slack: Optional[int] = None
+    is_critical: Optional[bool] = None
+    rollup_duration: Optional[int] = Field(None, description="Summary tasks: span of their subtasks in days")
 
     class Config:
         orm_mode = True
 
 
+class TaskSearchHit(BaseModel):
+    """One search result: the task, its score and a highlighted snippet"""
+    task: TaskOut
+    rank: float
+    headline: Optional[str] = Field(None, description="Snippet with matches wrapped in <b></b>")
+    match: str = Field(..., description="'fulltext' or 'fuzzy'")
+
+
 class DependencyCreate(BaseModel):
     """Schema for creating a dependency"""
     task_id: UUID = Field(..., description="Task that depends on another")
     depends_on_task_id: UUID = Field(... , description="Prerequisite task")
+    type: DependencyType = Field(
+        DependencyType.FS, description="FS: task starts after the prerequisite finishes; SS, FF, SF likewise"
+    )
+    lag: int = Field(0, description="Days between the linked ends; negative for a lead")
 
 
 class DependencyOut(BaseModel):
@@ -64,6 +124,8 @@ class DependencyOut(BaseModel):
     id: UUID
     task_id: UUID
     depends_on_task_id: UUID
+    type: DependencyType = DependencyType.FS
+    lag: int = 0
     created_at: Optional[datetime] = None
 
     class Config:
@@ -72,4 +134,87 @@ class DependencyOut(BaseModel):
 
 class TaskWithDependencies(TaskOut):
     """Schema for task with its dependencies"""
-    dependencies: List[DependencyOut] = []
\ No newline at end of file
+    dependencies: List[DependencyOut] = []
+
+
+class CrashTaskLimit(BaseModel):
+    """How far one task may be shortened, and what each day costs"""
+    task_id: UUID
+    max_crash_days: int = Field(..., ge=0)
+    cost_per_day: float = Field(..., ge=0)
+
+
+class CrashRequest(BaseModel):
+    """Schedule compression: a target end and the cost of shortening tasks"""
+    target_end: Optional[int] = Field(None, ge=0, description="Target project end in days from project start")
+    target_date: Optional[date] = Field(
+        None, description="Target end date, used when target_end is not given (default: latest target_completion_date)"
+    )
+    project_start: Optional[date] = Field(None, description="Day 0 for target_date (default: earliest start_date)")
+    tasks: List[CrashTaskLimit] = []
+    default_max_crash_fraction: float = Field(
+        0, ge=0, le=1, description="Share of its duration any task not listed may be shortened by"
+    )
+    default_cost_per_day: float = Field(1, ge=0)
+
+
+class TimelineZoom(str, Enum):
+    """Timeline bucket size: one Gantt column per day, week (from Monday) or month"""
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class TimelineBar(BaseModel):
+    """One task's bar; start_date and end_date are inclusive"""
+    id: UUID
+    name: str
+    status: TaskStatus
+    start_date: date
+    end_date: date
+    is_critical: Optional[bool] = None
+    slack: Optional[int] = None
+    parent_id: Optional[UUID] = None
+
+
+class TimelineBucket(BaseModel):
+    """
+    One column of the window. Bars are listed when few enough start here;
+    otherwise the column is summarized by the counts alone.
+    """
+    start: date
+    end: date
+    starting: int = Field(..., description="Bars whose first visible day is in this bucket")
+    active: int = Field(..., description="Bars overlapping this bucket")
+    by_status: Dict[str, int] = {}
+    critical: int = 0
+    summarized: bool = False
+    bars: List[TimelineBar] = []
+
+
+class TimelineOut(BaseModel):
+    """Gantt data for a date window at one zoom level"""
+    start: date
+    end: date
+    zoom: TimelineZoom
+    total: int = Field(..., description="Bars overlapping the window")
+    buckets: List[TimelineBucket]
+
+
+class BaselineCreate(BaseModel):
+    """Schema for taking a baseline of the current schedule"""
+    name: str = Field(..., min_length=1, max_length=255)
+    project_id: Optional[UUID] = Field(None, description="Only this project's tasks; all tasks if omitted")
+
+
+class BaselineOut(BaselineCreate):
+    """Schema for baseline response (without the snapshot itself)"""
+    id: UUID
+    task_count: int
+    project_end: int
+    critical_count: int
+    size_bytes: int
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,140 @@
+"""
+Seed script for large synthetic projects.
+Generates a parameterized task graph (see core/synthetic.py) and bulk-loads
+it with COPY, so production-scale data (1M+ tasks) loads in seconds.
+
+Run from Backend/ directory:
+    python seed_synthetic_data.py --tasks 100000 --shape layered --density 2
+    python seed_synthetic_data.py --tasks 1000000 --shape chain --replace
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from config import CPM_NOTIFY_CHANNEL
+from database import engine
+from core.cache import GRAPH_CACHE_KEY
+from core.schedule import refresh_schedule
+from core.synthetic import SHAPES, DURATION_DISTRIBUTIONS, generate_project, task_uuids
+
+
+class _CopyStream:
+    """File-like object feeding COPY FROM STDIN from a line generator without building the whole payload"""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = 1 << 20
+        while len(self._buffer) < size:
+            chunk = "".join(line for _, line in zip(range(10000), self._lines))
+            if not chunk:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _copy(cursor, table_and_columns: str, lines) -> None:
+    cursor.copy_expert(f"COPY {table_and_columns} FROM STDIN", _CopyStream(lines))
+
+
+def seed_synthetic_data(args) -> None:
+    start = time.perf_counter()
+    project = generate_project(
+        args.tasks,
+        shape=args.shape,
+        density=args.density,
+        duration_dist=args.durations,
+        min_duration=args.min_duration,
+        max_duration=args.max_duration,
+        max_buffer=args.max_buffer,
+        seed=args.seed,
+    )
+    durations, buffers, edges = project["durations"], project["buffers"], project["edges"]
+    ids = task_uuids(args.tasks, args.seed)
+    # Rows go in in primary-key order: appending to the right edge of the
+    # UUID index is several times faster than inserting at random positions
+    task_order = sorted(range(args.tasks), key=ids.__getitem__)
+    edge_ids = sorted(task_uuids(len(edges), args.seed + 1))
+    print(f"Generated {args.tasks} tasks / {len(edges)} dependencies "
+          f"({args.shape}, {args.durations}) in {time.perf_counter() - start:.2f}s")
+
+    # Earliest start of every task (indices are already in topological
+    # order and edges are sorted by successor), used for realistic dates
+    es = [0] * args.tasks
+    for p, s in edges:
+        finish = es[p] + durations[p] + buffers[p]
+        if finish > es[s]:
+            es[s] = finish
+
+    project_end = max((es[i] + durations[i] + buffers[i] for i in range(args.tasks)), default=0)
+    project_start = date.fromisoformat(args.start_date)
+    day = [(project_start + timedelta(days=d)).isoformat() for d in range(project_end + 1)]
+    prefix = args.name_prefix
+
+    def task_lines():
+        for i in task_order:
+            yield (f"{ids[i]}\t{prefix} {i}\t{durations[i]}\tnot_started\t{buffers[i]}\t"
+                   f"{day[es[i]]}\t{day[es[i] + durations[i] + buffers[i]]}\n")
+
+    def dependency_lines():
+        for edge_id, (p, s) in zip(edge_ids, edges):
+            yield f"{edge_id}\t{ids[s]}\t{ids[p]}\n"
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if args.replace:
+            print("Deleting existing tasks and dependencies...")
+            cursor.execute("TRUNCATE task_dependencies, tasks")
+
+        load_start = time.perf_counter()
+        _copy(cursor, "tasks (id, name, duration, status, buffer_time, start_date, target_completion_date)",
+              task_lines())
+        print(f"Copied tasks in {time.perf_counter() - load_start:.2f}s")
+
+        dep_start = time.perf_counter()
+        _copy(cursor, "task_dependencies (id, task_id, depends_on_task_id)", dependency_lines())
+        print(f"Copied dependencies in {time.perf_counter() - dep_start:.2f}s")
+
+        # Running API workers drop their cached CPM results on commit
+        cursor.execute("SELECT pg_notify(%s, %s)", (CPM_NOTIFY_CHANNEL, GRAPH_CACHE_KEY))
+        raw.commit()
+
+        cursor.execute("ANALYZE tasks")
+        cursor.execute("ANALYZE task_dependencies")
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    if not args.skip_schedule:
+        refresh_schedule()
+
+    print(f"\n✅ Seeded {args.tasks} tasks and {len(edges)} dependencies "
+          f"in {time.perf_counter() - start:.2f}s (project length {project_end} days)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000, help="number of tasks")
+    parser.add_argument("--shape", choices=SHAPES, default="layered", help="DAG shape")
+    parser.add_argument("--density", type=float, default=1.5, help="average predecessors per task")
+    parser.add_argument("--durations", choices=DURATION_DISTRIBUTIONS, default="uniform",
+                        help="duration distribution")
+    parser.add_argument("--min-duration", type=int, default=1)
+    parser.add_argument("--max-duration", type=int, default=20)
+    parser.add_argument("--max-buffer", type=int, default=0, help="buffer time drawn from 0..max-buffer")
+    parser.add_argument("--start-date", default=date.today().isoformat(), help="project start (YYYY-MM-DD)")
+    parser.add_argument("--name-prefix", default="Synthetic task")
+    parser.add_argument("--seed", type=int, default=0, help="same seed = same project (including UUIDs)")
+    parser.add_argument("--replace", action="store_true", help="delete all existing tasks and dependencies first")
+    parser.add_argument("--skip-schedule", action="store_true",
+                        help="don't fill the stored schedule columns (the API does it on startup)")
+    seed_synthetic_data(parser.parse_args())
@@ -0,0 +1,130 @@
+"""
+Concurrency stress test for dependency creation
+Hammers crud.create_dependency from many threads against a local Postgres
+and checks that the resulting graph is still acyclic and duplicate-free.
+
+Run from Backend/ directory (uses DATABASE_URL, creates and removes its own tasks):
+    python stress_dependencies.py --tasks 30 --workers 12 --attempts 400
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from fastapi import HTTPException
+
+from database import SessionLocal
+from models import Task, TaskDependency
+from schemas import DependencyCreate
+from crud import create_dependency
+from cpm import calculate_cpm
+
+
+def run_stress(num_tasks: int, workers: int, attempts: int, seed: int) -> bool:
+    """Returns True if the graph is still a DAG with no duplicate edges"""
+    run_tag = f"stress-{uuid.uuid4().hex[:8]}"
+    rng = random.Random(seed)
+
+    db = SessionLocal()
+    task_ids = [uuid.uuid4() for _ in range(num_tasks)]
+    db.add_all([Task(id=tid, name=f"{run_tag}-{i}", duration=1) for i, tid in enumerate(task_ids)])
+    db.commit()
+    print(f"Created {num_tasks} tasks tagged {run_tag}")
+
+    # Every pair is attempted in both directions by different workers at the
+    # same time, which is exactly what races without the graph lock
+    pairs = []
+    for _ in range(attempts // 2):
+        a, b = rng.sample(task_ids, 2)
+        pairs.append((a, b))
+        pairs.append((b, a))
+    rng.shuffle(pairs)
+    chunks = [pairs[i::workers] for i in range(workers)]
+
+    outcomes = Counter()
+    outcomes_lock = threading.Lock()
+    barrier = threading.Barrier(workers)
+
+    def worker(chunk):
+        session = SessionLocal()  # scoped_session: one session per thread
+        barrier.wait()
+        try:
+            for task_id, depends_on_id in chunk:
+                try:
+                    create_dependency(
+                        session,
+                        DependencyCreate(task_id=task_id, depends_on_task_id=depends_on_id),
+                    )
+                    result = "created"
+                except HTTPException as e:
+                    result = e.detail
+                    session.rollback()
+                with outcomes_lock:
+                    outcomes[result] += 1
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    # crud prints a banner per request; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{len(pairs)} attempts from {workers} workers in {elapsed:.2f}s "
+          f"({len(pairs) / elapsed:.0f}/s)")
+    for result, count in outcomes.most_common():
+        print(f"   {count:6d}  {result}")
+
+    # Verify the graph the stress run produced
+    id_set = set(task_ids)
+    edges = [
+        (d.task_id, d.depends_on_task_id)
+        for d in db.query(TaskDependency).filter(TaskDependency.task_id.in_(task_ids)).all()
+        if d.depends_on_task_id in id_set
+    ]
+    ok = True
+
+    duplicates = [edge for edge, count in Counter(edges).items() if count > 1]
+    if duplicates:
+        ok = False
+        print(f"\n❌ {len(duplicates)} duplicate dependencies")
+
+    try:
+        calculate_cpm(
+            [{"id": tid, "duration": 1, "buffer_time": 0} for tid in task_ids],
+            [{"task_id": a, "depends_on_task_id": b} for a, b in edges],
+        )
+    except ValueError as e:
+        ok = False
+        print(f"\n❌ {str(e)}")
+
+    # Clean up
+    db.query(TaskDependency).filter(TaskDependency.task_id.in_(task_ids)).delete(synchronize_session=False)
+    db.query(Task).filter(Task.id.in_(task_ids)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+    if ok:
+        print(f"\n✅ {len(edges)} edges, no duplicates, no cycles")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=30, help="tasks in the stress graph (fewer = more conflicts)")
+    parser.add_argument("--workers", type=int, default=12, help="concurrent threads (each holds a DB connection)")
+    parser.add_argument("--attempts", type=int, default=400, help="dependency create attempts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.exit(0 if run_stress(args.tasks, args.workers, args.attempts, args.seed) else 1)
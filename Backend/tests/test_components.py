@@ -0,0 +1,65 @@
+"""
+Per-component CPM merged back together must equal CPM over the whole
+graph. No database is used; config only needs DATABASE_URL to be set.
+
+Run from Backend/ directory:
+    python -m unittest discover -s tests
+"""
+
+import os
+import random
+import unittest
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+
+from cpm import calculate_cpm
+from core.components import CACHE_MIN_TASKS, calculate_cpm_by_component, find_components
+from test_cpm import random_graph
+
+
+def _disjoint_graph(rng: random.Random, sizes, mixed: float):
+    tasks, dependencies = [], []
+    for c, n in enumerate(sizes):
+        t, d = random_graph(rng, n, rng.randint(0, 2 * n), mixed)
+        rename = {task["id"]: f"c{c}-{task['id']}" for task in t}
+        tasks += [dict(task, id=rename[task["id"]]) for task in t]
+        dependencies += [
+            dict(dep, task_id=rename[dep["task_id"]], depends_on_task_id=rename[dep["depends_on_task_id"]])
+            for dep in d
+        ]
+    rng.shuffle(tasks)
+    return tasks, dependencies
+
+
+class ComponentMergeTest(unittest.TestCase):
+    def _assert_same(self, tasks, dependencies):
+        whole = calculate_cpm(tasks, dependencies)
+        merged = calculate_cpm_by_component(tasks, dependencies)
+        for key in ("ES", "EF", "LS", "LF", "slack", "free_float", "independent_float", "drag", "project_end"):
+            self.assertEqual(merged[key], whole[key], key)
+        self.assertEqual(sorted(merged["critical_path"]), sorted(whole["critical_path"]))
+        self.assertEqual(sum(c["tasks"] for c in merged["components"]), len(tasks))
+
+    def test_matches_whole_graph_cpm(self):
+        rng = random.Random(0)
+        for mixed in (0.0, 0.3, 1.0):
+            for _ in range(100):
+                sizes = [rng.randint(1, 8) for _ in range(rng.randint(1, 5))]
+                self._assert_same(*_disjoint_graph(rng, sizes, mixed))
+
+    def test_matches_with_cached_components(self):
+        # Components large enough for the result cache, computed twice
+        rng = random.Random(1)
+        for mixed in (0.0, 1.0):
+            tasks, dependencies = _disjoint_graph(rng, [CACHE_MIN_TASKS, CACHE_MIN_TASKS + 10, 5], mixed)
+            self._assert_same(tasks, dependencies)
+            self._assert_same(tasks, dependencies)
+
+    def test_components_are_weakly_connected(self):
+        edges = [("a", "b", "FS", 0), ("c", "b", "SS", 1), ("d", "e", "FS", 0)]
+        groups = find_components(["a", "b", "c", "d", "e", "f"], edges)
+        self.assertEqual(sorted(sorted(g) for g in groups), [["a", "b", "c"], ["d", "e"], ["f"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
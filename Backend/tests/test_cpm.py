@@ -0,0 +1,165 @@
+"""
+CPM engine on small random graphs with every link type and lag, checked
+against a plain longest-path relaxation, and floats and drag against
+delaying or removing each task by brute force.
+
+Run from Backend/ directory:
+    python -m unittest discover -s tests
+"""
+
+import random
+import unittest
+from typing import Dict, List, Tuple
+
+from cpm import DEPENDENCY_TYPES, calculate_cpm, dependency_offset
+
+
+def random_graph(rng: random.Random, n: int, m: int, mixed: float = 0.5) -> Tuple[List[Dict], List[Dict]]:
+    """A random DAG: edges only run forward in a shuffled order"""
+    order = [f"t{i}" for i in range(n)]
+    rng.shuffle(order)
+    tasks = [{"id": tid, "duration": rng.randint(0, 6), "buffer_time": rng.choice((0, 0, 1))} for tid in order]
+    dependencies = []
+    for _ in range(m if n > 1 else 0):
+        a, b = sorted(rng.sample(range(n), 2))
+        dep = {"task_id": order[b], "depends_on_task_id": order[a]}
+        if rng.random() < mixed:
+            dep["type"] = rng.choice(DEPENDENCY_TYPES)
+            dep["lag"] = rng.randint(-3, 3)
+        dependencies.append(dep)
+    return tasks, dependencies
+
+
+def _links(tasks: List[Dict], dependencies: List[Dict]) -> Tuple[Dict, List[Tuple[str, str, int]]]:
+    dur = {t["id"]: t["duration"] + t["buffer_time"] for t in tasks}
+    links = [
+        (d["depends_on_task_id"], d["task_id"], dependency_offset(
+            d.get("type") or "FS", d.get("lag") or 0, dur[d["depends_on_task_id"]], dur[d["task_id"]],
+        ))
+        for d in dependencies
+    ]
+    return dur, links
+
+
+def relaxed_schedule(tasks: List[Dict], dependencies: List[Dict],
+                     earliest: Dict[str, int] = None) -> Tuple[Dict, Dict, int]:
+    """
+    ES and LS by repeated relaxation of ES[succ] >= ES[pred] + offset.
+    earliest holds extra lower bounds on ES, to delay a task.
+    """
+    dur, links = _links(tasks, dependencies)
+    ES = dict.fromkeys(dur, 0)
+    ES.update(earliest or {})
+    for _ in dur:
+        for u, v, offset in links:
+            ES[v] = max(ES[v], ES[u] + offset)
+    end = max(ES[t] + dur[t] for t in dur)
+    LS = {t: end - dur[t] for t in dur}
+    for _ in dur:
+        for u, v, offset in links:
+            LS[u] = min(LS[u], LS[v] - offset)
+    return ES, LS, end
+
+
+class CalculateCpmTest(unittest.TestCase):
+    def test_matches_longest_path_relaxation(self):
+        rng = random.Random(0)
+        for mixed in (0.0, 0.3, 1.0):
+            for _ in range(150):
+                tasks, dependencies = random_graph(rng, rng.randint(1, 12), rng.randint(0, 25), mixed)
+                result = calculate_cpm(tasks, dependencies)
+                ES, LS, end = relaxed_schedule(tasks, dependencies)
+                self.assertEqual(result["project_end"], end)
+                self.assertEqual(result["ES"], ES)
+                self.assertEqual(result["LS"], LS)
+                for t in tasks:
+                    d = t["duration"] + t["buffer_time"]
+                    self.assertEqual(result["EF"][t["id"]], ES[t["id"]] + d)
+                    self.assertEqual(result["LF"][t["id"]], LS[t["id"]] + d)
+                    self.assertEqual(result["slack"][t["id"]], LS[t["id"]] - ES[t["id"]])
+                self.assertEqual(
+                    set(result["critical_path"]),
+                    {t["id"] for t in tasks if LS[t["id"]] == ES[t["id"]]},
+                )
+
+    def test_link_types_and_lag(self):
+        tasks = [{"id": "a", "duration": 4}, {"id": "b", "duration": 2}]
+        expected_es = {
+            ("FS", 0): 4, ("FS", 1): 5, ("FS", -2): 2,
+            ("SS", 0): 0, ("SS", 3): 3,
+            ("FF", 0): 2, ("FF", 2): 4,
+            ("SF", 0): 0, ("SF", 3): 1,
+        }
+        for (kind, lag), es in expected_es.items():
+            dependencies = [{"task_id": "b", "depends_on_task_id": "a", "type": kind, "lag": lag}]
+            self.assertEqual(calculate_cpm(tasks, dependencies)["ES"]["b"], es, (kind, lag))
+
+    def test_lead_never_starts_before_day_zero(self):
+        tasks = [{"id": "a", "duration": 1}, {"id": "b", "duration": 2}]
+        dependencies = [{"task_id": "b", "depends_on_task_id": "a", "type": "SS", "lag": -5}]
+        self.assertEqual(calculate_cpm(tasks, dependencies)["ES"]["b"], 0)
+
+    def test_rejects_cycles_and_unknown_types(self):
+        tasks = [{"id": "a", "duration": 1}, {"id": "b", "duration": 1}]
+        with self.assertRaises(ValueError):
+            calculate_cpm(tasks, [
+                {"task_id": "b", "depends_on_task_id": "a"},
+                {"task_id": "a", "depends_on_task_id": "b", "type": "SS"},
+            ])
+        with self.assertRaises(ValueError):
+            calculate_cpm(tasks, [{"task_id": "b", "depends_on_task_id": "a", "type": "XX"}])
+
+
+class FloatAndDragTest(unittest.TestCase):
+    def test_free_float_is_the_longest_delay_that_moves_nothing_else(self):
+        rng = random.Random(1)
+        for mixed in (0.0, 0.3, 1.0):
+            for _ in range(100):
+                tasks, dependencies = random_graph(rng, rng.randint(1, 10), rng.randint(0, 20), mixed)
+                result = calculate_cpm(tasks, dependencies)
+                ES, _, end = relaxed_schedule(tasks, dependencies)
+                for tid in ES:
+                    delay = 0
+                    while True:
+                        es, _, e = relaxed_schedule(tasks, dependencies, {tid: ES[tid] + delay + 1})
+                        if e != end or any(es[o] != ES[o] for o in ES if o != tid):
+                            break
+                        delay += 1
+                    self.assertEqual(result["free_float"][tid], delay, (tasks, dependencies, tid))
+
+    def test_independent_float_fits_between_late_predecessors_and_early_successors(self):
+        rng = random.Random(2)
+        for mixed in (0.0, 0.3, 1.0):
+            for _ in range(100):
+                tasks, dependencies = random_graph(rng, rng.randint(1, 10), rng.randint(0, 20), mixed)
+                result = calculate_cpm(tasks, dependencies)
+                ES, LS, end = relaxed_schedule(tasks, dependencies)
+                dur, links = _links(tasks, dependencies)
+                for tid in ES:
+                    first = max([0] + [LS[u] + offset for u, v, offset in links if v == tid])
+                    last = min([end - dur[tid]] + [ES[v] - offset for u, v, offset in links if u == tid])
+                    self.assertEqual(result["independent_float"][tid], max(0, last - first), tid)
+
+    def test_drag_matches_removing_each_duration(self):
+        rng = random.Random(3)
+        for mixed in (0.0, 0.3, 1.0):
+            for _ in range(200):
+                tasks, dependencies = random_graph(rng, rng.randint(1, 10), rng.randint(0, 20), mixed)
+                result = calculate_cpm(tasks, dependencies)
+                for task in tasks:
+                    tid = task["id"]
+                    shortened = [dict(t, duration=0, buffer_time=0) if t is task else t for t in tasks]
+                    saved = result["project_end"] - relaxed_schedule(shortened, dependencies)[2]
+                    if result["slack"][tid] == 0 and task["duration"] + task["buffer_time"] > 0:
+                        self.assertEqual(result["drag"][tid], saved, (tasks, dependencies, tid))
+                    else:
+                        # No drag off the critical path; shortening such a
+                        # task can only delay the project (SS/FF/SF links)
+                        self.assertEqual(result["drag"][tid], 0)
+                        self.assertLessEqual(saved, 0)
+                        if not mixed:
+                            self.assertEqual(saved, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
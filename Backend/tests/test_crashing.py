@@ -0,0 +1,112 @@
+"""
+Schedule crashing on small random graphs, checked against exhaustive
+search over every combination of crash days.
+
+Run from Backend/ directory:
+    python -m unittest discover -s tests
+"""
+
+import itertools
+import random
+import unittest
+from typing import List, Optional, Sequence, Tuple
+
+from core.crashing import crash_project, crash_schedule
+from cpm import calculate_cpm
+
+
+def _end(durations: Sequence[int], edges: Sequence[Tuple[int, int]]) -> int:
+    ES = [0] * len(durations)
+    for _ in durations:
+        for a, b in edges:
+            ES[b] = max(ES[b], ES[a] + durations[a])
+    return max((s + d for s, d in zip(ES, durations)), default=0)
+
+
+def _cheapest(durations: List[int], edges, target: int, max_crash: List[int], cost: List[int]) -> Optional[int]:
+    """Lowest total cost that ends by target, or None if no crash does"""
+    best = None
+    for crash in itertools.product(*(range(m + 1) for m in max_crash)):
+        if _end([d - c for d, c in zip(durations, crash)], edges) <= target:
+            total = sum(c * k for c, k in zip(crash, cost))
+            best = total if best is None else min(best, total)
+    return best
+
+
+def _random_case(rng: random.Random):
+    n = rng.randint(1, 6)
+    edges = sorted({tuple(sorted(rng.sample(range(n), 2))) for _ in range(rng.randint(0, 9))}) if n > 1 else []
+    durations = [rng.randint(0, 6) for _ in range(n)]
+    max_crash = [rng.randint(0, min(3, d)) for d in durations]
+    cost = [rng.randint(1, 5) for _ in range(n)]
+    end = _end(durations, edges)
+    return durations, edges, max_crash, cost, rng.randint(max(0, end - 8), end)
+
+
+class CrashScheduleTest(unittest.TestCase):
+    def test_matches_exhaustive_search(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            durations, edges, max_crash, cost, target = _random_case(rng)
+            result = crash_schedule(durations, edges, target, max_crash, cost)
+            best = _cheapest(durations, edges, target, max_crash, cost)
+
+            self.assertEqual(result["feasible"], best is not None)
+            crashed = [d - result["crash"].get(v, 0) for v, d in enumerate(durations)]
+            self.assertEqual(_end(crashed, edges), result["achieved_end"])
+            self.assertTrue(all(0 <= days <= max_crash[v] for v, days in result["crash"].items()))
+            if best is not None:
+                self.assertEqual(result["total_cost"], best, (durations, edges, max_crash, cost, target))
+
+    def test_infeasible_target_crashes_as_far_as_possible(self):
+        # a -> b, both can lose one day: 5 + 3 can get down to 6, not 4
+        result = crash_schedule([5, 3], [(0, 1)], 4, [1, 1], [1, 2])
+        self.assertFalse(result["feasible"])
+        self.assertEqual(result["achieved_end"], 6)
+
+
+class CrashProjectTest(unittest.TestCase):
+    def test_lags_are_kept_and_the_target_is_met(self):
+        rng = random.Random(1)
+        for _ in range(150):
+            durations, edges, max_crash, cost, _ = _random_case(rng)
+            tasks = [{"id": f"t{v}", "duration": d, "buffer_time": 0} for v, d in enumerate(durations)]
+            dependencies = [
+                {"task_id": f"t{b}", "depends_on_task_id": f"t{a}", "lag": rng.choice((0, 0, 1, 2))}
+                for a, b in edges
+            ]
+            end = calculate_cpm(tasks, dependencies)["project_end"]
+            target = rng.randint(max(0, end - 6), end)
+            limits = {f"t{v}": (max_crash[v], cost[v]) for v in range(len(tasks))}
+            result = crash_project(tasks, dependencies, target, limits)
+
+            shortened = {r["task_id"]: r["duration"] for r in result["reductions"]}
+            crashed = [dict(t, duration=shortened.get(t["id"], t["duration"])) for t in tasks]
+            self.assertEqual(calculate_cpm(crashed, dependencies)["project_end"], result["achieved_end"])
+            self.assertEqual(result["total_cost"], sum(r["cost"] for r in result["reductions"]))
+
+            # Same optimum as the exhaustive search with each lag as a fixed task
+            lagged_durations, lagged_edges = list(durations), []
+            lagged_max, lagged_cost = list(max_crash), list(cost)
+            for (a, b), dep in zip(edges, dependencies):
+                if dep["lag"]:
+                    lagged_durations.append(dep["lag"])
+                    lagged_max.append(0)
+                    lagged_cost.append(0)
+                    lagged_edges += [(a, len(lagged_durations) - 1), (len(lagged_durations) - 1, b)]
+                else:
+                    lagged_edges.append((a, b))
+            best = _cheapest(lagged_durations, lagged_edges, target, lagged_max, lagged_cost)
+            self.assertEqual(result["feasible"], best is not None)
+            if best is not None:
+                self.assertEqual(result["total_cost"], best)
+
+    def test_rejects_other_link_types_and_leads(self):
+        tasks = [{"id": "a", "duration": 3}, {"id": "b", "duration": 3}]
+        for dep in ({"type": "SS"}, {"type": "FS", "lag": -1}):
+            with self.assertRaises(ValueError):
+                crash_project(tasks, [dict(dep, task_id="b", depends_on_task_id="a")], 4, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
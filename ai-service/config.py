@@ -0,0 +1,31 @@
+"""
+Configuration module
+Loads environment variables
+"""
+
+import os
+from dotenv import load_dotenv
+
+# Load .env file
+load_dotenv()
+
+_SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Built-in project/task template library (JSON, see data/templates.json)
+TEMPLATE_LIBRARY = os.getenv("TEMPLATE_LIBRARY", os.path.join(_SERVICE_DIR, "data", "templates.json"))
+# Vector index files; one subdirectory per library version
+TEMPLATE_INDEX_DIR = os.getenv("TEMPLATE_INDEX_DIR", os.path.join(_SERVICE_DIR, "data", "index"))
+
+# Width of the hashed embeddings. Changing it requires rebuilding the index.
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", 256))
+
+# Approximate (IVF) search: lists probed per query, and the corpus size
+# below which an exact scan is used even when an IVF index exists
+INDEX_NPROBE = int(os.getenv("INDEX_NPROBE", 16))
+INDEX_EXACT_MAX = int(os.getenv("INDEX_EXACT_MAX", 50000))
+
+# Generated plan cache: in-memory LRU entries, and a SQLite file that
+# survives restarts (empty path disables it) capped at PLAN_CACHE_DISK_MAX rows
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", 1024))
+PLAN_CACHE_PATH = os.getenv("PLAN_CACHE_PATH", os.path.join(TEMPLATE_INDEX_DIR, "plan_cache.sqlite3"))
+PLAN_CACHE_DISK_MAX = int(os.getenv("PLAN_CACHE_DISK_MAX", 100000))
@@ -1,5 +1,3 @@
 """
 Core AI Logic
 """
-
-# TODO: Add RAG and vector search logic
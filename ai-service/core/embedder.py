@@ -0,0 +1,88 @@
+"""
+Local text embedder
+Signed feature hashing of words, word pairs and character n-grams into a
+fixed-width vector. No model download or network access, and the same
+text always maps to the same vector in every process (crc32, not the
+salted built-in hash).
+"""
+
+import math
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from config import EMBEDDING_DIM
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in into is it its of on or our "
+    "plan project that the their this to we will with want need".split()
+)
+
+# Relative weight of each feature family
+WORD_WEIGHT = 1.0
+PAIR_WEIGHT = 0.5
+NGRAM_WEIGHT = 0.3
+NGRAM = 4
+
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping so "renovations" and "renovate" share features
+    for suffix in ("ations", "ation", "ings", "ate", "ing", "ies", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=1 << 18)
+def _slot(feature: str) -> int:
+    # Feature strings repeat heavily across a corpus; hashing dominates otherwise
+    return zlib.crc32(feature.encode())
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(w) for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-features embedder producing L2-normalized float32 rows"""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> Dict[str, float]:
+        words = tokenize(text)
+        features: Dict[str, float] = {}
+        for w in words:
+            features["w:" + w] = features.get("w:" + w, 0.0) + WORD_WEIGHT
+            padded = f"<{w}>"
+            for i in range(max(len(padded) - NGRAM + 1, 1)):
+                key = "c:" + padded[i:i + NGRAM]
+                features[key] = features.get(key, 0.0) + NGRAM_WEIGHT
+        for a, b in zip(words, words[1:]):
+            key = f"p:{a} {b}"
+            features[key] = features.get(key, 0.0) + PAIR_WEIGHT
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed a batch of texts into an (n, dim) float32 matrix"""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        dim = self.dim
+        for row, text in enumerate(texts):
+            vec = out[row]
+            for feature, weight in self._features(text).items():
+                h = _slot(feature)
+                # Low bits pick the slot, the top bit the sign, so collisions
+                # cancel out on average instead of piling up
+                value = math.log1p(weight)
+                vec[h % dim] += -value if h & 0x80000000 else value
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
@@ -0,0 +1,245 @@
+"""
+Dependency graph analysis for loop fixing
+Strongly connected components (iterative Tarjan) and a greedy feedback
+arc set (Eades-Lin-Smyth), both linear in the size of the graph and
+deterministic for a given input order.
+"""
+
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+# Edges are (depends_on, task): the prerequisite points at the task that waits on it
+Edge = Tuple[str, str]
+
+
+class IndexedGraph:
+    """Task ids mapped to 0..n-1 with forward adjacency lists (duplicate edges dropped)"""
+
+    def __init__(self, edges: Sequence[Edge]):
+        index: Dict[str, int] = {}
+        self.edges: List[Tuple[int, int]] = [
+            (index.setdefault(u, len(index)), index.setdefault(v, len(index)))
+            for u, v in dict.fromkeys(edges)
+        ]
+        self.index = index
+        self.ids: List[str] = list(index)
+
+        self.succ: List[List[int]] = [[] for _ in self.ids]
+        for a, b in self.edges:
+            self.succ[a].append(b)
+
+
+def strongly_connected_components(graph: IndexedGraph) -> List[List[int]]:
+    """
+    Tarjan's algorithm without recursion (deep chains would overflow the
+    Python stack). Returns only components that contain a cycle: two or
+    more nodes, or a single node with a self-loop.
+    """
+    n = len(graph.ids)
+    succ = graph.succ
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    components = []
+    counter = 0
+
+    position = [0] * n  # next successor to visit, per node on the call stack
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        call = [root]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while call:
+            v = call[-1]
+            successors = succ[v]
+            i = position[v]
+            if i < len(successors):
+                position[v] = i + 1
+                w = successors[i]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    call.append(w)
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            # All successors done: v is finished
+            call.pop()
+            if call:
+                parent = call[-1]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                if len(component) > 1 or v in succ[v]:
+                    component.reverse()
+                    components.append(component)
+
+    return components
+
+
+def feedback_arc_set(graph: IndexedGraph, component: List[int]) -> List[Tuple[int, int]]:
+    """
+    Edges inside one component whose removal leaves it acyclic.
+
+    Eades-Lin-Smyth: repeatedly peel sinks to the back and sources to the
+    front of an ordering; when neither exists, move the node with the
+    largest out-degree minus in-degree to the front. Edges pointing
+    backwards in the final ordering form the set. Degree buckets make it
+    O(V + E); stale bucket entries are skipped lazily.
+    """
+    # Work on local indices 0..n-1 so state fits in flat lists
+    n = len(component)
+    local = {v: i for i, v in enumerate(component)}
+    succ = [[local[w] for w in graph.succ[v] if w in local] for v in component]
+    pred: List[List[int]] = [[] for _ in range(n)]
+    for i in range(n):
+        for j in succ[i]:
+            pred[j].append(i)
+
+    out_deg = [len(s) for s in succ]
+    in_deg = [len(p) for p in pred]
+    removed = [False] * n
+
+    SINK, SOURCE = -1, -2
+    key = [0] * n  # SINK, SOURCE or bucket number (delta + n)
+    sinks: List[int] = []
+    sources: List[int] = []
+    buckets: Dict[int, List[int]] = {}  # deltas cluster near zero: don't allocate all 2n + 1
+    top = -1  # highest bucket that may hold a live entry
+
+    def place(v: int) -> None:
+        nonlocal top
+        if out_deg[v] == 0:
+            key[v] = SINK
+            sinks.append(v)
+        elif in_deg[v] == 0:
+            key[v] = SOURCE
+            sources.append(v)
+        else:
+            bucket = out_deg[v] - in_deg[v] + n
+            key[v] = bucket
+            if bucket in buckets:
+                buckets[bucket].append(v)
+            else:
+                buckets[bucket] = [v]
+            if bucket > top:
+                top = bucket
+
+    def take(stack: List[int], expected: int) -> int:
+        while stack:
+            v = stack.pop()
+            if not removed[v] and key[v] == expected:
+                return v
+        return -1
+
+    def remove(v: int) -> None:
+        removed[v] = True
+        for w in succ[v]:
+            if not removed[w]:
+                in_deg[w] -= 1
+                place(w)
+        for u in pred[v]:
+            if not removed[u]:
+                out_deg[u] -= 1
+                place(u)
+
+    for v in range(n):
+        place(v)
+
+    front: List[int] = []
+    back: List[int] = []
+    for _ in range(n):
+        v = take(sinks, SINK)
+        if v != -1:
+            back.append(v)
+            remove(v)
+            continue
+        v = take(sources, SOURCE)
+        if v == -1:
+            while top >= 0:
+                v = take(buckets.get(top, []), top)
+                if v != -1:
+                    break
+                top -= 1
+        front.append(v)
+        remove(v)
+
+    order = front + back[::-1]
+    position = [0] * n
+    for i, v in enumerate(order):
+        position[v] = i
+    return [
+        (component[v], component[w])
+        for v in order
+        for w in succ[v]
+        if position[w] <= position[v]
+    ]
+
+
+def shortest_cycle_through(graph: IndexedGraph, component: List[int], start: int) -> List[int]:
+    """One concrete loop for display: BFS from start back to itself within the component"""
+    members = set(component)
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        v = queue.popleft()
+        for w in graph.succ[v]:
+            if w == start:
+                path = [v]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                return path[::-1] + [start]
+            if w in members and w not in parent:
+                parent[w] = v
+                queue.append(w)
+    return [start]
+
+
+def analyze_loops(edges: Sequence[Edge]) -> Dict:
+    """
+    Find every dependency loop and the edges to cut.
+
+    Returns:
+        {
+            "tasks": int, "dependencies": int,
+            "loops": [{"tasks": [...], "example": [a, b, ..., a], "dependencies": int}],
+            "remove": [(depends_on, task), ...],
+        }
+    """
+    graph = IndexedGraph(edges)
+    ids = graph.ids
+    loops = []
+    remove = []
+    for component in strongly_connected_components(graph):
+        members = set(component)
+        internal = sum(1 for v in component for w in graph.succ[v] if w in members)
+        cycle = shortest_cycle_through(graph, component, min(component, key=ids.__getitem__))
+        loops.append({
+            "tasks": [ids[v] for v in component],
+            "example": [ids[v] for v in cycle],
+            "dependencies": internal,
+        })
+        remove.extend((ids[v], ids[w]) for v, w in feedback_arc_set(graph, component))
+
+    return {
+        "tasks": len(ids),
+        "dependencies": len(graph.edges),
+        "loops": loops,
+        "remove": remove,
+    }
@@ -0,0 +1,162 @@
+"""
+Generated plan cache
+Plans are a pure function of the prompt's tokens and the template library,
+so they are cached under (normalized prompt, template version): an
+in-memory LRU in front of a SQLite file that survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from config import EMBEDDING_DIM, PLAN_CACHE_DISK_MAX, PLAN_CACHE_PATH, PLAN_CACHE_SIZE
+from core.embedder import tokenize
+
+# Disk writes between trims of stale and least recently used rows
+PRUNE_EVERY = 256
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    The exact tokens the embedder sees: case, punctuation, spacing,
+    stopwords and plural/verb suffixes don't change the plan, so
+    "Open a cafe!" and "open  cafes" share one entry.
+    """
+    return " ".join(tokenize(prompt))
+
+
+def cache_key(prompt: str, version: str) -> str:
+    raw = f"{version}\0{EMBEDDING_DIM}\0{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class PlanCache:
+    def __init__(self, size: int = PLAN_CACHE_SIZE, path: str = PLAN_CACHE_PATH,
+                 disk_max: int = PLAN_CACHE_DISK_MAX):
+        self.size = size
+        self.disk_max = disk_max
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plans ("
+                "key TEXT PRIMARY KEY, version TEXT NOT NULL, plan TEXT NOT NULL, used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS plans_used ON plans (used)")
+        self._disk_lock = threading.Lock()
+        self._writes = 0
+
+    # ==================== STORAGE ====================
+
+    def _remember(self, key: str, plan: Dict) -> None:
+        # Caller holds self._lock
+        self._memory[key] = plan
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.size:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Dict]:
+        if self._db is None:
+            return None
+        with self._disk_lock:
+            row = self._db.execute("SELECT plan FROM plans WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE plans SET used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def _disk_put(self, key: str, version: str, plan: Dict) -> None:
+        if self._db is None:
+            return
+        with self._disk_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO plans (key, version, plan, used) VALUES (?, ?, ?, ?)",
+                (key, version, json.dumps(plan, separators=(",", ":")), time.time()),
+            )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 1:
+                # Plans for older libraries can never be hit again
+                self._db.execute("DELETE FROM plans WHERE version != ?", (version,))
+                self._db.execute(
+                    "DELETE FROM plans WHERE key IN "
+                    "(SELECT key FROM plans ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_max,),
+                )
+
+    # ==================== LOOKUP ====================
+
+    def get_or_compute(self, prompt: str, version: str, compute: Callable[[], Dict]) -> Tuple[Dict, bool]:
+        """
+        Cached plan for prompt, or compute() stored for next time.
+
+        Returns (plan, cached). Concurrent misses on the same key wait for
+        the first one instead of generating the plan again.
+        """
+        key = cache_key(prompt, version)
+        while True:
+            with self._lock:
+                plan = self._memory.get(key)
+                if plan is not None:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return plan, True
+                waiting = self._inflight.get(key)
+                if waiting is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            waiting.wait()
+
+        try:
+            plan = self._disk_get(key)
+            if plan is not None:
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                    self._remember(key, plan)
+                return plan, True
+
+            plan = compute()
+            self._disk_put(key, version, plan)
+            with self._lock:
+                self._stats["misses"] += 1
+                self._remember(key, plan)
+            return plan, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["memory_capacity"] = self.size
+        stats["disk_entries"] = 0
+        if self._db is not None:
+            with self._disk_lock:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+        return stats
+
+
+_cache: Optional[PlanCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> PlanCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PlanCache()
+    return _cache
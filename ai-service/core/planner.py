@@ -0,0 +1,66 @@
+"""
+Plan generation from retrieved templates
+The closest project template supplies the tasks and dependencies; tasks
+from other templates that match the prompt are offered as additions.
+"""
+
+from typing import Dict
+
+from core.templates import search_templates, template_version
+
+# Task suggestions below this similarity are mostly noise
+MIN_SUGGESTION_SCORE = 0.2
+
+
+def generate_plan(prompt: str, alternatives: int = 3, suggestions: int = 5) -> Dict:
+    """
+    Build a plan for prompt.
+
+    Returns:
+        {
+            "template": {"id", "name", "score"},
+            "tasks": [...], "dependencies": [{"task", "depends_on"}, ...],
+            "alternatives": [{"id", "name", "score"}, ...],
+            "suggested_tasks": [{..task, "template_id", "template_name", "score"}, ...],
+            "template_version": str,
+        }
+
+    Raises:
+        LookupError: If the template library is empty
+    """
+    projects = search_templates(prompt, k=alternatives + 1, kind="project")
+    if not projects:
+        raise LookupError("No plan templates are indexed")
+
+    best = projects[0]
+    template = best["template"]
+    chosen = {t["name"].lower() for t in template["tasks"]}
+
+    suggested = []
+    for hit in search_templates(prompt, k=suggestions * 4, kind="task"):
+        task = hit["task"]
+        if (hit["template_id"] == template["id"] or hit["score"] < MIN_SUGGESTION_SCORE
+                or task["name"].lower() in chosen):
+            continue
+        chosen.add(task["name"].lower())
+        suggested.append({
+            **task,
+            "template_id": hit["template_id"],
+            "template_name": hit["template_name"],
+            "score": hit["score"],
+        })
+        if len(suggested) == suggestions:
+            break
+
+    return {
+        "template": _match(best),
+        "tasks": template["tasks"],
+        "dependencies": template["dependencies"],
+        "alternatives": [_match(hit) for hit in projects[1:]],
+        "suggested_tasks": suggested,
+        "template_version": template_version(),
+    }
+
+
+def _match(hit: Dict) -> Dict:
+    return {"id": hit["template"]["id"], "name": hit["template"]["name"], "score": hit["score"]}
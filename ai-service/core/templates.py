@@ -0,0 +1,147 @@
+"""
+Plan template library and retrieval
+Every project template and every task inside one is embedded and stored
+in a VectorIndex, one index per kind so a search for projects never has to
+filter past tasks. The indexes live in a directory named after the library
+version, so editing data/templates.json builds fresh ones instead of
+mixing vectors from two libraries.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import EMBEDDING_DIM, TEMPLATE_INDEX_DIR, TEMPLATE_LIBRARY
+from core.embedder import HashingEmbedder
+from core.vector_index import VectorIndex
+
+# Texts embedded per batch while indexing
+EMBED_BATCH = 10000
+
+KINDS = ("project", "task")
+
+_lock = threading.Lock()
+_state: Dict = {"stamp": None, "library": None, "version": None, "indexes": None}
+_embedder = HashingEmbedder(EMBEDDING_DIM)
+
+
+def project_text(template: Dict) -> str:
+    return ". ".join([
+        template["name"],
+        template.get("description", ""),
+        ", ".join(template.get("tags", [])),
+        ", ".join(t["name"] for t in template.get("tasks", [])),
+    ])
+
+
+def task_text(template: Dict, task: Dict) -> str:
+    return ". ".join([task["name"], task.get("description", ""), template["name"]])
+
+
+def template_entries(templates: Iterable[Dict]) -> Iterable[Tuple[str, Dict]]:
+    """(text, payload) for each project template and each task in it"""
+    for template in templates:
+        yield project_text(template), {"kind": "project", "template": template}
+        for task in template.get("tasks", []):
+            yield task_text(template, task), {
+                "kind": "task",
+                "template_id": template["id"],
+                "template_name": template["name"],
+                "task": task,
+            }
+
+
+def add_templates(indexes: Dict[str, VectorIndex], templates: Iterable[Dict]) -> int:
+    """Embed and append templates to the indexes in batches; returns rows added"""
+    added = 0
+    batches: Dict[str, List[Tuple[str, Dict]]] = {kind: [] for kind in KINDS}
+    for text, payload in template_entries(templates):
+        batch = batches[payload["kind"]]
+        batch.append((text, payload))
+        if len(batch) >= EMBED_BATCH:
+            added += _flush(indexes[payload["kind"]], batch)
+    for kind, batch in batches.items():
+        if batch:
+            added += _flush(indexes[kind], batch)
+    return added
+
+
+def _flush(index: VectorIndex, batch: List[Tuple[str, Dict]]) -> int:
+    texts, payloads = zip(*batch)
+    index.add(_embedder.embed(texts), payloads)
+    batch.clear()
+    return len(payloads)
+
+
+def _library_stamp() -> Tuple[int, int]:
+    stat = os.stat(TEMPLATE_LIBRARY)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load() -> None:
+    with open(TEMPLATE_LIBRARY, "rb") as f:
+        raw = f.read()
+    library = json.loads(raw)
+    version = f"{library['version']}-{hashlib.sha256(raw).hexdigest()[:12]}"
+
+    path = os.path.join(TEMPLATE_INDEX_DIR, f"v{version}-d{EMBEDDING_DIM}")
+    indexes = {kind: VectorIndex(os.path.join(path, kind), EMBEDDING_DIM) for kind in KINDS}
+    if not any(len(index) for index in indexes.values()):
+        start = time.perf_counter()
+        rows = add_templates(indexes, library["templates"])
+        print(f"📚 Indexed {len(library['templates'])} templates ({rows} entries) "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    _state.update(library=library, version=version, indexes=indexes)
+
+
+def get_template_indexes() -> Tuple[Dict[str, VectorIndex], str]:
+    """
+    The indexes for the current library ({"project": ..., "task": ...}) and
+    its version string, (re)built when data/templates.json changes
+    """
+    stamp = _library_stamp()
+    if _state["stamp"] != stamp:
+        with _lock:
+            if _state["stamp"] != stamp:
+                _load()
+                _state["stamp"] = stamp
+    return _state["indexes"], _state["version"]
+
+
+def template_version() -> str:
+    return get_template_indexes()[1]
+
+
+def indexed_entries() -> int:
+    return sum(len(index) for index in get_template_indexes()[0].values())
+
+
+def template_library() -> List[Dict]:
+    get_template_indexes()
+    return _state["library"]["templates"]
+
+
+def search_templates(query: str, k: int = 5, kind: Optional[str] = None) -> List[Dict]:
+    """
+    Entries most similar to query, best first: the stored payload plus
+    "score" (cosine similarity). kind limits results to "project" or "task".
+    """
+    indexes, _ = get_template_indexes()
+    vector = _embedder.embed([query])
+    hits = [
+        (score, index, row)
+        for name, index in indexes.items() if kind in (None, name)
+        for row, score in index.search(vector, k)[0]
+    ]
+    hits.sort(key=lambda hit: -hit[0])
+
+    results = []
+    for score, index, row in hits[:k]:
+        payload = index.payload(row)
+        payload["score"] = round(score, 4)
+        results.append(payload)
+    return results
@@ -0,0 +1,323 @@
+"""
+In-process vector index
+Rows live in a float32 matrix on disk and are memory-mapped, so the OS
+page cache holds the corpus instead of the Python heap. Small corpora are
+scanned exactly with batched matrix products; large ones can add an IVF
+(inverted file) index that only scans the lists nearest the query.
+
+Directory layout:
+    meta.json         dim, row count, generation, IVF summary
+    vectors.<g>.f32   row-major (count, dim) float32, L2-normalized rows
+    payloads.jsonl    one JSON object per row
+    payloads.<g>.idx  (count, 2) uint64 byte offset and length into payloads.jsonl
+    ivf.<g>.npz       centroids and list boundaries (only after build_ivf)
+
+<g> is the generation in meta.json. build_ivf writes a whole new
+generation and switches to it by replacing meta.json, one atomic rename,
+so rows and payload offsets can't end up from different builds.
+Generation 0 is written without the ".<g>" part.
+
+Scores are dot products, i.e. cosine similarity for normalized rows.
+A single writer is assumed (the service at startup, or index_templates.py).
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import INDEX_EXACT_MAX, INDEX_NPROBE
+
+# Rows per matrix product in an exact scan (~64 MB at dim 256)
+SCAN_CHUNK = 65536
+
+Hit = Tuple[int, float]
+
+# Files rewritten together by build_ivf, and any generation of them
+_GENERATION_FILES = ("vectors.f32", "payloads.idx", "ivf.npz")
+_GENERATION_FILE = re.compile(r"^(vectors|payloads|ivf)(\.\d+)?\.(f32|idx|npz)$")
+
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best k by score, highest first: partial selection, then a sort of only k"""
+    if len(scores) > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+        scores, ids = scores[part], ids[part]
+    order = np.argsort(-scores, kind="stable")
+    return ids[order], scores[order]
+
+
+class VectorIndex:
+    def __init__(self, path: str, dim: int):
+        self.path = path
+        self.dim = dim
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        meta = self._read_meta()
+        if meta is not None and meta["dim"] != dim:
+            raise ValueError(f"Index at {path} has dim {meta['dim']}, expected {dim}")
+        self._meta = meta or {"dim": dim, "count": 0, "ivf": None}
+        self._meta.setdefault("generation", 0)
+        self._remove_stale_generations()
+        self._discard_partial_writes()
+        self._open()
+
+    # ==================== FILES ====================
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _gen_file(self, name: str, generation: Optional[int] = None) -> str:
+        """Path of one of _GENERATION_FILES in the given (default: current) generation"""
+        if generation is None:
+            generation = self._meta["generation"]
+        if generation:
+            stem, ext = name.split(".")
+            name = f"{stem}.{generation}.{ext}"
+        return self._file(name)
+
+    def _remove_stale_generations(self) -> None:
+        # Leftovers of a build that never switched over, or of the
+        # generation a finished build replaced
+        current = {os.path.basename(self._gen_file(name)) for name in _GENERATION_FILES}
+        for name in os.listdir(self.path):
+            if (_GENERATION_FILE.match(name) and name not in current) or name.endswith(".tmp"):
+                os.unlink(self._file(name))
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self._file("meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, meta: Optional[Dict] = None) -> None:
+        # Written last and replaced atomically: the row count and generation
+        # in meta.json are what readers trust, so an interrupted append or
+        # build is simply ignored
+        meta = meta or self._meta
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file("meta.json"))
+        self._meta = meta
+
+    def _discard_partial_writes(self) -> None:
+        count = self._meta["count"]
+        expected = {
+            self._gen_file("vectors.f32"): count * self.dim * 4,
+            self._gen_file("payloads.idx"): count * 16,
+        }
+        for path, size in expected.items():
+            if not os.path.exists(path):
+                open(path, "wb").close()
+            elif os.path.getsize(path) > size:
+                os.truncate(path, size)
+        # build_ivf reorders the rows, so the last row's payload need not be the
+        # last one in payloads.jsonl: the committed end is the furthest one
+        if count:
+            offsets = np.fromfile(self._gen_file("payloads.idx"), dtype=np.uint64, count=count * 2).reshape(count, 2)
+            end = int((offsets[:, 0] + offsets[:, 1]).max())
+        else:
+            end = 0
+        if not os.path.exists(self._file("payloads.jsonl")):
+            open(self._file("payloads.jsonl"), "wb").close()
+        elif os.path.getsize(self._file("payloads.jsonl")) > end:
+            os.truncate(self._file("payloads.jsonl"), end)
+
+    def _open(self) -> None:
+        count = self._meta["count"]
+        if count:
+            vectors = np.memmap(self._gen_file("vectors.f32"), dtype=np.float32, mode="r", shape=(count, self.dim))
+            offsets = np.memmap(self._gen_file("payloads.idx"), dtype=np.uint64, mode="r", shape=(count, 2))
+            with open(self._file("payloads.jsonl"), "rb") as f:
+                payloads = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            vectors = np.zeros((0, self.dim), dtype=np.float32)
+            offsets = np.zeros((0, 2), dtype=np.uint64)
+            payloads = b""
+
+        ivf = None
+        if self._meta["ivf"]:
+            with np.load(self._gen_file("ivf.npz")) as data:
+                ivf = (data["centroids"], data["offsets"], self._meta["ivf"]["rows"])
+
+        # Swapped in one assignment so a concurrent search sees old or new, never a mix
+        self._view = (vectors, offsets, payloads, ivf)
+
+    def __len__(self) -> int:
+        return self._meta["count"]
+
+    @property
+    def ivf_rows(self) -> int:
+        """Rows covered by the IVF index; rows added after the last build are scanned exactly"""
+        return self._meta["ivf"]["rows"] if self._meta["ivf"] else 0
+
+    # ==================== WRITE ====================
+
+    def add(self, vectors: np.ndarray, payloads: Sequence[Dict]) -> None:
+        """Append rows (normalized float32, one per payload)"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(payloads), self.dim):
+            raise ValueError(f"Expected ({len(payloads)}, {self.dim}) vectors, got {vectors.shape}")
+        if not len(payloads):
+            return
+
+        with self._lock:
+            start = os.path.getsize(self._file("payloads.jsonl"))
+            blobs = [json.dumps(p, separators=(",", ":")).encode() + b"\n" for p in payloads]
+            lengths = np.fromiter((len(b) for b in blobs), dtype=np.uint64, count=len(blobs))
+            offsets = np.empty((len(blobs), 2), dtype=np.uint64)
+            offsets[:, 1] = lengths
+            offsets[:, 0] = start + np.cumsum(lengths) - lengths
+
+            with open(self._file("payloads.jsonl"), "ab") as f:
+                f.write(b"".join(blobs))
+            with open(self._gen_file("payloads.idx"), "ab") as f:
+                f.write(offsets.tobytes())
+            with open(self._gen_file("vectors.f32"), "ab") as f:
+                f.write(vectors.tobytes())
+
+            self._meta["count"] += len(payloads)
+            self._write_meta()
+            self._open()
+
+    def build_ivf(self, lists: Optional[int] = None, sample: Optional[int] = None,
+                  iterations: int = 8, seed: int = 0) -> None:
+        """
+        Cluster the rows with spherical k-means and store them grouped by
+        list, so probing a list is one contiguous slice of vectors.f32.
+
+        Reorders rows: row numbers returned by search() before a rebuild are
+        not valid afterwards.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            vectors, offsets, _, _ = self._view
+            n = len(vectors)
+            if n == 0:
+                return
+            lists = lists or max(1, int(np.sqrt(n)))
+            lists = min(lists, n)
+            rng = np.random.default_rng(seed)
+
+            # Train on a sample: ~40 rows per centroid is plenty for k-means
+            sample = min(n, sample or max(lists * 40, 10000))
+            train = np.asarray(vectors[np.sort(rng.choice(n, sample, replace=False))])
+            centroids = train[rng.choice(sample, lists, replace=False)].copy()
+            for _ in range(iterations):
+                assign = self._assign(train, centroids)
+                counts = np.bincount(assign, minlength=lists)
+                starts = np.cumsum(counts) - counts
+                filled = counts > 0
+                sums = np.zeros_like(centroids)
+                # Sum rows per list in one pass over the rows sorted by list
+                sums[filled] = np.add.reduceat(train[np.argsort(assign, kind="stable")], starts[filled], axis=0)
+                empty = ~filled
+                # Re-seed empty lists from random training rows
+                sums[empty] = train[rng.choice(sample, int(empty.sum()))]
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                centroids = (sums / np.maximum(norms, 1e-12)).astype(np.float32)
+
+            assign = np.concatenate([
+                self._assign(np.asarray(vectors[i:i + SCAN_CHUNK]), centroids)
+                for i in range(0, n, SCAN_CHUNK)
+            ])
+            order = np.argsort(assign, kind="stable")
+            bounds = np.zeros(lists + 1, dtype=np.int64)
+            np.cumsum(np.bincount(assign, minlength=lists), out=bounds[1:])
+
+            # Rewrite rows in list order into the next generation (payload
+            # offsets move with them; payloads.jsonl itself is untouched).
+            # Nothing reads these files until meta.json names the generation
+            old, new = self._meta["generation"], self._meta["generation"] + 1
+            with open(self._gen_file("vectors.f32", new), "wb") as f:
+                for i in range(0, n, SCAN_CHUNK):
+                    f.write(np.asarray(vectors[order[i:i + SCAN_CHUNK]]).tobytes())
+            np.asarray(offsets)[order].tofile(self._gen_file("payloads.idx", new))
+            with open(self._gen_file("ivf.npz", new), "wb") as f:
+                np.savez(f, centroids=centroids, offsets=bounds)
+
+            self._write_meta(dict(self._meta, generation=new, ivf={"lists": lists, "rows": n}))
+            self._open()
+            for name in _GENERATION_FILES:
+                if os.path.exists(self._gen_file(name, old)):
+                    os.unlink(self._gen_file(name, old))
+            print(f"🧭 Built IVF index: {n} rows in {lists} lists "
+                  f"({time.perf_counter() - start:.1f}s)")
+
+    @staticmethod
+    def _assign(rows: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        return np.argmax(rows @ centroids.T, axis=1)
+
+    # ==================== READ ====================
+
+    def payload(self, row: int) -> Dict:
+        _, offsets, payloads, _ = self._view
+        start, length = (int(x) for x in offsets[row])
+        return json.loads(payloads[start:start + length])
+
+    def search(self, queries: np.ndarray, k: int = 5, nprobe: Optional[int] = None,
+               exact: bool = False) -> List[List[Hit]]:
+        """
+        Top-k rows for each query (one row of queries each) as (row, score),
+        best first.
+
+        Uses the IVF index when one exists and the corpus is larger than
+        INDEX_EXACT_MAX, unless exact=True.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        vectors, _, _, ivf = self._view
+        if len(vectors) == 0 or k <= 0:
+            return [[] for _ in queries]
+        k = min(k, len(vectors))
+
+        if exact or ivf is None or len(vectors) <= INDEX_EXACT_MAX:
+            return self._search_exact(vectors, queries, k)
+        return [self._search_ivf(vectors, ivf, q, k, nprobe or INDEX_NPROBE) for q in queries]
+
+    @staticmethod
+    def _search_exact(vectors: np.ndarray, queries: np.ndarray, k: int) -> List[List[Hit]]:
+        m = len(queries)
+        best_ids = np.empty((m, 0), dtype=np.int64)
+        best_scores = np.empty((m, 0), dtype=np.float32)
+        for start in range(0, len(vectors), SCAN_CHUNK):
+            scores = queries @ np.asarray(vectors[start:start + SCAN_CHUNK]).T  # (m, chunk)
+            ids = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            ids = np.concatenate([best_ids, ids], axis=1)
+            if scores.shape[1] > k:
+                part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, part, axis=1)
+                ids = np.take_along_axis(ids, part, axis=1)
+            best_scores, best_ids = scores, ids
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        return [
+            [(int(i), float(s)) for i, s in zip(ids, scores)]
+            for ids, scores in zip(best_ids, best_scores)
+        ]
+
+    @staticmethod
+    def _search_ivf(vectors: np.ndarray, ivf: Tuple[np.ndarray, np.ndarray, int],
+                    query: np.ndarray, k: int, nprobe: int) -> List[Hit]:
+        centroids, bounds, indexed = ivf
+        nprobe = min(nprobe, len(centroids))
+        probe = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+
+        ranges = [(int(bounds[l]), int(bounds[l + 1])) for l in probe]
+        ranges.append((indexed, len(vectors)))  # rows added since the build
+        ids = np.concatenate([np.arange(a, b) for a, b in ranges])
+        scores = np.concatenate([np.asarray(vectors[a:b]) @ query for a, b in ranges])
+        if not len(ids):
+            return []
+        ids, scores = _top_k(scores, ids, k)
+        return [(int(i), float(s)) for i, s in zip(ids, scores)]
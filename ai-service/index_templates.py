@@ -0,0 +1,123 @@
+"""
+Template index maintenance
+Adds templates to the index for the current library, builds the IVF
+index for large corpora, and measures retrieval latency.
+
+Usage:
+    python index_templates.py --input more_templates.jsonl
+    python index_templates.py --synthetic 1000000 --ivf --bench 200
+"""
+
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from core.embedder import HashingEmbedder
+from core.templates import add_templates, get_template_indexes, indexed_entries, template_library
+from config import EMBEDDING_DIM, INDEX_NPROBE
+
+
+def read_templates(path: str):
+    """A JSON library ({"templates": [...]}) or JSON Lines, one template per line"""
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)["templates"]
+
+
+def synthetic_templates(library, entries: int, seed: int = 0):
+    """Variations on the built-in templates, about `entries` index rows in total"""
+    rng = random.Random(seed)
+    words = sorted({w for t in library for task in t["tasks"] for w in task["description"].lower().split() if w.isalpha()})
+    made = 0
+    n = 0
+    while made < entries:
+        base = rng.choice(library)
+        extra = " ".join(rng.sample(words, 3))
+        tasks = [
+            {**task, "name": f"{task['name']} ({rng.choice(words)})", "duration": max(1, task["duration"] + rng.randint(-3, 3))}
+            for task in base["tasks"]
+        ]
+        yield {
+            "id": f"synthetic-{n}",
+            "name": f"{base['name']}: {extra}",
+            "description": f"{base['description']} Focus on {extra}.",
+            "tags": base.get("tags", []),
+            "tasks": tasks,
+            "dependencies": base["dependencies"],
+        }
+        made += 1 + len(tasks)
+        n += 1
+
+
+def bench(index, queries: int, k: int = 10) -> None:
+    """Latency of exact and IVF search on one index, and IVF recall against exact"""
+    embedder = HashingEmbedder(EMBEDDING_DIM)
+    rng = random.Random(1)
+    texts = [index.payload(rng.randrange(len(index))) for _ in range(queries)]
+    texts = [
+        p["template"]["name"] if p["kind"] == "project" else p["task"]["name"] + " " + p["template_name"]
+        for p in texts
+    ]
+    q = embedder.embed(texts)
+
+    def timed(**kwargs):
+        times, results = [], []
+        for row in q:
+            start = time.perf_counter()
+            results.append(index.search(row, k, **kwargs)[0])
+            times.append((time.perf_counter() - start) * 1000)
+        return np.percentile(times, [50, 99]), results
+
+    (p50, p99), exact = timed(exact=True)
+    print(f"exact scan:  p50 {p50:.2f} ms  p99 {p99:.2f} ms")
+    start = time.perf_counter()
+    index.search(q, k, exact=True)
+    print(f"exact batch: {(time.perf_counter() - start) * 1000 / queries:.2f} ms/query ({queries} queries)")
+
+    if index.ivf_rows:
+        (p50, p99), approx = timed()
+        recall = np.mean([
+            len({r for r, _ in a} & {r for r, _ in e}) / len(e) for a, e in zip(approx, exact)
+        ])
+        print(f"ivf (nprobe {INDEX_NPROBE}): p50 {p50:.2f} ms  p99 {p99:.2f} ms  recall@{k} {recall:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the plan template index")
+    parser.add_argument("--input", help="Templates to add (.json library or .jsonl)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Add about N synthetic entries (scale testing)")
+    parser.add_argument("--ivf", action="store_true", help="Build the IVF index after adding")
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default sqrt(rows))")
+    parser.add_argument("--bench", type=int, default=0, help="Time N queries")
+    args = parser.parse_args()
+
+    indexes, version = get_template_indexes()
+    print(f"📚 Template index {version}: {indexed_entries()} entries")
+
+    if args.input:
+        start = time.perf_counter()
+        rows = add_templates(indexes, read_templates(args.input))
+        print(f"✅ Added {rows} entries in {time.perf_counter() - start:.1f}s")
+
+    if args.synthetic:
+        start = time.perf_counter()
+        rows = add_templates(indexes, synthetic_templates(template_library(), args.synthetic))
+        print(f"✅ Added {rows} synthetic entries in {time.perf_counter() - start:.1f}s")
+
+    for kind, index in indexes.items():
+        if args.ivf:
+            index.build_ivf(lists=args.lists)
+        if args.bench:
+            print(f"{kind} index ({len(index)} entries)")
+            bench(index, args.bench)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ FastAPI microservice for RAG and AI features
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from core.templates import indexed_entries, template_version
+from routers import plan_generator, loop_fixer
+
 app = FastAPI(title="Intelligent Critical Path - AI Service")
 
 # CORS configuration for Next.js frontend
@@ -18,6 +21,12 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def load_template_index():
+    # Build or open the template index now rather than on the first request
+    print(f"📚 Template index {template_version()}: {indexed_entries()} entries")
+
+
 @app.get("/")
 def read_root():
     return {"message": "AI Service is running"}
@@ -28,7 +37,5 @@ def health_check():
     return {"status": "healthy"}
 
 
-# TODO: Import routers
-# from routers import plan_generator, loop_fixer
-# app.include_router(plan_generator.router)
-# app.include_router(loop_fixer.router)
+app.include_router(plan_generator.router)
+app.include_router(loop_fixer.router)
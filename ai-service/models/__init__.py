@@ -2,4 +2,95 @@
 Pydantic Models for AI Service
 """
 
-# TODO: Add Pydantic models
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+# ==================== LOOP FIXER ====================
+
+class Dependency(BaseModel):
+    """One dependency edge, same shape as the Backend's task_dependencies"""
+    task_id: str = Field(..., description="Task that depends on another")
+    depends_on_task_id: str = Field(..., description="Prerequisite task")
+
+
+class DependencyLoop(BaseModel):
+    """A strongly connected group of tasks that all (transitively) wait on each other"""
+    tasks: List[str]
+    example: List[str] = Field(..., description="One concrete loop, first task repeated at the end")
+    dependencies: int = Field(..., description="Dependencies inside the group")
+
+
+class LoopFixResponse(BaseModel):
+    has_loops: bool
+    loops: List[DependencyLoop]
+    remove: List[Dependency] = Field(..., description="Removing these makes the graph acyclic")
+    tasks: int
+    dependencies: int
+    elapsed_ms: float
+
+
+# ==================== PLAN GENERATION ====================
+
+class PlanRequest(BaseModel):
+    prompt: str = Field(..., min_length=1, max_length=2000, description="What the project is about")
+
+
+class PlanTask(BaseModel):
+    key: str = Field(..., description="Task key, referenced by dependencies")
+    name: str
+    duration: int
+    buffer_time: int = 0
+    description: Optional[str] = None
+
+
+class PlanDependency(BaseModel):
+    task: str = Field(..., description="Key of the task that depends on another")
+    depends_on: str = Field(..., description="Key of the prerequisite task")
+
+
+class TemplateMatch(BaseModel):
+    id: str
+    name: str
+    score: float = Field(..., description="Cosine similarity to the prompt")
+
+
+class SuggestedTask(PlanTask):
+    template_id: str
+    template_name: str
+    score: float
+
+
+class PlanResponse(BaseModel):
+    template: TemplateMatch
+    tasks: List[PlanTask]
+    dependencies: List[PlanDependency]
+    alternatives: List[TemplateMatch]
+    suggested_tasks: List[SuggestedTask] = Field(..., description="Tasks from other templates that match the prompt")
+    template_version: str
+    cached: bool = Field(..., description="Served from the plan cache without generating")
+    elapsed_ms: float
+
+
+class TemplateHit(BaseModel):
+    kind: str = Field(..., description="project or task")
+    template_id: str
+    name: str
+    score: float
+
+
+class TemplateSearchResponse(BaseModel):
+    hits: List[TemplateHit]
+    indexed: int = Field(..., description="Entries in the index")
+    elapsed_ms: float
+
+
+class PlanCacheStats(BaseModel):
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    hit_rate: float = Field(..., description="(memory_hits + disk_hits) / lookups since startup")
+    memory_entries: int
+    memory_capacity: int
+    disk_entries: int
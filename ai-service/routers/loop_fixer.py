@@ -3,15 +3,34 @@ Loop Fixer Router
 Handles circular dependency resolution suggestions
 """
 
+import time
+from typing import List
+
 from fastapi import APIRouter
 
+from core.graph import analyze_loops
+from models import Dependency, LoopFixResponse
+
 router = APIRouter(prefix="/api/fix", tags=["validation"])
 
 
-@router.post("/loop")
-async def suggest_loop_fix(dependencies: list):
+@router.post("/loop", response_model=LoopFixResponse)
+def suggest_loop_fix(dependencies: List[Dependency]):
     """
-    Suggest fixes for circular dependencies
-    TODO: Implement AI-powered suggestions
+    Suggest fixes for circular dependencies.
+
+    Reports every loop (strongly connected component) with one concrete
+    cycle to show the user, and a small set of dependencies whose removal
+    breaks all of them. Deterministic and linear-time; runs in the
+    threadpool since it is CPU-bound.
     """
-    return {"message": "Loop fix endpoint - TODO"}
+    start = time.perf_counter()
+    analysis = analyze_loops([(d.depends_on_task_id, d.task_id) for d in dependencies])
+    return LoopFixResponse(
+        has_loops=bool(analysis["loops"]),
+        loops=analysis["loops"],
+        remove=[Dependency(task_id=task, depends_on_task_id=dep) for dep, task in analysis["remove"]],
+        tasks=analysis["tasks"],
+        dependencies=analysis["dependencies"],
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
@@ -3,15 +3,64 @@ Plan Generator Router
 Handles AI-powered project plan generation
 """
 
-from fastapi import APIRouter
+import time
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from core.plan_cache import get_plan_cache
+from core.planner import generate_plan as build_plan
+from core.templates import indexed_entries, search_templates, template_version
+from models import PlanCacheStats, PlanRequest, PlanResponse, TemplateSearchResponse
 
 router = APIRouter(prefix="/api/generate", tags=["generation"])
 
 
-@router.post("/plan")
-async def generate_plan(prompt: str):
+@router.post("/plan", response_model=PlanResponse)
+def generate_plan(request: PlanRequest):
     """
-    Generate project plan from user prompt
-    TODO: Implement RAG-based generation
+    Generate project plan from user prompt.
+
+    Retrieves the closest project template from the local template index
+    and returns its tasks and dependencies, with alternative templates and
+    matching tasks from other templates as suggestions.
+
+    Plans are cached per normalized prompt and template library version,
+    so repeated prompts skip retrieval entirely.
     """
-    return {"message": "Plan generation endpoint - TODO"}
+    start = time.perf_counter()
+    try:
+        plan, cached = get_plan_cache().get_or_compute(
+            request.prompt, template_version(), lambda: build_plan(request.prompt),
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return PlanResponse(**plan, cached=cached, elapsed_ms=round((time.perf_counter() - start) * 1000, 2))
+
+
+@router.get("/cache/stats", response_model=PlanCacheStats)
+def plan_cache_stats():
+    """Plan cache hit rate and size"""
+    return get_plan_cache().stats()
+
+
+@router.get("/templates", response_model=TemplateSearchResponse)
+def search_plan_templates(
+    q: str = Query(..., min_length=1, max_length=2000),
+    k: int = Query(10, ge=1, le=100),
+    kind: Optional[str] = Query(None, pattern="^(project|task)$"),
+):
+    """Nearest project/task templates to q, for inspecting retrieval"""
+    start = time.perf_counter()
+    hits = []
+    for hit in search_templates(q, k=k, kind=kind):
+        if hit["kind"] == "project":
+            template_id, name = hit["template"]["id"], hit["template"]["name"]
+        else:
+            template_id, name = hit["template_id"], hit["task"]["name"]
+        hits.append({"kind": hit["kind"], "template_id": template_id, "name": name, "score": hit["score"]})
+    return TemplateSearchResponse(
+        hits=hits,
+        indexed=indexed_entries(),
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
@@ -0,0 +1,77 @@
+"""
+Loop analysis on small random dependency graphs, checked against plain
+reachability.
+
+Run from ai-service/ directory:
+    python -m unittest discover -s tests
+"""
+
+import random
+import unittest
+from typing import Dict, List, Set, Tuple
+
+from core.graph import analyze_loops
+
+
+def _random_edges(rng: random.Random, n: int, m: int) -> List[Tuple[str, str]]:
+    return [(f"t{rng.randrange(n)}", f"t{rng.randrange(n)}") for _ in range(m)]
+
+
+def _reachable(edges: List[Tuple[str, str]]) -> Dict[str, Set[str]]:
+    """Nodes reachable from each node by one or more edges"""
+    succ: Dict[str, Set[str]] = {}
+    for u, v in edges:
+        succ.setdefault(u, set()).add(v)
+        succ.setdefault(v, set())
+    reach = {}
+    for start in succ:
+        seen: Set[str] = set()
+        stack = list(succ[start])
+        while stack:
+            v = stack.pop()
+            if v not in seen:
+                seen.add(v)
+                stack.extend(succ[v])
+        reach[start] = seen
+    return reach
+
+
+def _is_acyclic(edges: List[Tuple[str, str]]) -> bool:
+    return not any(v in seen for v, seen in _reachable(edges).items())
+
+
+class AnalyzeLoopsTest(unittest.TestCase):
+    def test_removing_the_suggested_edges_leaves_a_dag(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            edges = _random_edges(rng, rng.randint(1, 12), rng.randint(0, 30))
+            removed = set(analyze_loops(edges)["remove"])
+            self.assertTrue(_is_acyclic([e for e in edges if e not in removed]), edges)
+
+    def test_loops_are_the_cyclic_components(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            edges = _random_edges(rng, rng.randint(1, 12), rng.randint(0, 30))
+            reach = _reachable(edges)
+            # Two tasks share a loop when each reaches the other
+            expected = {
+                frozenset(w for w in reach if w == v or (w in reach[v] and v in reach[w]))
+                for v in reach if v in reach[v]
+            }
+            result = analyze_loops(edges)
+            self.assertEqual({frozenset(loop["tasks"]) for loop in result["loops"]}, expected, edges)
+
+            edge_set = set(edges)
+            for loop in result["loops"]:
+                example = loop["example"]
+                self.assertEqual(example[0], example[-1])
+                self.assertTrue(all(e in edge_set for e in zip(example, example[1:])), example)
+
+    def test_acyclic_input_suggests_nothing(self):
+        result = analyze_loops([("a", "b"), ("b", "c"), ("a", "c")])
+        self.assertEqual(result["loops"], [])
+        self.assertEqual(result["remove"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
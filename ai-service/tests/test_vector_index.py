@@ -0,0 +1,80 @@
+"""
+Vector index files across appends and IVF rebuilds, including a rebuild
+that dies before it switches over.
+
+Run from ai-service/ directory:
+    python -m unittest discover -s tests
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core.vector_index import VectorIndex
+
+DIM = 16
+
+
+class VectorIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = self.dir.name
+        self.rng = np.random.default_rng(0)
+        self.rows = np.empty((0, DIM), dtype=np.float32)
+        self.index = VectorIndex(self.path, DIM)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _add(self, n):
+        v = self.rng.normal(size=(n, DIM)).astype(np.float32)
+        v /= np.linalg.norm(v, axis=1, keepdims=True)
+        first = len(self.rows)
+        self.index.add(v, [{"i": first + i} for i in range(n)])
+        self.rows = np.concatenate([self.rows, v])
+
+    def _assert_aligned(self, index):
+        # Every row's payload names the vector that was added with it
+        self.assertEqual(len(index), len(self.rows))
+        vectors = index._view[0]
+        for row in range(len(index)):
+            np.testing.assert_allclose(vectors[row], self.rows[index.payload(row)["i"]])
+
+    def test_rows_and_payloads_stay_aligned_across_rebuilds(self):
+        self._add(300)
+        self.index.build_ivf(lists=6)
+        self._add(40)
+        self.index.build_ivf(lists=4)
+        self._assert_aligned(self.index)
+        self._assert_aligned(VectorIndex(self.path, DIM))
+
+    def test_rebuild_that_never_switches_over_is_discarded(self):
+        self._add(300)
+        self.index.build_ivf(lists=6)
+        self._add(40)
+        before = sorted(os.listdir(self.path))
+
+        with mock.patch.object(VectorIndex, "_write_meta", side_effect=RuntimeError("crash")):
+            with self.assertRaises(RuntimeError):
+                self.index.build_ivf(lists=4)
+
+        reopened = VectorIndex(self.path, DIM)
+        self._assert_aligned(reopened)
+        self.assertEqual(reopened.ivf_rows, 300)
+        self.assertEqual(sorted(os.listdir(self.path)), before)
+
+    def test_rebuild_removes_the_previous_generation(self):
+        self._add(100)
+        self.index.build_ivf(lists=4)
+        self.index.build_ivf(lists=4)
+        self.assertEqual(
+            sorted(os.listdir(self.path)),
+            ["ivf.2.npz", "meta.json", "payloads.2.idx", "payloads.jsonl", "vectors.2.f32"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
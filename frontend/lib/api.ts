@@ -125,10 +125,27 @@ function transformDependencyFromBackend(backendDep: BackendDependency): TaskDepe
   };
 }
 
+// Primary WAL position after our last write (X-DB-LSN). Sent back on every
+// request so reads served by a read replica already include that write.
+let lastLsn: string | null = null;
+
+async function apiFetch(path: string, init: RequestInit = {}): Promise<Response> {
+  const headers = new Headers(init.headers);
+  if (lastLsn) {
+    headers.set('X-DB-LSN', lastLsn);
+  }
+  const response = await fetch(`${API_BASE_URL}${path}`, { ...init, headers });
+  const lsn = response.headers.get('X-DB-LSN');
+  if (lsn) {
+    lastLsn = lsn;
+  }
+  return response;
+}
+
 // API Functions
 
 export async function fetchTasks(): Promise<Task[]> {
-  const response = await fetch(`${API_BASE_URL}/api/tasks/`);
+  const response = await apiFetch(`/api/tasks/`);
   if (!response.ok) {
     throw new Error(`Failed to fetch tasks: ${response.statusText}`);
   }
@@ -137,7 +154,7 @@ export async function fetchTasks(): Promise<Task[]> {
 }
 
 export async function fetchTask(taskId: string): Promise<Task> {
-  const response = await fetch(`${API_BASE_URL}/api/tasks/${taskId}`);
+  const response = await apiFetch(`/api/tasks/${taskId}`);
   if (!response.ok) {
     throw new Error(`Failed to fetch task: ${response.statusText}`);
   }
@@ -147,7 +164,7 @@ export async function fetchTask(taskId: string): Promise<Task> {
 
 export async function createTaskApi(taskData: Partial<Omit<Task, 'id'>>): Promise<Task> {
   const backendData = transformTaskToBackend(taskData);
-  const response = await fetch(`${API_BASE_URL}/api/tasks/`, {
+  const response = await apiFetch(`/api/tasks/`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -163,7 +180,7 @@ export async function createTaskApi(taskData: Partial<Omit<Task, 'id'>>): Promis
 
 export async function updateTaskApi(taskId: string, updates: Partial<Task>): Promise<Task> {
   const backendData = transformTaskToBackend(updates);
-  const response = await fetch(`${API_BASE_URL}/api/tasks/${taskId}`, {
+  const response = await apiFetch(`/api/tasks/${taskId}`, {
     method: 'PATCH',
     headers: {
       'Content-Type': 'application/json',
@@ -178,7 +195,7 @@ export async function updateTaskApi(taskId: string, updates: Partial<Task>): Pro
 }
 
 export async function deleteTaskApi(taskId: string): Promise<void> {
-  const response = await fetch(`${API_BASE_URL}/api/tasks/${taskId}`, {
+  const response = await apiFetch(`/api/tasks/${taskId}`, {
     method: 'DELETE',
   });
   if (!response.ok) {
@@ -187,7 +204,7 @@ export async function deleteTaskApi(taskId: string): Promise<void> {
 }
 
 export async function fetchDependencies(): Promise<TaskDependency[]> {
-  const response = await fetch(`${API_BASE_URL}/api/dependencies/`);
+  const response = await apiFetch(`/api/dependencies/`);
   if (!response.ok) {
     throw new Error(`Failed to fetch dependencies: ${response.statusText}`);
   }
@@ -196,7 +213,7 @@ export async function fetchDependencies(): Promise<TaskDependency[]> {
 }
 
 export async function createDependencyApi(taskId: string, dependsOnTaskId: string): Promise<TaskDependency> {
-  const response = await fetch(`${API_BASE_URL}/api/dependencies/`, {
+  const response = await apiFetch(`/api/dependencies/`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -214,7 +231,7 @@ export async function createDependencyApi(taskId: string, dependsOnTaskId: strin
 }
 
 export async function deleteDependencyApi(dependencyId: string): Promise<void> {
-  const response = await fetch(`${API_BASE_URL}/api/dependencies/${dependencyId}`, {
+  const response = await apiFetch(`/api/dependencies/${dependencyId}`, {
     method: 'DELETE',
   });
   if (!response.ok) {
@@ -223,7 +240,7 @@ export async function deleteDependencyApi(dependencyId: string): Promise<void> {
 }
 
 export async function fetchCPM(): Promise<CPMResponse> {
-  const response = await fetch(`${API_BASE_URL}/api/cpm`);
+  const response = await apiFetch(`/api/cpm`);
   if (!response.ok) {
     throw new Error(`Failed to fetch CPM data: ${response.statusText}`);
   }
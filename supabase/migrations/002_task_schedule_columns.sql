@@ -0,0 +1,14 @@
+-- Materialized CPM schedule on tasks
+-- Filled in by the backend (core/schedule.py) after schedule-affecting writes
+
+ALTER TABLE tasks
+    ADD COLUMN IF NOT EXISTS early_start integer,
+    ADD COLUMN IF NOT EXISTS early_finish integer,
+    ADD COLUMN IF NOT EXISTS late_start integer,
+    ADD COLUMN IF NOT EXISTS late_finish integer,
+    ADD COLUMN IF NOT EXISTS slack integer,
+    ADD COLUMN IF NOT EXISTS is_critical boolean;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_slack ON tasks (slack);
+CREATE INDEX IF NOT EXISTS ix_tasks_early_start ON tasks (early_start);
+CREATE INDEX IF NOT EXISTS ix_tasks_critical_early_start ON tasks (early_start) WHERE is_critical;
@@ -0,0 +1,7 @@
+-- Composite indexes for server-side task filters and board column counts
+-- status leads so GET /api/tasks?status=... and GET /api/tasks/counts
+-- use the same indexes as the date and duration ranges within a column
+
+CREATE INDEX IF NOT EXISTS ix_tasks_status_start_date ON tasks (status, start_date);
+CREATE INDEX IF NOT EXISTS ix_tasks_status_target_date ON tasks (status, target_completion_date);
+CREATE INDEX IF NOT EXISTS ix_tasks_status_duration ON tasks (status, duration);
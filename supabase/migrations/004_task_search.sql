@@ -0,0 +1,11 @@
+-- Full-text search over task names and descriptions
+-- Names weigh more than descriptions in ranking (A vs B)
+
+ALTER TABLE tasks
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector);
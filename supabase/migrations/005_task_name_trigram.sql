@@ -0,0 +1,6 @@
+-- Fuzzy (typo-tolerant) task name search, used when full-text search finds too little
+-- GiST so "ORDER BY name <-> query LIMIT n" walks the index instead of sorting every match
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_name_trgm ON tasks USING gist (name gist_trgm_ops);
@@ -0,0 +1,15 @@
+-- Precedence types and lag on dependencies
+-- FS = finish-to-start (the only kind before this), SS = start-to-start,
+-- FF = finish-to-finish, SF = start-to-finish. Negative lag is a lead.
+
+DO $$
+BEGIN
+    CREATE TYPE dependency_type AS ENUM ('FS', 'SS', 'FF', 'SF');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END
+$$;
+
+ALTER TABLE task_dependencies
+    ADD COLUMN IF NOT EXISTS type dependency_type NOT NULL DEFAULT 'FS',
+    ADD COLUMN IF NOT EXISTS lag integer NOT NULL DEFAULT 0;
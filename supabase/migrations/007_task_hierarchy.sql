@@ -0,0 +1,12 @@
+-- Work breakdown: tasks nest under summary tasks
+-- A task with subtasks is a summary: it is left out of the leaf CPM, can't
+-- have dependencies, and its schedule columns and dates are rolled up from
+-- its subtasks by the schedule refresh. The rolled-up span goes in
+-- rollup_duration (NULL for leaf tasks), so duration stays as entered.
+-- Deleting a summary deletes its whole branch.
+
+ALTER TABLE tasks
+    ADD COLUMN IF NOT EXISTS parent_id uuid REFERENCES tasks (id) ON DELETE CASCADE,
+    ADD COLUMN IF NOT EXISTS rollup_duration integer;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_parent_id ON tasks (parent_id);
@@ -0,0 +1,15 @@
+-- Projects and portfolio scheduling
+-- Tasks belong to at most one project; dependencies may cross projects.
+-- Deleting a project deletes its tasks.
+
+CREATE TABLE IF NOT EXISTS projects (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL,
+    description text,
+    created_at timestamptz DEFAULT now()
+);
+
+ALTER TABLE tasks
+    ADD COLUMN IF NOT EXISTS project_id uuid REFERENCES projects (id) ON DELETE CASCADE;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_project_id ON tasks (project_id);
@@ -0,0 +1,16 @@
+-- Interval index for the timeline endpoint (GET /api/timeline)
+-- A task's bar runs from start_date to target_completion_date, or for
+-- duration days (start_date + duration - 1) when there is no target.
+-- Tasks without a start_date have no bar. The bounds are inclusive; a
+-- target before the start, or a zero duration, is a one-day bar.
+
+ALTER TABLE tasks
+    ADD COLUMN IF NOT EXISTS timeline_span daterange GENERATED ALWAYS AS (
+        CASE WHEN start_date IS NULL THEN NULL ELSE daterange(
+            start_date,
+            greatest(coalesce(target_completion_date, start_date + duration - 1), start_date),
+            '[]'
+        ) END
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_tasks_timeline_span ON tasks USING gist (timeline_span);
@@ -0,0 +1,30 @@
+-- Schedule baselines
+-- A baseline stores the CPM output (duration, ES/EF/LS/LF per task) as
+-- compressed columns. Task ids live in baseline_task_sets, one row per
+-- distinct set of tasks, shared by all baselines taken over those tasks.
+-- Both are already compact binary, so TOAST is told not to recompress them.
+
+CREATE TABLE IF NOT EXISTS baseline_task_sets (
+    digest bytea PRIMARY KEY,
+    task_count integer NOT NULL,
+    ids bytea NOT NULL
+);
+
+ALTER TABLE baseline_task_sets ALTER COLUMN ids SET STORAGE EXTERNAL;
+
+CREATE TABLE IF NOT EXISTS baselines (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL,
+    project_id uuid REFERENCES projects (id) ON DELETE CASCADE,
+    task_set bytea NOT NULL REFERENCES baseline_task_sets (digest),
+    task_count integer NOT NULL,
+    project_end integer NOT NULL,
+    critical_count integer NOT NULL,
+    size_bytes integer NOT NULL,
+    data bytea NOT NULL,
+    created_at timestamptz DEFAULT now()
+);
+
+ALTER TABLE baselines ALTER COLUMN data SET STORAGE EXTERNAL;
+
+CREATE INDEX IF NOT EXISTS ix_baselines_project_id ON baselines (project_id, created_at);
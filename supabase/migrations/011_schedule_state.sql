@@ -0,0 +1,10 @@
+-- Stored schedule state
+-- One row, rewritten by every schedule refresh. A worker that wrote the
+-- current token knows exactly what the stored schedule holds, so its next
+-- refresh only has to re-read the components that changed since.
+
+CREATE TABLE IF NOT EXISTS schedule_state (
+    id integer PRIMARY KEY,
+    token text NOT NULL,
+    updated_at timestamptz DEFAULT now()
+);